@@ -0,0 +1,247 @@
+'''
+Backends that make the shapes for PlotManager and Plot. CmuBackend draws with
+cmu_graphics. HeadlessBackend only records the shapes in memory, so the plotting
+classes can be timed and tested without a window.
+'''
+
+class CmuBackend(object):
+    '''
+    Makes cmu_graphics shapes.
+    '''
+    def __init__(self):
+        # cmu_graphics opens a window when it is imported, so it is only imported when it is used.
+        import cmu_graphics
+        self.app = cmu_graphics.app
+        self.Group = cmu_graphics.Group
+        self.Line = cmu_graphics.Line
+        self.Circle = cmu_graphics.Circle
+        self.Label = cmu_graphics.Label
+        self.Polygon = cmu_graphics.Polygon
+
+    def remove(self, shape):
+        # Takes a shape that isn't in any group off the canvas for good.
+        self.app.group.remove(shape)
+
+class HeadlessBackend(object):
+    '''
+    Makes shapes that only remember their properties. The backend counts how many
+    shapes of each type were made and how many properties were written.
+    '''
+    def __init__(self):
+        self.shapeCounts = { 'Group': 0, 'Line': 0, 'Circle': 0, 'Label': 0, 'Polygon': 0 }
+        self.propertyWrites = 0
+        # Like the cmu_graphics canvas, new shapes go here until they are added to a group.
+        self.canvas = None
+        self.canvas = Group(self)
+        self.resetCounts()
+
+    def Group(self, *shapes):
+        return Group(self, *shapes)
+
+    def Line(self, x1, y1, x2, y2, **props):
+        return Line(self, x1, y1, x2, y2, **props)
+
+    def Circle(self, centerX, centerY, radius, **props):
+        return Circle(self, centerX, centerY, radius, **props)
+
+    def Label(self, value, x, y, **props):
+        return Label(self, value, x, y, **props)
+
+    def Polygon(self, *coords, **props):
+        return Polygon(self, *coords, **props)
+
+    def remove(self, shape):
+        # Takes a shape that isn't in any group off the canvas for good.
+        self.canvas.remove(shape)
+
+    def countNodes(self, group=None):
+        # Counts every shape and group on the canvas, shown or hidden, so tests can check nothing piles up.
+        group = self.canvas if group == None else group
+        count = 0
+        for shape in group.children:
+            count += 1
+            if (isinstance(shape, Group) == True):
+                count += self.countNodes(shape)
+        return count
+
+    def getShapes(self, group=None):
+        # Lists every visible shape that is not a group, in drawing order.
+        group = self.canvas if group == None else group
+        shapes = [ ]
+        for shape in group.children:
+            if (shape.visible == False):
+                continue
+            if (isinstance(shape, Group) == True):
+                shapes.extend(self.getShapes(shape))
+            else:
+                shapes.append(shape)
+        return shapes
+
+    def resetCounts(self):
+        for shapeType in self.shapeCounts:
+            self.shapeCounts[shapeType] = 0
+        self.propertyWrites = 0
+
+class Shape(object):
+    '''
+    A recorded shape. Every property write is counted by the backend.
+    '''
+    def __init__(self, backend, **props):
+        object.__setattr__(self, 'backend', backend)
+        object.__setattr__(self, 'parent', None)
+        backend.shapeCounts[type(self).__name__] += 1
+        self.visible = True
+        self.fill = 'black'
+        self.border = None
+        self.opacity = 100
+        self.rotateAngle = 0
+        for name in props:
+            setattr(self, name, props[name])
+        if (backend.canvas != None):
+            backend.canvas.add(self)
+
+    def __setattr__(self, name, value):
+        self.backend.propertyWrites += 1
+        object.__setattr__(self, name, value)
+
+    def toFront(self):
+        if (self.parent != None):
+            self.parent.shapes.remove(self)
+            self.parent.shapes.append(self)
+
+class Group(Shape):
+    '''
+    Like a cmu_graphics Group, children is a new copy of the list of shapes each time it is read.
+    '''
+    def __init__(self, backend, *shapes):
+        object.__setattr__(self, 'shapes', [ ])
+        Shape.__init__(self, backend)
+        self.add(*shapes)
+
+    @property
+    def children(self):
+        return list(self.shapes)
+
+    def add(self, *shapes):
+        for shape in shapes:
+            if (shape.parent != None):
+                shape.parent.shapes.remove(shape)
+            object.__setattr__(shape, 'parent', self)
+            self.shapes.append(shape)
+
+    def remove(self, shape):
+        self.shapes.remove(shape)
+        object.__setattr__(shape, 'parent', None)
+
+    def clear(self):
+        # Like cmu_graphics, clearing a group doesn't search it for each shape.
+        shapes = self.shapes
+        object.__setattr__(self, 'shapes', [ ])
+        for shape in shapes:
+            object.__setattr__(shape, 'parent', None)
+
+    def __iter__(self):
+        return iter(self.children)
+
+    def __len__(self):
+        return len(self.shapes)
+
+class Line(Shape):
+    def __init__(self, backend, x1, y1, x2, y2, **props):
+        object.__setattr__(self, 'lineWidth', 2)
+        object.__setattr__(self, 'x1', x1)
+        object.__setattr__(self, 'y1', y1)
+        object.__setattr__(self, 'x2', x2)
+        object.__setattr__(self, 'y2', y2)
+        Shape.__init__(self, backend, **props)
+
+    @property
+    def centerX(self):
+        return (self.x1 + self.x2) / 2
+
+    @centerX.setter
+    def centerX(self, value):
+        shift = value - self.centerX
+        object.__setattr__(self, 'x1', self.x1 + shift)
+        object.__setattr__(self, 'x2', self.x2 + shift)
+
+    @property
+    def centerY(self):
+        return (self.y1 + self.y2) / 2
+
+    @centerY.setter
+    def centerY(self, value):
+        shift = value - self.centerY
+        object.__setattr__(self, 'y1', self.y1 + shift)
+        object.__setattr__(self, 'y2', self.y2 + shift)
+
+class Circle(Shape):
+    def __init__(self, backend, centerX, centerY, radius, **props):
+        object.__setattr__(self, 'centerX', centerX)
+        object.__setattr__(self, 'centerY', centerY)
+        object.__setattr__(self, 'radius', radius)
+        Shape.__init__(self, backend, **props)
+
+class Label(Shape):
+    '''
+    A recorded label. Its size is estimated from the text, and rotation is ignored for its bounds.
+    '''
+    def __init__(self, backend, value, x, y, align='center', **props):
+        object.__setattr__(self, 'value', value)
+        object.__setattr__(self, 'size', 12)
+        object.__setattr__(self, 'centerX', x)
+        object.__setattr__(self, 'centerY', y)
+        Shape.__init__(self, backend, **props)
+        if (align == 'top'):
+            self.top = y
+        elif (align == 'bottom'):
+            self.bottom = y
+        elif (align == 'left'):
+            self.left = x
+        elif (align == 'right'):
+            self.right = x
+
+    @property
+    def width(self):
+        return 0.6 * self.size * len(str(self.value))
+
+    @property
+    def left(self):
+        return self.centerX - self.width / 2
+
+    @left.setter
+    def left(self, value):
+        self.centerX = value + self.width / 2
+
+    @property
+    def right(self):
+        return self.centerX + self.width / 2
+
+    @right.setter
+    def right(self, value):
+        self.centerX = value - self.width / 2
+
+    @property
+    def top(self):
+        return self.centerY - self.size / 2
+
+    @top.setter
+    def top(self, value):
+        self.centerY = value + self.size / 2
+
+    @property
+    def bottom(self):
+        return self.centerY + self.size / 2
+
+    @bottom.setter
+    def bottom(self, value):
+        self.centerY = value - self.size / 2
+
+class Polygon(Shape):
+    def __init__(self, backend, *coords, **props):
+        pointList = [ [ coords[i], coords[i + 1] ] for i in range(0, len(coords), 2) ]
+        object.__setattr__(self, 'pointList', pointList)
+        Shape.__init__(self, backend, **props)
+
+    def addPoint(self, x, y):
+        self.pointList.append([ x, y ])
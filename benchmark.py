@@ -0,0 +1,369 @@
+'''
+Times the data layer and the plotting classes on the headless backend, so no
+window or cmu_graphics is needed.
+Usage: python benchmark.py [scale ...] [--panels N ...] [--parsers] [--profile] [--trace file]
+(default scales: 1 100 10000, default panels: 1 4 16 64)
+The first row is the cold start: a new interpreter importing the modules, loading
+the embedded dataset and drawing the line graph, as main.py does before its
+first frame. The second row does the same with a csv file as the source, loaded
+from its cache.
+Each scale starts with the old and new parseData, each in a new interpreter, with
+their rows per second and peak memory (the whole process, and how much loading
+the csv file added). With --parsers, only those rows are run.
+A scale of N uses the embedded dataset repeated N times, one block of periods
+after another, so every age group gets N times as many periods. The grid rows
+draw one small graph per made up region, and their scale is the number of panels.
+With --profile, the time and new shapes of each plotting method are printed after
+each scale. With --trace, every timed call is saved as a Chrome trace.
+'''
+
+import argparse
+import io
+import math
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+try:
+    import resource
+except ImportError:
+    # Windows has no resource module, so the peak memory isn't shown there.
+    resource = None
+
+from backends import HeadlessBackend
+from birthdata import CSV, parseData, getXAndYData, readDataset
+from derived import DerivedSeries
+from grid import Facets
+from playback import Playback
+from plotting import PlotManager
+from profiling import profiler
+from views import Scene
+
+COLORS = ['red','orange','yellow','green','blue','indigo','violet','black']
+
+TRENDS = [ ('movingAverage', { 'window': 5 }), ('yearOverYear', { }), ('linear', { }), ('loess', { }), ('forecast', { }) ]
+
+def makeCsv(scale):
+    # Repeats the embedded rows, moving each copy's periods past the previous copy's.
+    lines = CSV.split('\n')
+    header, rows = lines[0], lines[1:]
+    firstPeriod = int(rows[0].split(',')[0])
+    numPeriods = int(rows[-1].split(',')[0]) - firstPeriod + 1
+    out = [ header ]
+    for copy in range(scale):
+        for row in rows:
+            period, rest = row.split(',', 1)
+            out.append(str(int(period) + copy * numPeriods) + ',' + rest)
+    return '\n'.join(out)
+
+def makeRegionCsv(numRegions):
+    # The embedded rows once for each of numRegions made up regions, with each region's rates a little higher than the last.
+    lines = CSV.split('\n')
+    out = [ 'Period,Region,' + lines[0].split(',', 1)[1] ]
+    for row in lines[1:]:
+        period, age, rate = row.split(',')
+        for region in range(numRegions):
+            out.append('%s,Region %d,%s,%g' % (period, region + 1, age, float(rate) * (0.8 + 0.4 * region / numRegions)))
+    return '\n'.join(out)
+
+def makeManager():
+    backend = HeadlessBackend()
+    manager = PlotManager(left=100,bottom=300,width=200,height=200,backend=backend)
+    return manager, backend
+
+def timeIt(name, scale, backend, func, repeats):
+    # Runs func a few times and prints the fastest run with the shapes and writes it caused.
+    best = None
+    for i in range(repeats):
+        backend.resetCounts()
+        start = time.perf_counter()
+        func()
+        seconds = time.perf_counter() - start
+        if (best == None or seconds < best):
+            best = seconds
+    shapes = sum(backend.shapeCounts.values())
+    print('%-18s %7dx %10.2f ms %8d shapes %10d writes' % (name, scale, best * 1000, shapes, backend.propertyWrites))
+
+# Run in a new interpreter, so nothing has been imported yet.
+STARTUP_CODE = '''
+import time
+start = time.perf_counter()
+from backends import HeadlessBackend
+from birthdata import parseData
+from plotting import PlotManager
+from views import Scene
+manager = PlotManager(left=100,bottom=300,width=200,height=200,backend=HeadlessBackend())
+scene = Scene(manager, parseData(%r), %r)
+scene.drawLegend()
+scene.drawLineGraph()
+manager.commit()
+print(time.perf_counter() - start)
+'''
+
+def timeStartup(source=None, repeats=5):
+    # Prints the fastest cold start to first frame, measured inside the new interpreter. With a csv path
+    # as the source, like app.source in main.py, the first run makes its cache and the rest load it.
+    best = None
+    for i in range(repeats):
+        output = subprocess.run([ sys.executable, '-c', STARTUP_CODE % (source, COLORS) ], capture_output=True, text=True,
+                                check=True, cwd=os.path.dirname(os.path.abspath(__file__))).stdout
+        seconds = float(output)
+        if (best == None or seconds < best):
+            best = seconds
+    print('%-18s %8s %10.2f ms' % ('cold start', 'file' if source != None else '', best * 1000))
+
+def parseDataOld(csv):
+    # The parser main.py had before birthdata: two passes over the lines, and a list for every row.
+    # It is only kept to compare the new parseData against.
+    data = {}
+    lines = csv.split('\n')
+    for lineString in lines:
+        line = lineString.split(',')
+        if line[0] != 'Period':
+            data[line[1].replace('–','-')] = []
+    for lineString in lines:
+        line = lineString.split(',')
+        if line[0] != 'Period':
+            data[line[1].replace('–','-')].append([int(line[0]),float(line[2])])
+    return data
+
+def getPeakRss():
+    # The most memory this process has used so far, in MB, or None when it can't be found.
+    # Linux's ru_maxrss starts at the peak of the process that started this one, so /proc is read there instead.
+    try:
+        with open('/proc/self/status') as file:
+            for line in file:
+                if (line.startswith('VmHWM:') == True):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    if (resource == None):
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # macOS gives bytes.
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+def measureParser(parser, path):
+    # Loads a csv file with the 'old' or 'new' parseData, and prints the fastest time, the peak memory and
+    # the peak from before loading. The old parser needs the whole file in a string, and the new one streams it.
+    # compareParsers() runs this in a new interpreter, so the peaks don't mix.
+    repeats = 5 if os.path.getsize(path) < 1000000 else 1
+    before = getPeakRss()
+    best = None
+    for i in range(repeats):
+        start = time.perf_counter()
+        if (parser == 'old'):
+            with open(path, encoding='utf-8') as file:
+                parseDataOld(file.read())
+        else:
+            parseData(path, useCache=False)
+        seconds = time.perf_counter() - start
+        if (best == None or seconds < best):
+            best = seconds
+    print(best, getPeakRss(), before)
+
+def compareParsers(scale):
+    # Prints the rows per second and the peak memory of the old and new parseData on the same csv file.
+    csv = makeCsv(scale)
+    numRows = csv.count('\n')
+    with tempfile.TemporaryDirectory() as folder:
+        path = os.path.join(folder, 'births.csv')
+        with open(path, 'w', encoding='utf-8') as file:
+            file.write(csv)
+        del csv
+        for parser in ('old', 'new'):
+            output = subprocess.run([ sys.executable, '-c', 'import benchmark; benchmark.measureParser(%r, %r)' % (parser, path) ],
+                                    capture_output=True, text=True, check=True, cwd=os.path.dirname(os.path.abspath(__file__))).stdout
+            seconds, peak, before = output.split()
+            memory = '' if peak == 'None' else '%8.1f MB peak %8.1f MB loading' % (float(peak), float(peak) - float(before))
+            print('%-18s %7dx %10.0f rows/s %s' % ('parseData ' + parser, scale, numRows / float(seconds), memory))
+
+def runScale(scale):
+    csv = makeCsv(scale)
+    repeats = 5 if scale <= 100 else 1
+    manager, backend = makeManager()
+
+    data = { }
+    def parse():
+        data.clear()
+        parseData(io.StringIO(csv), data)
+    timeIt('parseData', scale, backend, parse, repeats)
+
+    # A filter on one dimension and the last eleven periods, grouped by age. The bitmaps are made before timing.
+    dataset = readDataset(io.StringIO(csv))
+    lastPeriod = dataset.periods[-1]
+    def query():
+        dataset.query(where={ 'Mothers_Age': [ '30-34', '35-39' ] }, periods=(lastPeriod - 10, lastPeriod))
+    query()
+    timeIt('query', scale, backend, query, repeats)
+
+    # Every trend of every age group, worked out once and then taken from the cache.
+    engine = DerivedSeries(data)
+    def trends():
+        for age in data:
+            for transform, params in TRENDS:
+                engine.get(age, transform, **params)
+    timeIt('trends', scale, backend, trends, 1)
+    timeIt('cached trends', scale, backend, trends, repeats)
+
+    xData, yData = getXAndYData(data, '30-34')
+    plots = [ ]
+    def createPlot():
+        plots.append(manager.plotLines(xData, yData, color='blue'))
+        manager.commit()
+    timeIt('createPlot', scale, backend, createPlot, 1)
+
+    yMaxes = [ 150, 200 ]
+    def updateRanges():
+        yMaxes.reverse()
+        manager.updateRanges(yMax=yMaxes[0])
+        manager.commit()
+    timeIt('updateRanges', scale, backend, updateRanges, repeats)
+
+    newYData = [ yVal * 0.9 for yVal in yData ]
+    def updateData():
+        plots[0].updateData(xData, newYData)
+        manager.commit()
+    timeIt('updateData', scale, backend, updateData, repeats)
+
+    # A hundred mouse moves over the plot. The first one makes the hit index, before timing.
+    mousePositions = [ (100 + (i * 7) % 200, 100 + (i * 13) % 200) for i in range(100) ]
+    def hover():
+        for xPos, yPos in mousePositions:
+            manager.updateTooltip(xPos, yPos)
+    hover()
+    timeIt('hover x100', scale, backend, hover, repeats)
+
+    # One new period at a time, like a newly published year. The x range already reaches past the new
+    # periods, so only the new points are drawn.
+    liveManager, liveBackend = makeManager()
+    livePlot = liveManager.plotLines(xData[:], yData[:], color='blue')
+    liveManager.updateRanges(xMax=xData[-1] + repeats + 1)
+    liveManager.commit()
+    def appendPoints():
+        livePlot.appendPoints([ livePlot.xData[-1] + 1 ], [ livePlot.yData[-1] ])
+        liveManager.commit()
+    timeIt('appendPoints', scale, liveBackend, appendPoints, repeats)
+
+    # A window of 5% of the periods, moved along each time. Only the periods inside it are laid out.
+    xMin, xMax = manager.xRange
+    windows = [ xMin, xMin + (xMax - xMin) * 0.5 ]
+    def zoom():
+        windows.reverse()
+        manager.setViewport(windows[0], windows[0] + (xMax - xMin) * 0.05, *manager.yRange)
+        manager.commit()
+    timeIt('zoom 5%', scale, backend, zoom, repeats)
+    manager.resetZoom()
+    manager.commit()
+
+    xLabels = [ 0, 1, 2, 3, 4, 5 ]
+    def drawTicks():
+        # A new label list each time, so the tick cache never hits.
+        xLabels[0] -= 1
+        manager.drawTicks(xLabels=list(xLabels), precision=[0,0])
+        manager.commit()
+    timeIt('drawTicks', scale, backend, drawTicks, repeats)
+
+    manager, backend = makeManager()
+    scene = Scene(manager, data, COLORS)
+    def cycle():
+        scene.drawLineGraph()
+        manager.commit()
+        scene.drawBarGraph()
+        manager.commit()
+        scene.drawHistogram()
+        manager.commit()
+    timeIt('first cycle', scale, backend, cycle, 1)
+    timeIt('cached cycle', scale, backend, cycle, repeats)
+
+    # One frame of playing the bar graph through the periods. Only the tops of the bars move.
+    scene.drawBarGraph()
+    manager.commit()
+    playback = Playback(scene)
+    frames = [ 0 ]
+    def playFrame():
+        frames[0] += 1
+        playback.step(frames[0] / playback.fps)
+        manager.commit()
+    timeIt('playback frame', scale, backend, playFrame, repeats)
+
+    # The same with 500 bars, one frame to the next.
+    barManager, barBackend = makeManager()
+    heights = [ [ (i * 37) % 150 for i in range(500) ], [ (i * 53) % 150 for i in range(500) ] ]
+    bars = barManager.plotVerticalBars(heights[0], color='blue')
+    barManager.commit()
+    def barFrame():
+        heights.reverse()
+        bars.updateData(newYData=heights[0])
+        barManager.commit()
+    timeIt('500 bars frame', scale, barBackend, barFrame, repeats)
+
+def runGrid(numPanels):
+    # A small graph for each of numPanels regions, 100 pixels a side. A frame where one region gets a row
+    # should take about as long at any number of panels.
+    columns = math.ceil(math.sqrt(numPanels))
+    rows = math.ceil(numPanels / columns)
+    backend = HeadlessBackend()
+    dataset = readDataset(io.StringIO(makeRegionCsv(numPanels)))
+    facets = Facets(dataset, 'Region', COLORS, columns=columns, width=100 * columns, height=100 * rows, backend=backend)
+    def draw():
+        facets.draw()
+        facets.commit()
+    timeIt('grid draw', numPanels, backend, draw, 1)
+
+    lastPeriod = dataset.periods[-1]
+    def frame():
+        facets.appendRows([ (lastPeriod, 50.0, [ 'Region 1', '30-34' ]) ])
+        facets.commit()
+    timeIt('grid frame', numPanels, backend, frame, 5)
+
+    # Every panel is laid out again, but the ticks are only worked out once.
+    yMaxes = [ 150, 200 ]
+    def updateRanges():
+        yMaxes.reverse()
+        facets.grid.updateRanges(yMax=yMaxes[0])
+        facets.commit()
+    timeIt('grid ranges', numPanels, backend, updateRanges, 5)
+
+def main():
+    parser = argparse.ArgumentParser(description='Time the data layer and the plotting classes.')
+    parser.add_argument('scales', nargs='*', type=int, default=[ 1, 100, 10000 ])
+    parser.add_argument('--panels', nargs='*', type=int, default=[ 1, 4, 16, 64 ], help='panel counts of the small multiples rows')
+    parser.add_argument('--parsers', action='store_true', help='only compare the old and new parseData at each scale')
+    parser.add_argument('--profile', action='store_true', help='print the time and new shapes of each plotting method')
+    parser.add_argument('--trace', default=None, help='save every timed call to this file as a Chrome trace')
+    args = parser.parse_args()
+    if (args.parsers == True):
+        for scale in args.scales:
+            compareParsers(scale)
+        return
+    timeStartup()
+    # The file keeps the same path between runs, so it only ever has one cache file.
+    source = os.path.join(tempfile.gettempdir(), 'birthrates-startup.csv')
+    if (os.path.exists(source) == False):
+        with open(source, 'w') as file:
+            file.write(CSV)
+    timeStartup(source)
+    if (args.profile == True or args.trace != None):
+        # The timed methods make every row slower, so the rows are only comparable with each other.
+        profiler.enable([ HeadlessBackend ])
+    if (args.trace != None):
+        profiler.startTrace()
+    for scale in args.scales:
+        compareParsers(scale)
+        runScale(scale)
+        if (args.profile == True):
+            print(profiler.getReport())
+            profiler.reset()
+    for numPanels in args.panels:
+        runGrid(numPanels)
+    if (args.profile == True and len(args.panels) > 0):
+        print(profiler.getReport())
+    if (args.trace != None):
+        profiler.stopTrace()
+        print('Saved the trace to ' + profiler.writeTrace(args.trace))
+
+if (__name__ == '__main__'):
+    main()
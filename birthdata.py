@@ -0,0 +1,651 @@
+'''
+Data layer for the birth rate graphs. Reads the Stats NZ csv into a Series per
+mother's age group.
+Citation: CSV files for download: Stats NZ. (n.d.). Retrieved February 21, 2022
+from https://www.stats.govt.nz/large-datasets/csv-files-for-download/
+'''
+
+from array import array
+from bisect import bisect_left, bisect_right
+import io
+from itertools import accumulate
+import os
+import struct
+import sys
+import time
+import zlib
+
+# classes
+class Series(object):
+    '''
+    Stores the periods and rates of one age group in typed arrays.
+    '''
+    def __init__(self):
+        self.xData = array('i')
+        self.yData = array('d')
+
+    def append(self, xVal, yVal):
+        self.xData.append(xVal)
+        self.yData.append(yVal)
+
+    def __len__(self):
+        return len(self.xData)
+
+class Rollup(object):
+    '''
+    Cross-sections and sums of the data, kept so the graphs can look them up instead of scanning the
+    series. Each part is worked out the first time it is asked for, and update() adds rows that were
+    appended later.
+    '''
+    def __init__(self, data):
+        self.data = data
+        self.ages = list(data)
+        # age -> { period: index in the age group's series }
+        self.positions = { }
+        # age -> cumulative[i] is the sum of the age group's first i rates
+        self.cumulative = { }
+        # period -> rates of every age group that period, in the order of self.ages (None where there is no rate)
+        self.sections = { }
+
+    def update(self, added):
+        # Adds the last added[age] rows of each age group's series, as returned by appendRows().
+        for age in added:
+            series = self.data[age]
+            first = len(series) - added[age]
+            if (age not in self.ages):
+                self.ages.append(age)
+                self.sections.clear()
+            periods = series.xData[first:]
+            if (age in self.positions):
+                self.positions[age].update(zip(periods, range(first, len(series))))
+            if (age in self.cumulative):
+                cumulative = self.cumulative[age]
+                sums = accumulate(series.yData[first:], initial=cumulative[-1])
+                # The first sum is the one cumulative already ends with.
+                next(sums)
+                cumulative.extend(sums)
+            for period in periods:
+                self.sections.pop(period, None)
+
+    def getPositions(self, age):
+        positions = self.positions.get(age)
+        if (positions == None):
+            # A period given twice for one age group keeps its last rate.
+            series = self.data[age]
+            positions = self.positions[age] = dict(zip(series.xData, range(len(series))))
+        return positions
+
+    def getCumulative(self, age):
+        cumulative = self.cumulative.get(age)
+        if (cumulative == None):
+            cumulative = self.cumulative[age] = array('d', accumulate(self.data[age].yData, initial=0.0))
+        return cumulative
+
+    def getCrossSection(self, period):
+        # The rate of every age group in one period, in the order of self.ages.
+        section = self.sections.get(period)
+        if (section == None):
+            section = [ ]
+            for age in self.ages:
+                ind = self.getPositions(age).get(period)
+                section.append(None if ind == None else self.data[age].yData[ind])
+            self.sections[period] = section
+        return section
+
+    def getPeriods(self):
+        # Every period that any age group has a rate for, in order.
+        periods = set()
+        for age in self.ages:
+            periods.update(self.getPositions(age))
+        return sorted(periods)
+
+    def getTotal(self, period):
+        # The sum of every age group's rate in one period.
+        return sum(rate for rate in self.getCrossSection(period) if rate != None)
+
+    def getFertilityRate(self, period):
+        # Total fertility rate: the births per woman if she had each age group's birth rate for the
+        # whole group. Each age group is counted as five years, and the rates are per 1000 women.
+        return self.getTotal(period) * 5 / 1000
+
+    def getRangeSum(self, age, firstPeriod, lastPeriod):
+        # The sum of one age group's rates from firstPeriod to lastPeriod, both included.
+        positions = self.getPositions(age)
+        cumulative = self.getCumulative(age)
+        return cumulative[positions[lastPeriod] + 1] - cumulative[positions[firstPeriod]]
+
+    def getRangeMean(self, age, firstPeriod, lastPeriod):
+        positions = self.getPositions(age)
+        count = positions[lastPeriod] - positions[firstPeriod] + 1
+        return self.getRangeSum(age, firstPeriod, lastPeriod) / count
+
+class Dataset(object):
+    '''
+    Every column of a Stats NZ csv, for extracts with more dimensions than the mother's age (region,
+    ethnicity and so on). Rows are kept in period order, so a range of periods is a span of rows. Each
+    value of a dimension gets a bitmap, a Python int with a bit set for every row that has the value,
+    so a filter is a few ANDs and ORs of ints instead of a scan of the rows.
+    '''
+    def __init__(self, dimensions):
+        self.dimensions = list(dimensions)
+        self.periods = array('i')
+        self.rates = array('d')
+        # dimension -> the code of each row's value, the value of each code and the code of each value
+        self.codes = { dimension: array('i') for dimension in self.dimensions }
+        self.values = { dimension: [ ] for dimension in self.dimensions }
+        self.lookup = { dimension: { } for dimension in self.dimensions }
+        # dimension -> bitmap of each code. They are made the first time a dimension is filtered on.
+        self.bitmaps = { }
+        # dimension -> how many rows its bitmaps have. Rows appended after that are added on the next query.
+        self.bitmapRows = { }
+        self.sorted = True
+
+    def append(self, period, rate, values):
+        # Adds a row. values has one value for each dimension, in the order of self.dimensions.
+        for dimension, value in zip(self.dimensions, values):
+            lookup = self.lookup[dimension]
+            code = lookup.get(value)
+            if (code == None):
+                code = lookup[value] = len(self.values[dimension])
+                self.values[dimension].append(value)
+            self.codes[dimension].append(code)
+        if (len(self.periods) > 0 and period < self.periods[-1]):
+            self.sorted = False
+        self.periods.append(period)
+        self.rates.append(rate)
+
+    def __len__(self):
+        return len(self.periods)
+
+    def sortRows(self):
+        # Puts the rows in period order, keeping rows of the same period in the order they were read.
+        if (self.sorted == True):
+            return
+        periods = self.periods
+        order = sorted(range(len(periods)), key=periods.__getitem__)
+        self.periods = array('i', [ periods[i] for i in order ])
+        self.rates = array('d', [ self.rates[i] for i in order ])
+        for dimension in self.dimensions:
+            codes = self.codes[dimension]
+            self.codes[dimension] = array('i', [ codes[i] for i in order ])
+        self.bitmaps.clear()
+        self.bitmapRows.clear()
+        self.sorted = True
+
+    def getBitmaps(self, dimension):
+        # One bitmap per value of the dimension. Bit i of a bitmap is row i. Setting one bit of a big int
+        # copies the whole int, so rows appended since the bitmaps were made are added all at once here,
+        # one OR per value, instead of in append().
+        bitmaps = self.bitmaps.setdefault(dimension, [ ])
+        first, last = self.bitmapRows.get(dimension, 0), len(self.periods)
+        if (first < last):
+            values = self.values[dimension]
+            bits = [ bytearray((last - first + 7) // 8) for value in values ]
+            codes = self.codes[dimension]
+            for row in range(first, last):
+                ind = row - first
+                bits[codes[row]][ind >> 3] |= 1 << (ind & 7)
+            bitmaps.extend(0 for ind in range(len(bitmaps), len(values)))
+            for code, b in enumerate(bits):
+                if (any(b) == True):
+                    bitmaps[code] |= int.from_bytes(b, 'little') << first
+            self.bitmapRows[dimension] = last
+        return bitmaps
+
+    def getRows(self, where=None, periods=None):
+        # Finds the rows that match every filter in where (dimension -> a value or a list of values) and
+        # fall between periods (first, last), both included. Returns the rows in period order.
+        self.sortRows()
+        first, last = 0, len(self.periods)
+        if (periods != None):
+            first = bisect_left(self.periods, periods[0])
+            last = bisect_right(self.periods, periods[1])
+        if (first >= last):
+            return [ ]
+        # Only the bits from first to last are kept, so the rest of the work depends on the span.
+        mask = (1 << (last - first)) - 1
+        for dimension in (where or { }):
+            wanted = where[dimension]
+            if (isinstance(wanted, (list, tuple, set)) == False):
+                wanted = [ wanted ]
+            bitmaps = self.getBitmaps(dimension)
+            lookup = self.lookup[dimension]
+            matches = 0
+            for value in wanted:
+                if (value in lookup):
+                    matches |= bitmaps[lookup[value]]
+            mask &= matches >> first
+            if (mask == 0):
+                return [ ]
+        rows = [ ]
+        for ind, byte in enumerate(mask.to_bytes((last - first + 7) // 8, 'little')):
+            if (byte != 0):
+                base = first + 8 * ind
+                for bit in BIT_POSITIONS[byte]:
+                    rows.append(base + bit)
+        return rows
+
+    def query(self, where=None, periods=None, groupBy='Mothers_Age', combine='mean'):
+        # Filters the rows like getRows() and groups them into a dictionary of Series, like parseData()
+        # makes, so the result can be drawn by the views. Rows of one group that share a period (because
+        # another dimension was not filtered on) are combined into their 'mean' or 'sum'.
+        # Sorting replaces the code arrays, so the rows are sorted before the codes are read.
+        self.sortRows()
+        codes = self.codes[groupBy]
+        values = self.values[groupBy]
+        groups = { }
+        for row in self.getRows(where, periods):
+            code = codes[row]
+            group = groups.get(code)
+            if (group == None):
+                group = groups[code] = [ Series(), 0 ]
+            series = group[0]
+            period = self.periods[row]
+            if (len(series) > 0 and series.xData[-1] == period):
+                series.yData[-1] += self.rates[row]
+                group[1] += 1
+            else:
+                if (combine == 'mean' and group[1] > 1):
+                    series.yData[-1] /= group[1]
+                series.append(period, self.rates[row])
+                group[1] = 1
+        data = { }
+        for code in sorted(groups):
+            series, count = groups[code]
+            if (combine == 'mean' and count > 1):
+                series.yData[-1] /= count
+            data[values[code]] = series
+        return data
+
+# The set bits of every byte, for turning a bitmap back into rows.
+BIT_POSITIONS = [ [ bit for bit in range(8) if byte & (1 << bit) ] for byte in range(256) ]
+
+def parseData(source=None, data=None, useCache=True):
+    # Turns the csv into a dictionary of Series. Without a source, the dataset pasted into CSV is used.
+    # A csv path or the pasted dataset is loaded from the binary cache when it has not changed since
+    # it was last parsed. File objects have no name or mtime to check, so they are always parsed.
+    start = time.perf_counter()
+    if (data == None):
+        data = {}
+    cached = False
+    if (useCache == True and (source == None or isinstance(source, (str, os.PathLike)))):
+        cached = loadCachedData(source, data)
+    else:
+        readData(io.StringIO(CSV) if source == None else source, data)
+    loadStats['source'] = 'CSV' if source == None else str(source) if isinstance(source, (str, os.PathLike)) else 'file'
+    loadStats['cached'] = cached
+    loadStats['seconds'] = time.perf_counter() - start
+    loadStats['rows'] = sum(len(series) for series in data.values())
+    return data
+
+def readData(source, data):
+    # Rows are streamed, so the file is only read once.
+    appendRows(data, readRows(source))
+    return data
+
+def appendRows(data, rows):
+    # Adds (period, age, rate) rows, like the rows of a newly published year, to the end of data's series.
+    # Returns how many rows each age group got, so only the plots of those groups need to be updated.
+    added = {}
+    for period, age, rate in rows:
+        series = data.get(age)
+        if (series == None):
+            series = data[age] = Series()
+        series.append(period, rate)
+        added[age] = added.get(age, 0) + 1
+    return added
+
+def readRows(source):
+    # Yields (period, age, rate) rows from a csv file path or file object without loading the whole file.
+    if (isinstance(source, (str, os.PathLike))):
+        with open(source, encoding='utf-8') as file:
+            yield from readRows(file)
+        return
+    header = None
+    ages = {}
+    for lineString in source:
+        lineString = lineString.rstrip('\r\n')
+        if (lineString == '' or lineString == header):
+            continue
+        line = lineString.split(',')
+        if (header == None):
+            # The first line names the columns, so they can come in any order.
+            header = lineString
+            periodCol = line.index('Period')
+            ageCol = line.index('Mothers_Age')
+            rateCol = line.index('Age_specific_birth_rate')
+            continue
+        age = ages.get(line[ageCol])
+        if (age == None):
+            # The same few age groups repeat on every row, so each one is only cleaned once.
+            age = ages[line[ageCol]] = line[ageCol].replace('–','-')
+        yield int(line[periodCol]), age, float(line[rateCol])
+
+def readDataset(source=None):
+    # Reads every column of a csv file path or file object into a Dataset. Period and the rate are the
+    # measures, and every other column is a dimension. Without a source, the dataset pasted into CSV is used.
+    if (source == None):
+        source = io.StringIO(CSV)
+    if (isinstance(source, (str, os.PathLike))):
+        with open(source, encoding='utf-8') as file:
+            return readDataset(file)
+    header = None
+    cleaned = {}
+    for lineString in source:
+        lineString = lineString.rstrip('\r\n')
+        if (lineString == '' or lineString == header):
+            continue
+        line = lineString.split(',')
+        if (header == None):
+            header = lineString
+            periodCol = line.index('Period')
+            rateCol = line.index('Age_specific_birth_rate')
+            dimensionCols = [ col for col in range(len(line)) if col != periodCol and col != rateCol ]
+            dataset = Dataset([ line[col] for col in dimensionCols ])
+            continue
+        values = [ ]
+        for col in dimensionCols:
+            value = cleaned.get(line[col])
+            if (value == None):
+                value = cleaned[line[col]] = line[col].replace('–','-')
+            values.append(value)
+        dataset.append(int(line[periodCol]), float(line[rateCol]), values)
+    return dataset
+
+def getXAndYData(data, age):
+    # Gets the x and y data for the plot. These are the series' own arrays, so nothing is copied.
+    series = data[age]
+    return series.xData, series.yData
+
+# binary cache
+# How the last parseData call went: where the data came from, whether the cache was used, how long it took and how many rows.
+loadStats = {}
+
+CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '.cache')
+# The magic holds the format version, the array item sizes and the byte order, so a cache made on a
+# different machine is parsed again instead of being misread.
+CACHE_MAGIC = b'NZBR1' + bytes([array('i').itemsize, array('d').itemsize]) + (b'L' if sys.byteorder == 'little' else b'B')
+# magic, source size, source mtime in ns, sha1 of the source, number of series
+CACHE_HEADER = struct.Struct('<8sqq20sI')
+# length of the age group name, number of rows
+CACHE_SERIES = struct.Struct('<II')
+
+def getCachePath(source, cacheDir=None):
+    # Each csv path gets its own cache file, named after the file and a crc32 of its whole path, so files
+    # with the same name in different folders don't share one. The pasted dataset is cached as 'embedded'.
+    # zlib is used instead of hashlib because it is much quicker to import, and this runs on every start.
+    if (source == None):
+        return os.path.join(cacheDir or CACHE_DIR, 'embedded.bin')
+    path = os.path.abspath(source)
+    name = '%s-%08x.bin' % (os.path.basename(path), zlib.crc32(path.encode('utf-8')))
+    return os.path.join(cacheDir or CACHE_DIR, name)
+
+def getSourceStamp(source):
+    # Gets the size and mtime of a csv path. The pasted dataset can only change when this file does.
+    stat = os.stat(__file__ if source == None else source)
+    return stat.st_size, stat.st_mtime_ns
+
+def getSourceDigest(source):
+    # hashlib is slow to import and is only needed when a source has been touched, so it is imported here.
+    import hashlib
+    sha1 = hashlib.sha1()
+    if (source == None):
+        sha1.update(CSV.encode('utf-8'))
+        return sha1.digest()
+    with open(source, 'rb') as file:
+        for chunk in iter(lambda: file.read(1 << 20), b''):
+            sha1.update(chunk)
+    return sha1.digest()
+
+def loadCachedData(source, data, cacheDir=None):
+    # Loads the cache of a csv path (or of the pasted dataset when source is None) into data.
+    # The size and mtime are checked first, so an unchanged file is never read. If they changed the
+    # file is hashed, and it is only parsed again when its contents changed too.
+    # Returns True when the cache was used.
+    path = getCachePath(source, cacheDir)
+    size, mtime = getSourceStamp(source)
+    digest = None
+    try:
+        with open(path, 'rb') as file:
+            buffer = file.read()
+        magic, cachedSize, cachedMtime, cachedDigest, numSeries = CACHE_HEADER.unpack_from(buffer)
+        if (magic == CACHE_MAGIC):
+            if (cachedSize != size or cachedMtime != mtime):
+                digest = getSourceDigest(source)
+            if (digest == None or digest == cachedDigest):
+                addSeries(readCache(buffer, numSeries), data)
+                if (digest != None):
+                    # Only the mtime changed, so the header is stamped again to skip the hash next time.
+                    header = CACHE_HEADER.pack(CACHE_MAGIC, size, mtime, digest, numSeries)
+                    writeCache(path, header + buffer[CACHE_HEADER.size:])
+                return True
+    except (OSError, struct.error, ValueError, UnicodeDecodeError):
+        pass
+    if (digest == None):
+        digest = getSourceDigest(source)
+    parsed = readData(io.StringIO(CSV) if source == None else source, {})
+    writeCache(path, packCache(parsed, size, mtime, digest))
+    addSeries(parsed, data)
+    return False
+
+def readCache(buffer, numSeries):
+    # Copies each series straight from the cache bytes into its typed arrays.
+    view = memoryview(buffer)
+    offset = CACHE_HEADER.size
+    loaded = {}
+    for i in range(numSeries):
+        nameLength, count = CACHE_SERIES.unpack_from(buffer, offset)
+        offset += CACHE_SERIES.size
+        age = bytes(view[offset:offset + nameLength]).decode('utf-8')
+        offset += nameLength
+        series = loaded[age] = Series()
+        xEnd = offset + count * series.xData.itemsize
+        yEnd = xEnd + count * series.yData.itemsize
+        if (yEnd > len(buffer)):
+            raise ValueError('Truncated cache file')
+        series.xData.frombytes(view[offset:xEnd])
+        series.yData.frombytes(view[xEnd:yEnd])
+        offset = yEnd
+    return loaded
+
+def addSeries(loaded, data):
+    # Adds newly loaded series to data, after any rows data already had for the same age group.
+    for age in loaded:
+        if (age in data):
+            data[age].xData.extend(loaded[age].xData)
+            data[age].yData.extend(loaded[age].yData)
+        else:
+            data[age] = loaded[age]
+
+def packCache(data, size, mtime, digest):
+    parts = [ CACHE_HEADER.pack(CACHE_MAGIC, size, mtime, digest, len(data)) ]
+    for age in data:
+        name = age.encode('utf-8')
+        series = data[age]
+        parts.append(CACHE_SERIES.pack(len(name), len(series)))
+        parts.append(name)
+        parts.append(series.xData.tobytes())
+        parts.append(series.yData.tobytes())
+    return b''.join(parts)
+
+def writeCache(path, contents):
+    # Writes to a temporary file first, so a half written cache is never read.
+    # The cache is only there to save time, so a folder that can't be written to is ignored.
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tempPath = path + '.%d.tmp' % os.getpid()
+        with open(tempPath, 'wb') as file:
+            file.write(contents)
+        os.replace(tempPath, path)
+    except OSError:
+        pass
+
+def clearCache(source=None, cacheDir=None, allFiles=False):
+    # Deletes the cache of one source, or every cache file when allFiles is True. Returns how many were deleted.
+    cacheDir = cacheDir or CACHE_DIR
+    if (allFiles == True):
+        if (os.path.isdir(cacheDir) == False):
+            return 0
+        paths = [ os.path.join(cacheDir, name) for name in os.listdir(cacheDir) if name.endswith('.bin') ]
+    else:
+        paths = [ getCachePath(source, cacheDir) ]
+    count = 0
+    for path in paths:
+        try:
+            os.remove(path)
+            count += 1
+        except FileNotFoundError:
+            pass
+    return count
+
+def main():
+    import argparse
+    parser = argparse.ArgumentParser(description='Manage the binary cache of parsed birth rate data.')
+    parser.add_argument('csv', nargs='?', default=None, help='Stats NZ csv file (default: the embedded dataset)')
+    parser.add_argument('--clear-cache', action='store_true', help="delete the csv's cache file")
+    parser.add_argument('--clear-all', action='store_true', help='delete every cache file')
+    parser.add_argument('--time', action='store_true', help='time a parse of the csv against a load from the cache')
+    args = parser.parse_args()
+    if (args.clear_all == True):
+        print('Deleted %d cache files from %s' % (clearCache(allFiles=True), CACHE_DIR))
+    elif (args.clear_cache == True):
+        print('Deleted %d cache files' % clearCache(args.csv))
+    if (args.time == True):
+        parseData(args.csv, useCache=False)
+        print('csv parse:  %8.2f ms, %d rows' % (loadStats['seconds'] * 1000, loadStats['rows']))
+        parseData(args.csv)
+        parseData(args.csv)
+        print('cache load: %8.2f ms, %d rows (cached: %s)' % (loadStats['seconds'] * 1000, loadStats['rows'], loadStats['cached']))
+
+CSV = '''Period,Mothers_Age,Age_specific_birth_rate
+2005,Under 15,0.2
+2005,15–19,27.2
+2005,20–24,67.6
+2005,25–29,104.9
+2005,30–34,117.1
+2005,35–39,62.3
+2005,40–44,12
+2005,45 and over,0.6
+2006,Under 15,0.2
+2006,15–19,28.1
+2006,20–24,70.9
+2006,25–29,105.2
+2006,30–34,119.3
+2006,35–39,63.7
+2006,40–44,12.3
+2006,45 and over,0.7
+2007,Under 15,0.3
+2007,15–19,31.4
+2007,20–24,76.5
+2007,25–29,114.2
+2007,30–34,126.9
+2007,35–39,70.3
+2007,40–44,13.7
+2007,45 and over,0.7
+2008,Under 15,0.3
+2008,15–19,33.1
+2008,20–24,79.5
+2008,25–29,113.4
+2008,30–34,125.3
+2008,35–39,71.6
+2008,40–44,13.9
+2008,45 and over,0.7
+2009,Under 15,0.2
+2009,15–19,29.6
+2009,20–24,78.7
+2009,25–29,109.7
+2009,30–34,123.1
+2009,35–39,69.4
+2009,40–44,14.4
+2009,45 and over,0.6
+2010,Under 15,0.2
+2010,15–19,29
+2010,20–24,78.9
+2010,25–29,112.7
+2010,30–34,126.5
+2010,35–39,70.7
+2010,40–44,15.2
+2010,45 and over,0.8
+2011,Under 15,0.2
+2011,15–19,25.8
+2011,20–24,74.4
+2011,25–29,109.1
+2011,30–34,122.7
+2011,35–39,70.2
+2011,40–44,14.6
+2011,45 and over,0.8
+2012,Under 15,0.1
+2012,15–19,24.6
+2012,20–24,73.1
+2012,25–29,110.7
+2012,30–34,124.4
+2012,35–39,69.5
+2012,40–44,15.1
+2012,45 and over,0.7
+2013,Under 15,0.1
+2013,15–19,21.6
+2013,20–24,68.5
+2013,25–29,106.8
+2013,30–34,118.1
+2013,35–39,69.8
+2013,40–44,14.6
+2013,45 and over,0.9
+2014,Under 15,0.2
+2014,15–19,19
+2014,20–24,62.4
+2014,25–29,102.3
+2014,30–34,118.6
+2014,35–39,66.4
+2014,40–44,14.2
+2014,45 and over,0.7
+2015,Under 15,0.2
+2015,15–19,18.6
+2015,20–24,64.7
+2015,25–29,103.8
+2015,30–34,124.1
+2015,35–39,70.8
+2015,40–44,14.6
+2015,45 and over,1
+2016,Under 15,0.1
+2016,15–19,16
+2016,20–24,58.9
+2016,25–29,97.3
+2016,30–34,118.6
+2016,35–39,67.8
+2016,40–44,14.3
+2016,45 and over,0.8
+2017,Under 15,0.1
+2017,15–19,14.9
+2017,20–24,57.3
+2017,25–29,94.6
+2017,30–34,115.1
+2017,35–39,65.3
+2017,40–44,14.7
+2017,45 and over,0.9
+2018,Under 15,0.1
+2018,15–19,13.4
+2018,20–24,53.2
+2018,25–29,89.1
+2018,30–34,109.3
+2018,35–39,63.7
+2018,40–44,13.9
+2018,45 and over,0.9
+2019,Under 15,0.1
+2019,15–19,12.8
+2019,20–24,52.4
+2019,25–29,89
+2019,30–34,110.6
+2019,35–39,64.8
+2019,40–44,14.7
+2019,45 and over,0.9
+2020,Under 15,0.1
+2020,15–19,12.2
+2020,20–24,48.8
+2020,25–29,83.9
+2020,30–34,104.1
+2020,35–39,60.7
+2020,40–44,13.4
+2020,45 and over,0.9'''
+
+if (__name__ == '__main__'):
+    main()
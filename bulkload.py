@@ -0,0 +1,140 @@
+'''
+Loads many Stats NZ csv files at once, like one file per release. The files are
+parsed in worker processes, which hand back each file's series in shared memory,
+packed the same way as the binary cache, so nothing is pickled. The series are
+then merged into one dictionary of Series, like parseData() makes.
+Usage: python bulkload.py source [--processes N] [--conflict first|last|error] [--no-cache]
+The source is a folder of csv files or a glob pattern like 'releases/*.csv'.
+'''
+
+import argparse
+import glob
+from itertools import islice
+from multiprocessing import Pool, resource_tracker, shared_memory
+import operator
+import os
+import time
+
+from birthdata import CACHE_HEADER, Series, loadStats, packCache, parseData, readCache
+
+CONFLICTS = [ 'first', 'last', 'error' ]
+
+def getPaths(source):
+    # A folder gives every csv file in it, and a pattern every file it matches, sorted so the order is always the same.
+    # A list of paths is used in the order it is given.
+    if (isinstance(source, (list, tuple)) == True):
+        return list(source)
+    if (os.path.isdir(source) == True):
+        return sorted(glob.glob(os.path.join(source, '*.csv')))
+    return sorted(glob.glob(source))
+
+def parseJob(job):
+    # Parses one file in a worker and copies its packed series into a new block of shared memory.
+    # The block is left for the main process to read and unlink.
+    path, useCache = job
+    packed = packCache(parseData(path, useCache=useCache), 0, 0, bytes(20))
+    block = shared_memory.SharedMemory(create=True, size=len(packed))
+    block.buf[:len(packed)] = packed
+    name = block.name
+    block.close()
+    if (os.name == 'posix'):
+        # The main process registers the block again when it opens it, and unlinks it, so the
+        # worker's registration is dropped here or the block would be reported as leaked at exit.
+        resource_tracker.unregister('/' + name, 'shared_memory')
+    return name, len(packed)
+
+def readBlock(name, size):
+    # Copies the series out of a worker's shared memory and frees it.
+    block = shared_memory.SharedMemory(name=name)
+    try:
+        numSeries = CACHE_HEADER.unpack_from(block.buf)[4]
+        return readCache(block.buf[:size], numSeries)
+    finally:
+        block.close()
+        block.unlink()
+
+def loadFiles(source, data=None, processes=None, conflict='last', useCache=True):
+    # Loads every file of source into data and returns it. A (period, age group) that is in more than
+    # one file is decided by the order of the files: 'first' keeps the rate from the earliest file,
+    # 'last' the latest (so a newer release replaces an older one) and 'error' raises a ValueError.
+    # Each file still goes through the binary cache, so unchanged files are not parsed again.
+    if (conflict not in CONFLICTS):
+        raise ValueError('conflict must be one of ' + ', '.join(CONFLICTS))
+    start = time.perf_counter()
+    paths = getPaths(source)
+    if (data == None):
+        data = {}
+    if (processes == 1 or len(paths) <= 1):
+        parsed = [ parseData(path, useCache=useCache) for path in paths ]
+    else:
+        with Pool(min(processes or os.cpu_count() or 1, len(paths))) as pool:
+            # imap keeps the results in the order of the files, so the conflicts are always decided the same way.
+            parsed = [ readBlock(name, size) for name, size in pool.imap(parseJob, [ (path, useCache) for path in paths ]) ]
+    conflicts = mergeSeries(parsed, data, conflict)
+    loadStats['source'] = str(source)
+    loadStats['cached'] = False
+    loadStats['seconds'] = time.perf_counter() - start
+    loadStats['rows'] = sum(len(series) for series in data.values())
+    loadStats['files'] = len(paths)
+    loadStats['conflicts'] = conflicts
+    return data
+
+def mergeSeries(parsed, data, conflict='last'):
+    # Merges the series of every file into data, in the order of the files, and sorts each age group by period.
+    # Returns how many (period, age group) keys were in more than one place.
+    ages = [ ]
+    for loaded in parsed:
+        ages.extend(age for age in loaded if age not in ages)
+    conflicts = 0
+    for age in ages:
+        parts = [ data[age] ] if age in data else [ ]
+        parts.extend(loaded[age] for loaded in parsed if age in loaded)
+        merged = Series()
+        if (isInOrder(parts) == True):
+            # Files that each cover later periods than the one before, like yearly releases, are just joined.
+            for series in parts:
+                merged.xData.extend(series.xData)
+                merged.yData.extend(series.yData)
+        else:
+            rates = {}
+            for series in parts:
+                for period, rate in zip(series.xData, series.yData):
+                    if (period in rates):
+                        conflicts += 1
+                        if (conflict == 'error'):
+                            raise ValueError('%s %d is in more than one file' % (age, period))
+                        if (conflict == 'first'):
+                            continue
+                    rates[period] = rate
+            for period in sorted(rates):
+                merged.append(period, rates[period])
+        data[age] = merged
+    return conflicts
+
+def isInOrder(parts):
+    # Whether every series is sorted by period and starts after the one before it ends, so no period is repeated.
+    last = None
+    for series in parts:
+        xData = series.xData
+        if (len(xData) == 0):
+            continue
+        if (last != None and xData[0] <= last):
+            return False
+        if (all(map(operator.lt, xData, islice(xData, 1, None))) == False):
+            return False
+        last = xData[-1]
+    return True
+
+def main():
+    parser = argparse.ArgumentParser(description='Load a folder or glob of Stats NZ birth rate csv files.')
+    parser.add_argument('source', help='a folder of csv files or a glob pattern')
+    parser.add_argument('--processes', type=int, default=None, help='number of worker processes (default: one per core)')
+    parser.add_argument('--conflict', choices=CONFLICTS, default='last', help='which file wins when a period and age group is in more than one')
+    parser.add_argument('--no-cache', action='store_true', help='parse every file instead of using the binary cache')
+    args = parser.parse_args()
+    data = loadFiles(args.source, processes=args.processes, conflict=args.conflict, useCache=not args.no_cache)
+    print('Loaded %d rows of %d age groups from %d files in %.2f s (%d conflicts)' % (
+        loadStats['rows'], len(data), loadStats['files'], loadStats['seconds'], loadStats['conflicts']))
+
+if (__name__ == '__main__'):
+    main()
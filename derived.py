@@ -0,0 +1,206 @@
+'''
+Series worked out from the parsed data: moving averages, year over year change,
+linear and LOESS trend lines and simple forecasts. Each one is kept in a bounded
+cache until the series it came from changes, so drawing the graphs again does
+not work it out again. The results are (xData, yData) arrays that can be passed
+straight to PlotManager.plotLines.
+'''
+
+from array import array
+from bisect import bisect_left
+from collections import OrderedDict
+from itertools import accumulate
+import math
+
+from plotting import getNumpy
+
+# classes
+class DerivedSeries(object):
+    '''
+    Works out derived series of one data dictionary, like parseData() makes, and keeps
+    the most recently used ones. A result is used again until its age group's series
+    gets more rows.
+    '''
+    def __init__(self, data, cacheSize=64):
+        self.data = data
+        self.cache = OrderedDict()
+        self.cacheSize = cacheSize
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, age, transform, **params):
+        # Returns the (xData, yData) of one transform of one age group, like get('30-34', 'movingAverage', window=5).
+        # The arrays are shared with the cache, so they should not be changed.
+        series = self.data[age]
+        key = (age, transform, tuple(sorted(params.items())))
+        entry = self.cache.get(key)
+        # The series is kept in the entry, so a series that was replaced is never mistaken for the one it replaced.
+        if (entry != None and entry[0] is series and entry[1] == len(series)):
+            self.cache.move_to_end(key)
+            self.hits += 1
+            return entry[2]
+        self.misses += 1
+        result = TRANSFORMS[transform](series.xData, series.yData, **params)
+        self.cache[key] = (series, len(series), result)
+        self.cache.move_to_end(key)
+        if (len(self.cache) > self.cacheSize):
+            self.cache.popitem(last=False)
+        return result
+
+    def clear(self):
+        self.cache.clear()
+
+def getMovingAverage(xData, yData, window=5):
+    # The mean of each rate and the window - 1 rates before it, from the window'th period on.
+    n = len(yData)
+    if (window < 1 or n < window):
+        return array('i'), array('d')
+    np = getNumpy(n)
+    if (np != None):
+        sums = np.cumsum(np.concatenate(([ 0.0 ], np.asarray(yData, dtype=float))))
+        return xData[window - 1:], toArray((sums[window:] - sums[:-window]) / window)
+    sums = list(accumulate(yData, initial=0.0))
+    return xData[window - 1:], array('d', [ (sums[i] - sums[i - window]) / window for i in range(window, n + 1) ])
+
+def getYearOverYear(xData, yData, lag=1, percent=True):
+    # The change in each rate since lag periods before, as a percentage by default.
+    # Periods with no rate lag periods before, or a rate of 0 when percent is True, are left out.
+    n = len(yData)
+    np = getNumpy(n)
+    if (np != None):
+        x, y = np.asarray(xData), np.asarray(yData, dtype=float)
+        before = np.minimum(np.searchsorted(x, x - lag), n - 1)
+        keep = x[before] == x - lag
+        if (percent == True):
+            keep &= y[before] != 0
+        x, y, previous = x[keep], y[keep], y[before[keep]]
+        change = (y - previous) / previous * 100 if percent == True else y - previous
+        return toArray(x, 'i'), toArray(change)
+    xOut, yOut = array('i'), array('d')
+    for i in range(n):
+        j = bisect_left(xData, xData[i] - lag)
+        if (j >= n or xData[j] != xData[i] - lag or (percent == True and yData[j] == 0)):
+            continue
+        xOut.append(xData[i])
+        yOut.append((yData[i] - yData[j]) / yData[j] * 100 if percent == True else yData[i] - yData[j])
+    return xOut, yOut
+
+def getLinearTrend(xData, yData):
+    # The least squares line through every rate, at each period.
+    intercept, slope = getLineFit(xData, yData)
+    np = getNumpy(len(xData))
+    if (np != None):
+        return xData[:], toArray(intercept + slope * np.asarray(xData, dtype=float))
+    return xData[:], array('d', [ intercept + slope * xVal for xVal in xData ])
+
+def getLineFit(xData, yData):
+    # The intercept and slope of the least squares line. A single period gives a flat line.
+    n = len(xData)
+    if (n == 0):
+        return 0.0, 0.0
+    np = getNumpy(n)
+    if (np != None):
+        x, y = np.asarray(xData, dtype=float), np.asarray(yData, dtype=float)
+        xMean, yMean = x.mean(), y.mean()
+        spread = ((x - xMean) ** 2).sum()
+        slope = 0.0 if spread == 0 else float(((x - xMean) * (y - yMean)).sum() / spread)
+        return float(yMean - slope * xMean), slope
+    xMean, yMean = sum(xData) / n, sum(yData) / n
+    spread = sum((xVal - xMean) ** 2 for xVal in xData)
+    slope = 0.0 if spread == 0 else sum((xData[i] - xMean) * (yData[i] - yMean) for i in range(n)) / spread
+    return yMean - slope * xMean, slope
+
+def getLoessTrend(xData, yData, fraction=0.3, points=200):
+    # A LOESS curve: at each period, a line fitted to the nearest fraction of the rates, weighted by how
+    # near they are. Long series are only fitted at up to points evenly spread periods, and joined with
+    # straight lines in between, which is hard to tell apart at the size of the graph.
+    n = len(xData)
+    if (n < 2):
+        return xData[:], array('d', yData)
+    span = min(n, max(2, math.ceil(fraction * n)))
+    anchors = sorted(set(round(i * (n - 1) / (min(points, n) - 1)) for i in range(min(points, n))))
+    np = getNumpy(n)
+    x = np.asarray(xData, dtype=float) if np != None else xData
+    y = np.asarray(yData, dtype=float) if np != None else yData
+    fits = [ ]
+    low = 0
+    for i in anchors:
+        # The window of the span nearest rates only moves right as i does.
+        low = max(low, min(i - span // 2, n - span), 0)
+        while (low + span < n and x[i] - x[low] > x[low + span] - x[i]):
+            low += 1
+        while (low > 0 and x[low + span - 1] - x[i] > x[i] - x[low - 1]):
+            low -= 1
+        fits.append(getLocalFit(x, y, low, low + span, x[i], np))
+    if (np != None):
+        return xData[:], toArray(np.interp(x, x[anchors], fits))
+    yOut = array('d')
+    for k in range(len(anchors) - 1):
+        first, last = anchors[k], anchors[k + 1]
+        for i in range(first, last):
+            part = (x[i] - x[first]) / (x[last] - x[first]) if x[last] != x[first] else 0
+            yOut.append(fits[k] + part * (fits[k + 1] - fits[k]))
+    yOut.append(fits[-1])
+    return xData[:], yOut
+
+def getLocalFit(x, y, first, last, xVal, np):
+    # The value at xVal of the line through x[first:last] and y[first:last], with tricube weights.
+    # The periods are measured from xVal, so the sums stay small and the value is the line's intercept.
+    if (np != None):
+        xs, ys = x[first:last] - xVal, y[first:last]
+        reach = max(-xs[0], xs[-1])
+        if (reach == 0):
+            weights = np.ones(len(xs))
+        else:
+            weights = np.abs(xs) / reach
+            weights = 1 - weights * weights * weights
+            weights = weights * weights * weights
+        # Dot products add up the weighted sums without making a new array for each one.
+        weightedX = weights * xs
+        sw, swx, swy = weights.sum(), weightedX.sum(), weights.dot(ys)
+        swxx, swxy = weightedX.dot(xs), weightedX.dot(ys)
+    else:
+        reach = max(abs(x[i] - xVal) for i in range(first, last))
+        sw = swx = swy = swxx = swxy = 0.0
+        for i in range(first, last):
+            dx = x[i] - xVal
+            weight = 1.0 if reach == 0 else (1 - (abs(dx) / reach) ** 3) ** 3
+            sw += weight
+            swx += weight * dx
+            swy += weight * y[i]
+            swxx += weight * dx * dx
+            swxy += weight * dx * y[i]
+    if (sw == 0):
+        return float(sum(y[first:last]) / (last - first))
+    spread = sw * swxx - swx * swx
+    if (spread == 0):
+        return float(swy / sw)
+    slope = (sw * swxy - swx * swy) / spread
+    return float((swy - slope * swx) / sw)
+
+def getForecast(xData, yData, steps=5, window=10):
+    # Carries the least squares line of the last window rates on for steps more periods.
+    # It starts at the last rate, so the forecast joins onto the end of the series.
+    if (len(xData) == 0):
+        return array('i'), array('d')
+    intercept, slope = getLineFit(xData[-window:], yData[-window:])
+    step = xData[-1] - xData[-2] if len(xData) > 1 else 1
+    xOut, yOut = array('i', [ xData[-1] ]), array('d', [ yData[-1] ])
+    for i in range(1, steps + 1):
+        xOut.append(xData[-1] + i * step)
+        yOut.append(intercept + slope * xOut[-1])
+    return xOut, yOut
+
+def toArray(values, typecode='d'):
+    # Copies a numpy array into a typed array like the Series use, in one go.
+    result = array(typecode)
+    result.frombytes(values.astype('i%d' % result.itemsize if typecode == 'i' else 'f8').tobytes())
+    return result
+
+TRANSFORMS = {
+    'movingAverage': getMovingAverage,
+    'yearOverYear': getYearOverYear,
+    'linear': getLinearTrend,
+    'loess': getLoessTrend,
+    'forecast': getForecast,
+}
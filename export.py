@@ -0,0 +1,156 @@
+'''
+Renders the graphs to SVG or PNG files without opening a window. The graphs are
+drawn on the headless backend and its shapes are written out as SVG. PNG files
+need the optional cairosvg package.
+Usage: python export.py outDir [--png] [--processes N] [--csv file]
+Every chart is exported: the line graph, a bar graph for each period and a
+histogram for each age group.
+'''
+
+import argparse
+from multiprocessing import Pool
+import os
+from xml.sax.saxutils import escape
+
+from backends import HeadlessBackend
+from birthdata import Rollup, parseData
+from plotting import PlotManager
+from views import Scene
+
+try:
+    import cairosvg
+except ImportError:
+    cairosvg = None
+
+COLORS = ['red','orange','yellow','green','blue','indigo','violet','black']
+
+# cmu_graphics windows are 400 by 400.
+WIDTH = 400
+HEIGHT = 400
+
+def renderSvg(backend, width=WIDTH, height=HEIGHT):
+    # Turns every visible shape of a headless backend into an SVG document.
+    parts = [ '<svg xmlns="http://www.w3.org/2000/svg" width="%d" height="%d" viewBox="0 0 %d %d">' % (width, height, width, height),
+              '<rect width="100%" height="100%" fill="white"/>' ]
+    for shape in backend.getShapes():
+        parts.append(getSvgElement(shape))
+    parts.append('</svg>')
+    return '\n'.join(parts)
+
+def getSvgElement(shape):
+    shapeType = type(shape).__name__
+    opacity = shape.opacity / 100
+    if (shapeType == 'Line'):
+        return '<line x1="%g" y1="%g" x2="%g" y2="%g" stroke="%s" stroke-width="%g" opacity="%g"/>' % (
+            shape.x1, shape.y1, shape.x2, shape.y2, getSvgColor(shape.fill), shape.lineWidth, opacity)
+    elif (shapeType == 'Circle'):
+        return '<circle cx="%g" cy="%g" r="%g" fill="%s" opacity="%g"/>' % (
+            shape.centerX, shape.centerY, shape.radius, getSvgColor(shape.fill), opacity)
+    elif (shapeType == 'Polygon'):
+        points = ' '.join('%g,%g' % (x, y) for x, y in shape.pointList)
+        return '<polygon points="%s" fill="%s" stroke="%s" stroke-width="2" opacity="%g"/>' % (
+            points, getSvgColor(shape.fill), getSvgColor(shape.border), opacity)
+    elif (shapeType == 'Label'):
+        transform = ''
+        if (shape.rotateAngle != 0):
+            transform = ' transform="rotate(%g %g %g)"' % (shape.rotateAngle, shape.centerX, shape.centerY)
+        return '<text x="%g" y="%g" font-size="%g" font-family="Arial" text-anchor="middle" dominant-baseline="central" fill="%s" opacity="%g"%s>%s</text>' % (
+            shape.centerX, shape.centerY, shape.size, getSvgColor(shape.fill), opacity, transform, escape(str(shape.value)))
+    return ''
+
+def getSvgColor(color):
+    return 'none' if color == None else color
+
+def renderChart(data, chart, option=None, rollup=None):
+    # Draws one chart on a new headless manager and returns it as SVG.
+    # option is the period for a bar graph and the age group for a histogram.
+    # A rollup of the data saves working it out again for every chart.
+    backend = HeadlessBackend()
+    manager = PlotManager(left=100,bottom=300,width=200,height=200,backend=backend)
+    if (chart == 'bar'):
+        scene = Scene(manager, data, COLORS, period=option, rollup=rollup)
+    elif (chart == 'histogram'):
+        scene = Scene(manager, data, COLORS, age=option, rollup=rollup)
+    else:
+        scene = Scene(manager, data, COLORS, rollup=rollup)
+    scene.drawLegend()
+    if (chart == 'line'):
+        scene.drawLineGraph()
+    elif (chart == 'bar'):
+        scene.drawBarGraph()
+    elif (chart == 'histogram'):
+        scene.drawHistogram()
+    else:
+        print('Invalid chart type!')
+        return None
+    manager.commit()
+    return renderSvg(backend)
+
+def writeChart(path, svg):
+    # Saves the SVG as is, or as a PNG when the path ends with .png.
+    if (path.endswith('.png')):
+        if (cairosvg == None):
+            print('PNG export needs the cairosvg package. Skipping ' + path)
+            return None
+        cairosvg.svg2png(bytestring=svg.encode('utf-8'), write_to=path)
+    else:
+        with open(path, 'w', encoding='utf-8') as file:
+            file.write(svg)
+    return path
+
+# Each worker process keeps the parsed data it was given when it started, and its rollup.
+workerData = None
+workerRollup = None
+
+def startWorker(data):
+    global workerData, workerRollup
+    workerData = data
+    workerRollup = Rollup(data)
+
+def exportJob(job):
+    chart, option, path = job
+    svg = renderChart(workerData, chart, option, workerRollup)
+    if (svg == None):
+        return None
+    return writeChart(path, svg)
+
+def getAllJobs(data, outDir, extension='svg'):
+    # One line graph, one bar graph per period and one histogram per age group.
+    jobs = [ ('line', None, os.path.join(outDir, 'line.' + extension)) ]
+    firstSeries = data[next(iter(data))]
+    for period in firstSeries.xData:
+        jobs.append(('bar', period, os.path.join(outDir, 'bar-%d.%s' % (period, extension))))
+    for age in data:
+        fileName = 'histogram-%s.%s' % (age.replace(' ', '_'), extension)
+        jobs.append(('histogram', age, os.path.join(outDir, fileName)))
+    return jobs
+
+def exportCharts(jobs, data, processes=None):
+    # Renders (chart, option, path) jobs over a pool of processes. The data is parsed once by
+    # the caller and handed to each worker when it starts, not sent again with every job.
+    if (processes == 1):
+        startWorker(data)
+        return [ exportJob(job) for job in jobs ]
+    with Pool(processes, initializer=startWorker, initargs=(data,)) as pool:
+        chunkSize = max(1, len(jobs) // (4 * (processes or os.cpu_count() or 1)))
+        return list(pool.imap_unordered(exportJob, jobs, chunksize=chunkSize))
+
+def main():
+    parser = argparse.ArgumentParser(description='Export the birth rate graphs as SVG or PNG files.')
+    parser.add_argument('outDir')
+    parser.add_argument('--png', action='store_true', help='write PNG files instead of SVG (needs cairosvg)')
+    parser.add_argument('--processes', type=int, default=None, help='number of worker processes (default: one per core)')
+    parser.add_argument('--csv', default=None, help='Stats NZ csv file to use instead of the embedded dataset')
+    args = parser.parse_args()
+    if (args.png == True and cairosvg == None):
+        print('PNG export needs the cairosvg package.')
+        return
+
+    os.makedirs(args.outDir, exist_ok=True)
+    data = parseData(args.csv)
+    jobs = getAllJobs(data, args.outDir, 'png' if args.png else 'svg')
+    paths = exportCharts(jobs, data, args.processes)
+    print('Exported %d of %d charts to %s' % (len([ path for path in paths if path != None ]), len(jobs), args.outDir))
+
+if (__name__ == '__main__'):
+    main()
@@ -0,0 +1,200 @@
+'''
+Small multiples: a grid of small graphs, like one per region, that share their
+data and their axes. Every panel has its own PlotManager, but the panels share one
+backend and shape pool, the ticks of a shared axis are worked out once for the
+whole grid, range changes go to every panel in one pass, and a commit only lays
+out the panels that changed.
+'''
+
+import math
+
+from backends import CmuBackend
+from plotting import PlotManager, ShapePool
+
+# Room around each panel for its title and tick labels: left, top, right, bottom.
+PANEL_MARGINS = (30, 26, 6, 22)
+
+# classes
+class PlotGrid(object):
+    '''
+    numPanels PlotManagers in rows of columns, filling the rectangle from (left, top).
+    The panels of a shared axis have the same range and only the outside ones are labelled.
+    '''
+    def __init__(self, numPanels, columns=4, left=0, top=0, width=400, height=400, shareX=True, shareY=True, backend=None):
+        self.backend = CmuBackend() if backend == None else backend
+        self.pool = ShapePool(self.backend)
+        self.shareX = shareX
+        self.shareY = shareY
+        self.columns = max(1, min(columns, numPanels))
+        self.rows = math.ceil(numPanels / self.columns)
+        # Every cell is the same size, so the ticks of one panel fit every other panel once they are moved across.
+        cellWidth = width / self.columns
+        cellHeight = height / max(self.rows, 1)
+        marginLeft, marginTop, marginRight, marginBottom = PANEL_MARGINS
+        self.panels = [ ]
+        for i in range(numPanels):
+            row, column = divmod(i, self.columns)
+            panel = PlotManager(left=left + column * cellWidth + marginLeft, bottom=top + (row + 1) * cellHeight - marginBottom,
+                                width=cellWidth - marginLeft - marginRight, height=cellHeight - marginTop - marginBottom,
+                                pool=self.pool, backend=self.backend)
+            panel.title.size = 10
+            # A shared x axis is only labelled under the bottom panel of each column, and a shared y axis left of each row.
+            panel.tickLabels = [ shareX == False or i + self.columns >= numPanels, shareY == False or column == 0 ]
+            self.panels.append(panel)
+        self.tickSpec = { }
+        self.ticksDirty = False
+
+    def updateRanges(self, xMin=None, xMax=None, yMin=None, yMax=None):
+        # Changes the ranges of every panel in one pass. Only the panels whose ranges changed are laid out again.
+        for panel in self.panels:
+            self.setPanelRanges(panel, xMin, xMax, yMin, yMax)
+        self.ticksDirty = True
+
+    def fitRanges(self, xMin=None, xMax=None, yMin=None, yMax=None):
+        # Fits the ranges to the data, apart from any that are given. A shared axis fits the data of every
+        # panel and an axis that isn't shared fits each panel's own.
+        ranges = [ self.getDataRanges(panel) for panel in self.panels ]
+        found = [ panelRanges for panelRanges in ranges if panelRanges != None ]
+        if (len(found) == 0):
+            return
+        shared = [ min(r[0] for r in found), max(r[1] for r in found), min(r[2] for r in found), max(r[3] for r in found) ]
+        for panel, panelRanges in zip(self.panels, ranges):
+            if (panelRanges == None):
+                panelRanges = shared
+            xFit = shared[0:2] if self.shareX == True else panelRanges[0:2]
+            yFit = shared[2:4] if self.shareY == True else panelRanges[2:4]
+            fit = [ xFit[0] if xMin == None else xMin, xFit[1] if xMax == None else xMax,
+                    yFit[0] if yMin == None else yMin, yFit[1] if yMax == None else yMax ]
+            # A range with nothing in it can't be drawn, so a single period or rate gets a range of 1.
+            if (fit[0] >= fit[1]):
+                fit[1] = fit[0] + 1
+            if (fit[2] >= fit[3]):
+                fit[3] = fit[2] + 1
+            self.setPanelRanges(panel, *fit)
+        self.ticksDirty = True
+
+    def getDataRanges(self, panel):
+        # [ xMin, xMax, yMin, yMax ] of every plot of a panel, or None when it has none.
+        plots = [ plot for plot in panel.plots if len(plot.xData) > 0 ]
+        if (len(plots) == 0):
+            return None
+        return [ min(plot.xRange[0] for plot in plots), max(plot.xRange[1] for plot in plots),
+                 min(plot.yRange[0] for plot in plots), max(plot.yRange[1] for plot in plots) ]
+
+    def setPanelRanges(self, panel, xMin=None, xMax=None, yMin=None, yMax=None):
+        # Like PlotManager.updateRanges, but the ticks are left for the grid to draw and an unchanged panel stays clean.
+        key = panel.getLayoutKey()
+        ranges = [ key[i] if value == None else value for i, value in enumerate((xMin, xMax, yMin, yMax)) ]
+        if (tuple(ranges) == key):
+            return
+        panel.xRange[0], panel.xRange[1], panel.yRange[0], panel.yRange[1] = ranges
+        panel.layoutDirty = True
+
+    def drawTicks(self, **spec):
+        # Sets the ticks of every panel, with the same arguments as PlotManager.drawTicks. Positions are
+        # given for the first panel and moved across for the others. They are drawn on the next commit().
+        self.tickSpec = spec
+        self.ticksDirty = True
+
+    def getPanelSpec(self, panel):
+        # The grid's tick spec with its positions moved onto one panel.
+        first = self.panels[0]
+        spec = dict(self.tickSpec)
+        if (spec.get('xPositions') != None):
+            spec['xPositions'] = [ xPos + panel.left - first.left for xPos in spec['xPositions'] ]
+        if (spec.get('yPositions') != None):
+            spec['yPositions'] = [ yPos + panel.bottom - first.bottom for yPos in spec['yPositions'] ]
+        return spec
+
+    def getSharedTicks(self):
+        # The ticks of each shared axis, worked out once on the first panel, or None for an axis that isn't shared.
+        first = self.panels[0]
+        spec = self.tickSpec
+        precision = spec.get('precision', [1,1])
+        xTicks, yTicks = None, None
+        if (self.shareX == True):
+            xTicks = first.getXTicks(spec.get('xPositions'), spec.get('xLabels'), precision[0], spec.get('offsetX', False))
+        if (self.shareY == True):
+            yTicks = first.getYTicks(spec.get('yPositions'), spec.get('yLabels'), precision[1], spec.get('offsetY', False))
+        return xTicks, yTicks
+
+    def commit(self):
+        # Lays out the panels that changed since the last commit, and draws the ticks when they or the ranges changed.
+        if (len(self.panels) == 0):
+            return
+        if (self.ticksDirty == True):
+            xTicks, yTicks = self.getSharedTicks()
+            for panel in self.panels:
+                panel.tickSpec = self.getPanelSpec(panel)
+                panel.showTicks(xTicks, yTicks)
+            self.ticksDirty = False
+        for panel in self.panels:
+            if (panel.layoutDirty == True or panel.ticksDirty == True or panel.labelsDirty == True):
+                panel.commit()
+
+class Facets(object):
+    '''
+    One small line graph per value of a dimension of a Dataset, like one per region, with a line for
+    each age group. Every panel is queried from the same dataset and the colors follow the age groups.
+    '''
+    def __init__(self, dataset, dimension, colors, values=None, groupBy='Mothers_Age', **gridOptions):
+        # gridOptions are passed to PlotGrid, like columns=4 or backend=HeadlessBackend().
+        self.dataset = dataset
+        self.dimension = dimension
+        self.colors = colors
+        self.groupBy = groupBy
+        self.values = list(dataset.values[dimension]) if values == None else list(values)
+        self.grid = PlotGrid(len(self.values), **gridOptions)
+        # value -> { age group -> plot }
+        self.plots = { value: { } for value in self.values }
+
+    def draw(self):
+        # Draws every panel and fits the shared axes to all of them.
+        for value in self.values:
+            self.drawPanel(value)
+        self.fitAxes()
+
+    def drawPanel(self, value):
+        # Draws one panel's lines again from the dataset. Lines that are already drawn only get the new data.
+        panel = self.grid.panels[self.values.index(value)]
+        plots = self.plots[value]
+        data = self.dataset.query(where={ self.dimension: value }, groupBy=self.groupBy)
+        for age in data:
+            series = data[age]
+            if (age in plots):
+                plots[age].updateData(series.xData, series.yData)
+            else:
+                color = self.colors[self.getAgeIndex(age) % len(self.colors)]
+                plots[age] = panel.plotLines(series.xData, series.yData, color=color, resizeToNewPlot=False)
+        panel.updateLabels(str(value), '', '')
+
+    def getAgeIndex(self, age):
+        return self.dataset.lookup[self.groupBy][age]
+
+    def fitAxes(self):
+        # Rates start from 0, and three ticks are labelled on each axis so the small panels stay readable.
+        grid = self.grid
+        grid.fitRanges(yMin=0)
+        if (len(grid.panels) == 0):
+            return
+        xMin, xMax, yMin, yMax = grid.panels[0].getLayoutKey()
+        xLabels = [ xMin + i * (xMax - xMin) // 2 for i in range(3) ]
+        xPositions, yPositions = grid.panels[0].getPositionsFromData(xLabels, None)
+        grid.drawTicks(xPositions=xPositions, xLabels=xLabels, yLabels=[ yMax, (yMin + yMax) / 2, yMin ], precision=[0,0])
+
+    def appendRows(self, rows):
+        # Adds (period, rate, values) rows to the dataset, like Dataset.append, and draws only the panels that got rows.
+        # The other panels are only laid out again when the shared ranges grow.
+        column = self.dataset.dimensions.index(self.dimension)
+        changed = [ ]
+        for period, rate, values in rows:
+            self.dataset.append(period, rate, values)
+            if (values[column] in self.plots and values[column] not in changed):
+                changed.append(values[column])
+        for value in changed:
+            self.drawPanel(value)
+        if (len(changed) > 0):
+            self.fitAxes()
+
+    def commit(self):
+        self.grid.commit()
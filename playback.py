@@ -0,0 +1,95 @@
+'''
+Plays the bar graph through every period, moving smoothly from one period's
+rates to the next. Every frame is worked out before playback starts, and each
+step only sets the heights of the bars that are already drawn. Playback keeps to
+the clock: when a step comes late, the frames it missed are skipped instead of
+slowing the animation down.
+'''
+
+from array import array
+import time
+
+from plotting import getNumpy
+
+# classes
+class FrameTable(object):
+    '''
+    The bar heights of every frame, in one flat array. Between two periods there are
+    framesPerPeriod frames, moving in a straight line from the first period's rates
+    to the next. It takes periods x framesPerPeriod x bars x 8 bytes.
+    '''
+    def __init__(self, periods, keyFrames, framesPerPeriod):
+        # keyFrames[i] are the bar heights of periods[i].
+        self.periods = list(periods)
+        self.numBars = len(keyFrames[0]) if len(keyFrames) > 0 else 0
+        self.framesPerPeriod = framesPerPeriod
+        self.numFrames = max(len(keyFrames) - 1, 0) * framesPerPeriod + min(len(keyFrames), 1)
+        self.values = array('d')
+        np = getNumpy(self.numFrames * self.numBars)
+        if (np != None and len(keyFrames) > 1):
+            keys = np.asarray(keyFrames, dtype=float)
+            steps = np.arange(framesPerPeriod) / framesPerPeriod
+            frames = keys[:-1, None, :] + (keys[1:] - keys[:-1])[:, None, :] * steps[None, :, None]
+            self.values.frombytes(frames.tobytes())
+            self.values.extend(keyFrames[-1])
+            return
+        for i in range(len(keyFrames) - 1):
+            first, last = keyFrames[i], keyFrames[i + 1]
+            for step in range(framesPerPeriod):
+                part = step / framesPerPeriod
+                self.values.extend([ first[bar] + (last[bar] - first[bar]) * part for bar in range(self.numBars) ])
+        if (len(keyFrames) > 0):
+            self.values.extend(keyFrames[-1])
+
+    def getFrame(self, frame):
+        start = frame * self.numBars
+        return self.values[start:start + self.numBars]
+
+    def getPeriod(self, frame):
+        # The period a frame is on or moving away from.
+        return self.periods[frame // self.framesPerPeriod]
+
+class Playback(object):
+    '''
+    Plays a scene's bar graph from the first period to the last, fps frames a second.
+    '''
+    def __init__(self, scene, fps=60, secondsPerPeriod=0.5):
+        self.scene = scene
+        self.fps = fps
+        periods = scene.rollup.getPeriods()
+        keyFrames = [ [ 0 if rate == None else rate for rate in scene.rollup.getCrossSection(period) ] for period in periods ]
+        self.table = FrameTable(periods, keyFrames, max(1, round(fps * secondsPerPeriod)))
+        self.plot = scene.views['bar'].plots[0]
+        self.start = None
+        self.frame = -1
+        self.period = None
+        self.droppedFrames = 0
+
+    def step(self, now=None):
+        # Shows the frame for the time now. Returns False once the last frame has been shown, or when the
+        # bar graph is no longer on screen.
+        if (self.plot not in self.scene.manager.plots or self.table.numFrames == 0):
+            return False
+        now = time.perf_counter() if now == None else now
+        if (self.start == None):
+            self.start = now
+        frame = min(int((now - self.start) * self.fps), self.table.numFrames - 1)
+        if (frame == self.frame):
+            return True
+        self.droppedFrames += max(frame - self.frame - 1, 0)
+        self.frame = frame
+        self.plot.updateData(newYData=self.table.getFrame(frame))
+        period = self.table.getPeriod(frame)
+        if (period != self.period):
+            self.period = period
+            self.scene.showBarPeriod(period)
+        return frame < self.table.numFrames - 1
+
+    def stop(self):
+        # Puts the bars back to the period the bar graph shows when it isn't playing. A bar graph that was
+        # hidden part way through is laid out again when it is next shown.
+        period = self.scene.getPeriod()
+        if (self.table.numFrames > 0 and period in self.table.periods):
+            self.plot.updateData(newYData=self.table.getFrame(self.table.periods.index(period) * self.table.framesPerPeriod))
+        if (self.plot in self.scene.manager.plots):
+            self.scene.showBarPeriod(period)
@@ -0,0 +1,1284 @@
+'''
+Plotting classes for the birth rate graphs. Shapes are made through a backend,
+so the classes can be used without cmu_graphics.
+'''
+
+from bisect import bisect_left, bisect_right
+from collections import OrderedDict
+import math
+
+from backends import CmuBackend
+
+# numpy takes longer to import than the rest of the program, so it is only imported the first
+# time a batch is big enough to be worth it.
+numpy = None
+numpyChecked = False
+NUMPY_MIN_LENGTH = 1000
+
+def getNumpy(length):
+    # Returns numpy for a batch of length values, or None for a small batch or when numpy isn't installed.
+    global numpy, numpyChecked
+    if (length < NUMPY_MIN_LENGTH):
+        return None
+    if (numpyChecked == False):
+        numpyChecked = True
+        try:
+            import numpy
+        except ImportError:
+            numpy = None
+    return numpy
+
+# classes
+class PlotManager(object):
+    '''
+    Creates methods for the manager.
+    '''
+    def __init__(self, left=85, bottom=345, width=300, height=300, title='', xLabel='', yLabel='', pool=None, backend=None):
+        # The backend makes the shapes. By default they are drawn with cmu_graphics.
+        self.backend = CmuBackend() if backend == None else backend
+        self.left = left
+        self.bottom = bottom
+        self.width = width
+        self.height = height
+
+        self.xRange = [ 0, 0 ]
+        self.yRange = [ 0, 0 ]
+
+        self.plots = [ ]
+        # Shapes that are no longer needed are kept here and reused. Managers can share one pool.
+        self.pool = ShapePool(self.backend) if pool == None else pool
+
+        # Layout is put off until commit(), so each frame only does it once.
+        self.layoutDirty = False
+        self.ticksDirty = False
+        self.labelsDirty = False
+        self.tickSpec = { }
+        self.labelSpec = None
+
+        # Recently drawn ticks are kept, hidden, in case the same ranges and labels come back.
+        self.tickCache = OrderedDict()
+        self.tickCacheSize = 8
+        self.tickKey = None
+        # Whether the x and y ticks are labelled. A grid of small graphs only labels the outside ones.
+        self.tickLabels = [ True, True ]
+
+        self.tickDrawings = self.backend.Group()
+        self.drawing = self.backend.Group(self.tickDrawings)
+        self.drawAxes(title, xLabel, yLabel)
+        # The value of the datapoint under the mouse. It is made the first time it is shown.
+        self.tooltip = None
+        # The ranges and ticks from before the first zoom, and the box being dragged out to zoom into.
+        self.zoomHome = None
+        self.zoomBox = None
+        self.zoomStart = None
+
+    def drawAxes(self, title, xLabel, yLabel):
+        l, b, w, h = self.left, self.bottom, self.width, self.height
+        self.title = self.backend.Label(title, l + (w / 2), b - h - 10, size=14)
+        self.xLabel = self.backend.Label(xLabel, l + w / 2, b + 30)
+        self.yLabel = self.backend.Label(yLabel, l - 40, b - h / 2, rotateAngle=-90)
+        self.drawing.add(
+            self.backend.Line(l, b - h, l, b + 5, fill='silver', lineWidth=3),
+            self.backend.Line(l - 5, b, l + w, b, fill='silver', lineWidth=3),
+            self.title, self.xLabel, self.yLabel
+            )
+
+    def getKDecimalPlaces(self, num, k):
+        num = ((num * (10 ** k)) // 1) / (10 ** k)
+        if (k <= 0):
+            return int(num)
+        else:
+            return num
+
+    def drawTicks(self, xPositions=None, xLabels=None, yPositions=None, yLabels=None, precision=[1,1], offsetX=False, offsetY=False):
+        # The ticks are drawn on the next commit().
+        self.tickSpec = { 'xPositions': xPositions, 'xLabels': xLabels, 'yPositions': yPositions, 'yLabels': yLabels,
+                        'precision': precision, 'offsetX': offsetX, 'offsetY': offsetY }
+        self.ticksDirty = True
+
+    def getTickKey(self):
+        # Everything that changes where the ticks go or what they say.
+        spec = self.tickSpec
+        key = [ tuple(self.xRange), tuple(self.yRange) ]
+        for name in ('xPositions', 'xLabels', 'yPositions', 'yLabels', 'precision'):
+            value = spec.get(name)
+            key.append(None if value == None else tuple(value))
+        key.append(spec.get('offsetX', False))
+        key.append(spec.get('offsetY', False))
+        return tuple(key)
+
+    def showTicks(self, xTicks=None, yTicks=None):
+        # Ticks that were drawn recently for the same key are shown again instead of being rebuilt.
+        # The ticks of an axis shared with other managers can be passed in, from their getXTicks() or getYTicks().
+        key = self.getTickKey()
+        if (key == self.tickKey):
+            return
+        if (self.tickKey != None):
+            self.tickDrawings.visible = False
+        if (key in self.tickCache):
+            self.tickCache.move_to_end(key)
+            self.tickDrawings = self.tickCache[key]
+            self.tickDrawings.visible = True
+            self.tickKey = key
+            return
+
+        if (self.tickKey == None):
+            # The ticks drawn before anything was cached are rebuilt in place.
+            group = self.tickDrawings
+        elif (len(self.tickCache) >= self.tickCacheSize):
+            # The least recently used ticks give up their group and shapes.
+            oldKey, group = self.tickCache.popitem(last=False)
+        else:
+            group = self.backend.Group()
+            self.drawing.add(group)
+        self.tickDrawings = group
+        group.visible = True
+        self.layoutTicks(xTicks, yTicks)
+        self.tickCache[key] = group
+        self.tickKey = key
+
+    def layoutTicks(self, xTicks=None, yTicks=None):
+        # Works out the ticks of the tick spec that weren't passed in, and draws them.
+        spec = self.tickSpec
+        precision = spec.get('precision', [1,1])
+        if (xTicks == None):
+            xTicks = self.getXTicks(spec.get('xPositions'), spec.get('xLabels'), precision[0], spec.get('offsetX', False))
+        if (yTicks == None):
+            yTicks = self.getYTicks(spec.get('yPositions'), spec.get('yLabels'), precision[1], spec.get('offsetY', False))
+        self.placeTicks(xTicks, yTicks)
+
+    def getXTicks(self, xPositions=None, xLabels=None, precision=1, offsetX=False):
+        # The x ticks as (left, [ (x position, label) ]). Any manager with the same x range and width can draw them.
+        xLen = 11 if xLabels == None else len(xLabels)
+        xOffset = 0 if offsetX == False else 0.5
+        xLabDefaults = [ ]
+        for i in range(xLen):
+            xVal = self.xRange[0] + (i + xOffset) * (self.xRange[1] - self.xRange[0]) / (xLen - 2 * (0.5 - xOffset))
+            xLabDefaults.append(xVal)
+        if (xPositions == None):
+            xPositions = self.getPositionsFromData(xLabDefaults, None)[0]
+        if (xLabels == None):
+            xLabels = xLabDefaults
+        return self.left, [ (xPositions[ind], self.getTickText(xLabels[ind], precision)) for ind in range(len(xPositions)) ]
+
+    def getYTicks(self, yPositions=None, yLabels=None, precision=1, offsetY=False):
+        # The y ticks as (bottom, [ (y position, label) ]), from the top down, like getXTicks().
+        yLen = 11 if yLabels == None else len(yLabels)
+        yOffset = 0 if offsetY == False else 0.5
+        yLabDefaults = [ ]
+        for i in range(yLen-1, -1, -1):
+            yVal = self.yRange[0] + (i + yOffset) * (self.yRange[1] - self.yRange[0]) / (yLen - 2 * (0.5 - yOffset))
+            yLabDefaults.append(yVal)
+        if (yPositions == None):
+            yPositions = self.getPositionsFromData(None, yLabDefaults)[1]
+        if (yLabels == None):
+            yLabels = yLabDefaults
+        return self.bottom, [ (yPositions[ind], self.getTickText(yLabels[ind], precision)) for ind in range(len(yPositions)) ]
+
+    def getTickText(self, label, precision):
+        if (isinstance(label, int) or isinstance(label, float)):
+            return self.getKDecimalPlaces(label, precision)
+        return label
+
+    def placeTicks(self, xTicks, yTicks):
+        # Draws ticks from getXTicks() and getYTicks(), moved across when another manager worked them out.
+        # The labels are left out of an axis whose tickLabels is False.
+        (xOrigin, xTickList), (yOrigin, yTickList) = xTicks, yTicks
+        l, b = self.left, self.bottom
+        xShift, yShift = l - xOrigin, b - yOrigin
+        self.pool.releaseAll(self.tickDrawings)
+
+        for xPos, xLab in xTickList:
+            xPos += xShift
+            self.tickDrawings.add(self.pool.getLine(xPos, b - 3, xPos, b + 3, fill='silver'))
+            if (self.tickLabels[0] == True):
+                self.tickDrawings.add(self.pool.getLabel(xLab, xPos, b + 5, rotateAngle=-20, align='top'))
+
+        for yPos, yLab in yTickList:
+            yPos += yShift
+            self.tickDrawings.add(self.pool.getLine(l - 3, yPos, l + 3, yPos, fill='silver'))
+            if (self.tickLabels[1] == True):
+                self.tickDrawings.add(self.pool.getLabel(yLab, l - 7, yPos, align='right'))
+
+    def getPositionFromData(self, dataXVal, dataYVal):
+        xMin, xMax = self.xRange[0], self.xRange[1]
+        yMin, yMax = self.yRange[0], self.yRange[1]
+
+        xPos = self.left + ((dataXVal - xMin) * self.width) / (xMax - xMin)
+        yPos = self.bottom - ((dataYVal - yMin) * self.height) / (yMax - yMin)
+        return xPos, yPos
+
+    def getDataFromPosition(self, xPos, yPos):
+        xMin, xMax = self.xRange[0], self.xRange[1]
+        yMin, yMax = self.yRange[0], self.yRange[1]
+
+        dataXVal = ((xPos - self.left) * (xMax - xMin)) / self.width + xMin
+        dataYVal = ((self.bottom - yPos) * (yMax - yMin)) / self.height + yMin
+        return dataXVal, dataYVal
+
+    def getPositionsFromData(self, xData, yData):
+        # Same as getPositionFromData, but for whole lists of data at once. Either list can be None.
+        xMin, xMax = self.xRange[0], self.xRange[1]
+        yMin, yMax = self.yRange[0], self.yRange[1]
+        xScale = self.width / (xMax - xMin)
+        yScale = -self.height / (yMax - yMin)
+        xPositions = self.transform(xData, self.left - xMin * xScale, xScale)
+        yPositions = self.transform(yData, self.bottom - yMin * yScale, yScale)
+        return xPositions, yPositions
+
+    def getDataFromPositions(self, xPositions, yPositions):
+        # Same as getDataFromPosition, but for whole lists of positions at once. Either list can be None.
+        xMin, xMax = self.xRange[0], self.xRange[1]
+        yMin, yMax = self.yRange[0], self.yRange[1]
+        xScale = (xMax - xMin) / self.width
+        yScale = -(yMax - yMin) / self.height
+        dataXVals = self.transform(xPositions, xMin - self.left * xScale, xScale)
+        dataYVals = self.transform(yPositions, yMin - self.bottom * yScale, yScale)
+        return dataXVals, dataYVals
+
+    def transform(self, values, offset, scale):
+        # Returns offset + value * scale for every value, using numpy for big batches when it is installed.
+        if (values is None):
+            return None
+        np = getNumpy(len(values))
+        if (np != None):
+            return (np.asarray(values, dtype=float) * scale + offset).tolist()
+        return [ offset + val * scale for val in values ]
+
+    def updateRanges(self, xMin=None, xMax=None, yMin=None, yMax=None):
+        if (xMin != None):
+            self.xRange[0] = xMin
+        if (xMax != None):
+            self.xRange[1] = xMax
+        if (yMin != None):
+            self.yRange[0] = yMin
+        if (yMax != None):
+            self.yRange[1] = yMax
+
+        self.layoutDirty = True
+        self.drawTicks()
+
+    def commit(self):
+        # Does all of the layout asked for since the last commit in one pass.
+        if (self.layoutDirty == True):
+            layoutKey = self.getLayoutKey()
+            for plot in self.plots:
+                # Plots that were last laid out for these exact ranges are already in place.
+                if (plot.layoutKey != layoutKey):
+                    plot.updateDrawing()
+        if (self.ticksDirty == True):
+            self.showTicks()
+        if (self.labelsDirty == True):
+            self.layoutLabels(*self.labelSpec)
+        self.layoutDirty = False
+        self.ticksDirty = False
+        self.labelsDirty = False
+
+    def getLayoutKey(self):
+        # Used to tell whether a plot's shapes were drawn for the current ranges.
+        return (self.xRange[0], self.xRange[1], self.yRange[0], self.yRange[1])
+
+    def getZoomAxes(self):
+        # Bars are placed at fixed positions along one axis, so only the other axis can be zoomed.
+        zoomX, zoomY = True, True
+        for plot in self.plots:
+            if (plot.plotType == 'vert bar'):
+                zoomX = False
+            elif (plot.plotType == 'horiz bar'):
+                zoomY = False
+        return zoomX, zoomY
+
+    def setViewport(self, xMin, xMax, yMin, yMax):
+        # Shows only part of the data. The ranges and ticks from before the first zoom are kept for resetZoom().
+        if (xMin >= xMax or yMin >= yMax):
+            return
+        if (self.zoomHome == None):
+            self.zoomHome = [ list(self.getLayoutKey()), dict(self.tickSpec) ]
+        # Tick labels that were given for the old ranges are left out, so the default ticks follow the new ranges.
+        spec = dict(self.tickSpec)
+        if ([ xMin, xMax ] != self.xRange):
+            spec['xPositions'], spec['xLabels'] = None, None
+        if ([ yMin, yMax ] != self.yRange):
+            spec['yPositions'], spec['yLabels'] = None, None
+        self.updateRanges(xMin, xMax, yMin, yMax)
+        self.drawTicks(**spec)
+
+    def zoom(self, factor, xPos=None, yPos=None):
+        # Zooms in by factor (or out, when it is less than 1), keeping the data under (xPos, yPos) in place.
+        # By default the middle of the plot stays in place.
+        zoomX, zoomY = self.getZoomAxes()
+        xPos = self.left + self.width / 2 if xPos == None else xPos
+        yPos = self.bottom - self.height / 2 if yPos == None else yPos
+        xVal, yVal = self.getDataFromPosition(xPos, yPos)
+        xMin, xMax, yMin, yMax = self.getLayoutKey()
+        if (zoomX == True):
+            xMin, xMax = xVal - (xVal - xMin) / factor, xVal + (xMax - xVal) / factor
+        if (zoomY == True):
+            yMin, yMax = yVal - (yVal - yMin) / factor, yVal + (yMax - yVal) / factor
+        self.setViewport(xMin, xMax, yMin, yMax)
+
+    def pan(self, dx, dy):
+        # Moves the view dx pixels to the right and dy pixels up, so the data moves the other way.
+        zoomX, zoomY = self.getZoomAxes()
+        xMin, xMax, yMin, yMax = self.getLayoutKey()
+        xShift = dx * (xMax - xMin) / self.width if zoomX == True else 0
+        yShift = dy * (yMax - yMin) / self.height if zoomY == True else 0
+        self.setViewport(xMin + xShift, xMax + xShift, yMin + yShift, yMax + yShift)
+
+    def zoomToBox(self, x1, y1, x2, y2):
+        # Zooms into the rectangle between two corners, given in pixels.
+        zoomX, zoomY = self.getZoomAxes()
+        (xMin, xMax), (yMin, yMax) = self.xRange, self.yRange
+        (xVal1, xVal2), (yVal1, yVal2) = self.getDataFromPositions([ x1, x2 ], [ y1, y2 ])
+        if (zoomX == True):
+            xMin, xMax = min(xVal1, xVal2), max(xVal1, xVal2)
+        if (zoomY == True):
+            yMin, yMax = min(yVal1, yVal2), max(yVal1, yVal2)
+        self.setViewport(xMin, xMax, yMin, yMax)
+
+    def resetZoom(self):
+        # Goes back to the ranges and ticks from before the first zoom.
+        if (self.zoomHome == None):
+            return
+        ranges, spec = self.zoomHome
+        self.zoomHome = None
+        self.updateRanges(*ranges)
+        self.drawTicks(**spec)
+
+    def startZoomBox(self, xPos, yPos):
+        # Starts a zoom box when the mouse is pressed inside the plot. Returns whether it was.
+        if (xPos < self.left or xPos > self.left + self.width or yPos < self.bottom - self.height or yPos > self.bottom):
+            return False
+        self.zoomStart = (xPos, yPos)
+        return True
+
+    def dragZoomBox(self, xPos, yPos):
+        # Draws the box from where the mouse was pressed to where it is now, kept inside the plot.
+        if (self.zoomStart == None):
+            return
+        x1, y1 = self.zoomStart
+        x2 = min(max(xPos, self.left), self.left + self.width)
+        y2 = min(max(yPos, self.bottom - self.height), self.bottom)
+        pointList = [ [ x1, y1 ], [ x2, y1 ], [ x2, y2 ], [ x1, y2 ] ]
+        if (self.zoomBox == None):
+            self.zoomBox = self.backend.Polygon(x1, y1, x2, y1, x2, y2, x1, y2, fill=None, border='gray')
+            self.drawing.add(self.zoomBox)
+        else:
+            self.zoomBox.pointList = pointList
+            self.zoomBox.visible = True
+
+    def endZoomBox(self):
+        # Zooms into the box when the mouse is let go. A box only a few pixels across was a click, so it is ignored.
+        if (self.zoomStart == None):
+            return
+        self.zoomStart = None
+        if (self.zoomBox == None or self.zoomBox.visible == False):
+            return
+        self.zoomBox.visible = False
+        (x1, y1), (x2, y2) = self.zoomBox.pointList[0], self.zoomBox.pointList[2]
+        if (abs(x2 - x1) >= 5 and abs(y2 - y1) >= 5):
+            self.zoomToBox(x1, y1, x2, y2)
+
+    def removePlot(self, plot):
+        if (plot not in self.plots):
+            print('Plot does not exist')
+            return
+        self.plots.remove(plot)
+        plot.drawing.visible = False
+
+    def deletePlot(self, plot):
+        # Removes a plot for good and gives its shapes back to the pool.
+        if (plot in self.plots):
+            self.removePlot(plot)
+        self.pool.releaseAll(plot.drawing)
+        plot.numShapes = 0
+
+    def addPlot(self, plot):
+        # Shows a plot that was removed earlier without drawing it again.
+        if (plot in self.plots):
+            print('Plot already exists')
+            return
+        if (plot.layoutKey != self.getLayoutKey()):
+            self.layoutDirty = True
+        self.plots.append(plot)
+        plot.drawing.visible = True
+
+    def createPlot(self, xData, yData, plotType, color, resizeToNewPlot):
+        if (len(xData) != len(yData)):
+            print('Data lists were not the same length. Cannot plot!')
+            return
+        if ((isinstance(color, list) == True) and (len(color) != len(xData))):
+            print('Color list and data were not the same length. Using default color!')
+            color = 'black'
+
+        newPlot = Plot(self, plotType, xData, yData)
+
+        if (resizeToNewPlot == True):
+            self.updateRanges(xMin=newPlot.xRange[0], xMax=newPlot.xRange[1],
+                            yMin=newPlot.yRange[0], yMax=newPlot.yRange[1])
+
+        newPlot.draw(color=color)
+        self.plots.append(newPlot)
+        self.drawing.toFront()
+        return newPlot
+
+    def plotPoints(self, xData, yData, color='black', resizeToNewPlot=True):
+        return self.createPlot(xData, yData, 'scatter', color, resizeToNewPlot)
+
+    def plotLines(self, xData, yData, color='black', resizeToNewPlot=True):
+        # Every segment is its own Line. cmu_graphics has no open polyline: a Polygon's border is clipped to
+        # the inside of the polygon, so a line drawn as a Polygon doesn't show. Level of detail keeps long lines
+        # down to a few Lines per pixel column, and the Lines come from the pool, so a new line reuses the
+        # Lines of deleted ones and a line that is laid out again keeps its own.
+        return self.createPlot(xData, yData, 'line', color, resizeToNewPlot)
+
+    def plotHorizontalBars(self, xData, yPositions=None, color='black', resizeToNewPlot=True):
+        if (yPositions == None):
+            yPositions = [ ]
+            numBars = len(xData)
+            top = self.bottom - self.height
+            for i in range(numBars):
+                yPositions.append(top + (i + 0.5) * (self.height / numBars))
+
+        return self.createPlot(xData, yPositions, 'horiz bar', color, resizeToNewPlot)
+
+    def plotVerticalBars(self, yData, xPositions=None, color='black', resizeToNewPlot=True):
+        if (xPositions == None):
+            xPositions = [ ]
+            numBars = len(yData)
+            for i in range(numBars):
+                xPositions.append(self.left + (i + 0.5) * (self.width / numBars))
+
+        return self.createPlot(xPositions, yData, 'vert bar', color, resizeToNewPlot)
+    
+    def getHoveredPoint(self, xPos, yPos, maxDistance=10):
+        # Finds the shown datapoint nearest to the mouse, within maxDistance pixels, over every plot.
+        # Returns (plot, data index, x position, y position), or None.
+        best = None
+        for plot in self.plots:
+            hit = plot.getNearestPoint(xPos, yPos, maxDistance)
+            if (hit != None and (best == None or hit[0] < best[0])):
+                best = hit + (plot,)
+        if (best == None):
+            return None
+        distance, ind, pointX, pointY, plot = best
+        return plot, ind, pointX, pointY
+
+    def updateTooltip(self, xPos, yPos):
+        # Shows the value of the datapoint under the mouse next to it, or hides the tooltip when there is none.
+        hit = self.getHoveredPoint(xPos, yPos)
+        if (hit == None):
+            if (self.tooltip != None):
+                self.tooltip.visible = False
+            return
+        plot, ind, pointX, pointY = hit
+        if (plot.plotType == 'vert bar'):
+            text = '%g' % plot.yData[ind]
+        elif (plot.plotType == 'horiz bar'):
+            text = '%g' % plot.xData[ind]
+        else:
+            text = '%g, %g' % (plot.xData[ind], plot.yData[ind])
+        if (self.tooltip == None):
+            self.tooltipLabel = self.backend.Label(text, pointX, pointY, size=10, bold=True)
+            self.tooltipMarker = self.backend.Circle(pointX, pointY, 4, fill=None, border='black')
+            self.tooltip = self.backend.Group(self.tooltipMarker, self.tooltipLabel)
+            self.tooltip.visible = False
+        if (self.tooltip.visible == False):
+            self.tooltip.visible = True
+            self.tooltip.toFront()
+        self.tooltipLabel.value = text
+        self.tooltipLabel.centerX = pointX
+        self.tooltipLabel.bottom = pointY - 6
+        self.tooltipMarker.centerX = pointX
+        self.tooltipMarker.centerY = pointY
+
+    def updateLabels(self, title, xLabel, yLabel):
+        # Updates the labels for the plot on the next commit().
+        self.labelSpec = (title, xLabel, yLabel)
+        self.labelsDirty = True
+
+    def layoutLabels(self, title, xLabel, yLabel):
+        # The existing labels are reused, so only their text and position change.
+        l, b, w, h = self.left, self.bottom, self.width, self.height
+        self.title.value = title
+        self.title.centerX, self.title.centerY = l + (w / 2), b - h - 20
+        self.xLabel.value = xLabel
+        self.xLabel.centerX, self.xLabel.centerY = l + w / 2, b + 30
+        self.yLabel.value = yLabel
+        self.yLabel.centerX, self.yLabel.centerY = l - 40, b - h / 2
+
+class Plot(object):
+    '''
+    Creates methods for the plot.
+    '''
+    def __init__(self, manager, plotType, xData, yData):
+        self.manager = manager
+        self.plotType = plotType
+
+        self.xData = xData
+        self.yData = yData
+        self.xIndex = RangeIndex(xData)
+        self.yIndex = RangeIndex(yData)
+
+        self.getDataRanges()
+        self.drawing = manager.backend.Group()
+        self.layoutKey = None
+        self.lodIndices = None
+        self.xSorted = None
+        # How many of the drawing's shapes are shown. The shapes after them are hidden and kept for when the plot grows.
+        self.numShapes = 0
+        # The width the bars of a bar plot were last drawn with.
+        self.barWidth = None
+        # Whether the last layout left out datapoints outside the x range.
+        self.clipped = False
+        # The shown positions for hit testing, made again after the shapes change.
+        self.hitIndex = None
+
+    def getDataRanges(self):
+        # Used in Graph.updateRanges(). The range indexes already know the extremes, so nothing is rescanned.
+        self.xRange = [ self.xIndex.min, self.xIndex.max ]
+        self.yRange = [ self.yIndex.min, self.yIndex.max ]
+
+        if (len(self.xData) == 0):
+            self.xRange = [ 0, 1 ]
+        if (len(self.yData) == 0):
+            self.yRange = [ 0, 1 ]
+
+    def getDatapointColor(self, index):
+        if (isinstance(self.color, list) == True):
+            if (index < len(self.color)):
+                color = self.color[index]
+            else:
+                color = 'black'
+        else:
+            color = self.color
+        return color
+
+    def updateColor(self, newColor):
+        self.color = newColor
+        shapes = self.drawing.children
+        for ind in range(self.numShapes):
+            shapes[ind].fill = self.getDatapointColor(self.getDataIndex(ind))
+
+    def updateData(self, newXData=None, newYData=None, resizeRanges=False):
+        if (self.plotType == 'vert bar' and newXData == None and newYData != None and resizeRanges == False
+                and newYData is not self.yData and len(newYData) == len(self.yData) == self.numShapes
+                and self.layoutKey == self.manager.getLayoutKey()):
+            # The same bars with new heights, like a frame of an animation. Only the tops of the bars move.
+            # appendPoints passes the plot's own yData after adding to it, so that always takes the full path.
+            self.yData = newYData
+            self.yIndex = RangeIndex(self.yData)
+            self.getDataRanges()
+            self.updateBarHeights()
+            return
+        if (newXData != None):
+            self.xData = newXData
+        elif (self.plotType == 'vert bar'):
+            newXData = [ ]
+            numBars = len(newYData)
+            for i in range(numBars):
+                newXData.append(self.manager.left + (i + 0.5) * (self.manager.width / numBars))
+            self.xData = newXData
+        if (newYData != None):
+            self.yData = newYData
+        elif (self.plotType == 'horiz bar'):
+            newYData = [ ]
+            numBars = len(newXData)
+            top = self.manager.bottom - self.manager.height
+            for i in range(numBars):
+                newYData.append(top + (i + 0.5) * (self.manager.height / numBars))
+            self.yData = newYData
+        if (newXData != None):
+            self.xIndex = RangeIndex(self.xData)
+        if (newYData != None):
+            self.yIndex = RangeIndex(self.yData)
+        if (len(self.xData) != len(self.yData)):
+            print('Data lists were not the same length. Cannot plot!')
+            return
+        if (len(self.xData) == 0):
+            # Nothing is left to draw, so the plot's shapes are hidden until it gets data again.
+            self.showShapes(self.drawing.children, 0)
+            self.hitIndex = None
+            return
+
+        self.xSorted = None
+        self.getDataRanges()
+        if (resizeRanges == True):
+            self.manager.updateRanges(xMin=self.xRange[0], xMax=self.xRange[1],
+                                    yMin=self.yRange[0], yMax=self.yRange[1])
+        # The shapes are laid out on the manager's next commit().
+        self.layoutKey = None
+        self.manager.layoutDirty = True
+
+    def updateBarHeights(self):
+        # Sets only the top of each bar, one property write per bar.
+        self.hitIndex = None
+        xPositions, yPositions = self.manager.getPositionsFromData(None, self.yData)
+        for shape, yPos in zip(self.drawing.children, yPositions):
+            shape.y2 = yPos
+
+    def replacePoint(self, ind, xVal, yVal, resizeRanges=False):
+        # Changes one datapoint in place. Only the shapes that use the point are moved.
+        if (xVal != self.xData[ind]):
+            self.xSorted = None
+        self.xIndex.replace(ind, xVal)
+        self.yIndex.replace(ind, yVal)
+        self.updatePoints(ind, resizeRanges)
+
+    def removePoint(self, fromStart=False, resizeRanges=False, count=1):
+        # Removes the first or last count datapoints, like a live feed dropping its oldest or newest periods.
+        # Dropping several from the start at once moves the data lists and the shapes only once.
+        count = min(count, len(self.xData))
+        if (count == 0):
+            return
+        if (fromStart == True):
+            self.xIndex.removeFirst(count)
+            self.yIndex.removeFirst(count)
+        else:
+            for i in range(count):
+                self.xIndex.pop()
+                self.yIndex.pop()
+        self.xSorted = None
+        if (fromStart == True and self.numShapes > 0):
+            released = min(count, self.numShapes)
+            self.manager.pool.releaseFirst(self.drawing, released)
+            self.numShapes -= released
+        elif (fromStart == False and self.numShapes > len(self.xData)):
+            self.showShapes(self.drawing.children, len(self.xData))
+        self.updatePoints(0 if fromStart == True else len(self.xData), resizeRanges)
+
+    def updatePoints(self, ind, resizeRanges):
+        # Used after one datapoint changes. The whole plot is only laid out again if the ranges change.
+        self.getDataRanges()
+        if (resizeRanges == True):
+            self.manager.updateRanges(xMin=self.xRange[0], xMax=self.xRange[1],
+                                    yMin=self.yRange[0], yMax=self.yRange[1])
+        if (self.layoutKey != self.manager.getLayoutKey() or self.lodIndices != None or self.isOutsideXRange() == True):
+            self.layoutKey = None
+            self.manager.layoutDirty = True
+            return
+        last = ind + 2 if self.plotType == 'line' else ind + 1
+        last = min(last, self.numShapes)
+        if (ind < last):
+            self.updateDrawing(ind, last)
+
+    def appendPoints(self, xValues=None, yValues=None, resizeRanges=False):
+        # Adds datapoints to the end of the plot, like a newly published period. Without values, the points
+        # that were already appended to the plot's own data lists are picked up, so a plot drawn from a
+        # Series' arrays only needs this call after birthdata.appendRows(). Only the new shapes are drawn,
+        # unless the ranges change. Bars are spread over the plot's width, so every bar moves when one is added.
+        if (self.plotType == 'vert bar'):
+            self.yIndex.extend(yValues)
+            self.updateData(newYData=self.yData, resizeRanges=resizeRanges)
+            return
+        if (self.plotType == 'horiz bar'):
+            self.xIndex.extend(xValues)
+            self.updateData(newXData=self.xData, resizeRanges=resizeRanges)
+            return
+        first = self.xIndex.count
+        self.xIndex.extend(xValues)
+        self.yIndex.extend(yValues)
+        xData = self.xData
+        if (len(xData) != len(self.yData)):
+            print('Data lists were not the same length. Cannot plot!')
+            return
+        if (first == len(xData)):
+            return
+        if (self.xSorted == True):
+            start = max(first - 1, 0)
+            self.xSorted = all(xData[i] <= xData[i + 1] for i in range(start, len(xData) - 1))
+
+        self.getDataRanges()
+        if (resizeRanges == True and self.manager.getLayoutKey() != (self.xRange[0], self.xRange[1], self.yRange[0], self.yRange[1])):
+            self.manager.updateRanges(xMin=self.xRange[0], xMax=self.xRange[1],
+                                    yMin=self.yRange[0], yMax=self.yRange[1])
+        if (self.layoutKey != self.manager.getLayoutKey() or self.clipped == True or self.isOutsideXRange() == True):
+            # Points past either edge, or a zoomed in plot, only need the visible points laid out again.
+            self.layoutKey = None
+            self.manager.layoutDirty = True
+            return
+        if (self.lodIndices == None):
+            if (self.plotType != 'scatter' and len(xData) > 4 * self.manager.width and self.isXSorted() == True):
+                # The line just got too long to draw every point, so it is laid out again with level of detail.
+                self.layoutKey = None
+                self.manager.layoutDirty = True
+                return
+            self.updateShownPoints(first)
+        elif (self.isXSorted() == False):
+            self.layoutKey = None
+            self.manager.layoutDirty = True
+        else:
+            self.updateShownPoints(self.appendLevelOfDetail())
+
+    def appendLevelOfDetail(self):
+        # The x data is sorted, so new points can only land in the last pixel column or after it. The
+        # points kept for the last column are worked out again along with the new points.
+        # Returns the first shown point that changed.
+        lodIndices = self.lodIndices
+        kept = lodIndices[-4:]
+        xPositions, yPositions = self.manager.getPositionsFromData([ self.xData[i] for i in kept ], None)
+        ind = len(lodIndices) - 1
+        for xPos in xPositions[-2::-1]:
+            if (xPos // 1 != xPositions[-1] // 1):
+                break
+            ind -= 1
+        start = lodIndices[ind]
+        xPositions, yPositions = self.getPositions(start)
+        self.lodIndices = lodIndices[:ind] + [ start + i for i in self.getColumnExtremes(xPositions, yPositions) ]
+        return ind
+
+    def updateShownPoints(self, first):
+        # Draws the shown points from first to the end, after points were added to the end of a line or scatter plot.
+        self.hitIndex = None
+        shapes = self.drawing.children
+        # A line segment also needs the point before it.
+        start = max(first - 1, 0)
+        xPositions, yPositions = self.getShownPositions(start)
+        numShown = start + len(xPositions)
+        self.showShapes(shapes, numShown)
+        for ind in range(first, numShown):
+            if (ind < len(shapes)):
+                self.updateDatapointShape(shapes[ind], ind - start, xPositions, yPositions)
+            else:
+                color = self.getDatapointColor(self.getDataIndex(ind))
+                self.drawDatapoint(ind - start, xPositions, yPositions, color)
+
+    def getShownPositions(self, first):
+        # Positions of the shown points from first to the end. With level of detail, only the kept points are shown.
+        if (self.lodIndices == None):
+            return self.getPositions(first)
+        kept = self.lodIndices[first:]
+        return self.manager.getPositionsFromData([ self.xData[i] for i in kept ], [ self.yData[i] for i in kept ])
+
+    def getPositions(self, first=0, last=None):
+        # Converts the data from first to last to positions with one call to the manager.
+        if (first == 0 and last == None):
+            xData, yData = self.xData, self.yData
+        else:
+            xData, yData = self.xData[first:last], self.yData[first:last]
+        if (self.plotType == 'vert bar'):
+            xPositions, yPositions = self.manager.getPositionsFromData(None, yData)
+            return xData, yPositions
+        elif (self.plotType == 'horiz bar'):
+            xPositions, yPositions = self.manager.getPositionsFromData(xData, None)
+            return xPositions, yData
+        return self.manager.getPositionsFromData(xData, yData)
+
+    def updateDatapointShape(self, shape, ind, xPositions, yPositions):
+        if (self.plotType == 'scatter'):
+            shape.centerX, shape.centerY = xPositions[ind], yPositions[ind]
+        elif (self.plotType =='line'):
+            prev = max(ind - 1, 0)
+            shape.x1, shape.y1 = xPositions[prev], yPositions[prev]
+            shape.x2, shape.y2 = xPositions[ind], yPositions[ind]
+        elif (self.plotType == 'horiz bar'):
+            shape.x2 = xPositions[ind]
+            shape.centerY = yPositions[ind]
+        elif (self.plotType == 'vert bar'):
+            shape.y2 = yPositions[ind]
+            shape.centerX = xPositions[ind]
+
+    def updateDrawing(self, first=None, last=None):
+        # Moves the shapes from first to last to match the data. Without a first shape,
+        # every shape is laid out again and shapes are added or removed to match the data.
+        self.hitIndex = None
+        if (first != None):
+            # A line segment also needs the point before it.
+            start = max(first - 1, 0)
+            xPositions, yPositions = self.getPositions(start, last)
+            shapes = self.drawing.children
+            for ind in range(first, last):
+                self.updateDatapointShape(shapes[ind], ind - start, xPositions, yPositions)
+            return
+
+        self.layoutKey = self.manager.getLayoutKey()
+        first, last = self.getVisibleRange()
+        self.clipped = first > 0 or last < len(self.xData) or self.isOutsideXRange()
+        self.lodIndices = None
+        xPositions, yPositions = [ ], [ ]
+        if (self.clipped == True and self.isXSorted() == False):
+            # Data that goes back and forth can't be searched. A scatter plot lays out the points inside the
+            # x range, and a line lays out every segment and cuts them at the edges below.
+            if (self.plotType == 'scatter'):
+                xMin, xMax = self.manager.xRange
+                self.lodIndices = [ i for i, xVal in enumerate(self.xData) if xMin <= xVal <= xMax ]
+                xPositions, yPositions = self.manager.getPositionsFromData([ self.xData[i] for i in self.lodIndices ],
+                                                                        [ self.yData[i] for i in self.lodIndices ])
+            else:
+                self.lodIndices = list(range(len(self.xData)))
+                xPositions, yPositions = self.getPositions()
+        elif (self.clipped == True):
+            # Only the datapoints inside the x range are laid out, and shapes that are no longer needed go back to the pool.
+            if (first < last):
+                xPositions, yPositions = self.getPositions(first, last)
+            self.clipEnds(xPositions, yPositions)
+            self.lodIndices = list(range(first, last))
+        elif (len(self.xData) > 0):
+            xPositions, yPositions = self.getPositions()
+        if (self.plotType == 'line'):
+            lodIndices = self.getLevelOfDetail(xPositions, yPositions)
+            if (lodIndices != None):
+                xPositions = [ xPositions[i] for i in lodIndices ]
+                yPositions = [ yPositions[i] for i in lodIndices ]
+                self.lodIndices = [ first + i for i in lodIndices ]
+
+        shapes = self.drawing.children
+        self.showShapes(shapes, len(xPositions))
+        numShapes = min(len(shapes), len(xPositions))
+        if (self.plotType == 'vert bar' or self.plotType == 'horiz bar'):
+            self.updateBarWidths(shapes, numShapes)
+        for ind in range(numShapes):
+            self.updateDatapointShape(shapes[ind], ind, xPositions, yPositions)
+        for ind in range(numShapes, len(xPositions)):
+            color = self.getDatapointColor(self.getDataIndex(ind))
+            self.drawDatapoint(ind, xPositions, yPositions, color)
+        if (self.clipped == True and self.plotType == 'line' and self.isXSorted() == False):
+            self.clipSegments(self.drawing.children[:self.numShapes])
+
+    def getBarWidth(self):
+        # Bars get thinner as there are more of them.
+        if (self.plotType == 'vert bar'):
+            return self.manager.width / (len(self.yData) + 1)
+        return self.manager.height / (len(self.xData) * 1.5)
+
+    def updateBarWidths(self, shapes, numShapes):
+        # The bars that are kept get the new width when the number of bars changed, like after appendPoints().
+        width = self.getBarWidth()
+        if (width == self.barWidth):
+            return
+        for ind in range(numShapes):
+            shapes[ind].lineWidth = width
+        self.barWidth = width
+
+    def showShapes(self, shapes, count):
+        # Makes the first count shapes the shown ones. The shapes after them are hidden, not taken out of the
+        # group, because cmu_graphics takes time in proportion to the size of the group to take each one out.
+        # Hidden shapes are shown again, in the color of their new datapoint, when the plot needs them.
+        for ind in range(count, self.numShapes):
+            shapes[ind].visible = False
+        for ind in range(self.numShapes, min(count, len(shapes))):
+            shapes[ind].fill = self.getDatapointColor(self.getDataIndex(ind))
+            shapes[ind].visible = True
+        self.numShapes = count
+
+    def getVisibleRange(self):
+        # Finds the datapoints inside the x range with binary search, so zooming in only lays out what can be seen.
+        # Lines also keep the point just outside each edge, so they run up to the edges. Data that isn't sorted
+        # by x can't be searched, and bars don't use the x range, so they show every datapoint.
+        numPoints = len(self.xData)
+        if (numPoints == 0 or self.plotType == 'vert bar' or self.plotType == 'horiz bar' or self.isXSorted() == False):
+            return 0, numPoints
+        xMin, xMax = self.manager.xRange
+        first, last = bisect_left(self.xData, xMin), bisect_right(self.xData, xMax)
+        if (first == last and (first == 0 or last == numPoints)):
+            # No point is inside the x range and the line doesn't cross it, so nothing is shown.
+            return first, last
+        if (self.plotType != 'scatter'):
+            first, last = max(first - 1, 0), min(last + 1, numPoints)
+        return first, last
+
+    def isOutsideXRange(self):
+        # True when some of a line or scatter plot's data is left or right of the manager's x range.
+        if (self.plotType == 'vert bar' or self.plotType == 'horiz bar' or len(self.xData) == 0):
+            return False
+        return self.xRange[0] < self.manager.xRange[0] or self.xRange[1] > self.manager.xRange[1]
+
+    def clipEnds(self, xPositions, yPositions):
+        # Moves the first and last point of a line back along the line onto the edges of the plot.
+        if (self.plotType == 'scatter' or len(xPositions) < 2):
+            return
+        left, right = self.manager.left, self.manager.left + self.manager.width
+        x0, y0, x1, y1 = xPositions[0], yPositions[0], xPositions[1], yPositions[1]
+        x2, y2, x3, y3 = xPositions[-2], yPositions[-2], xPositions[-1], yPositions[-1]
+        if (x0 < left and x1 != x0):
+            xPositions[0], yPositions[0] = left, y0 + (y1 - y0) * (left - x0) / (x1 - x0)
+        if (x3 > right and x3 != x2):
+            xPositions[-1], yPositions[-1] = right, y3 + (y2 - y3) * (x3 - right) / (x3 - x2)
+
+    def clipSegments(self, shapes):
+        # Cuts each segment of a line that goes back and forth at the edges of the plot. A segment that is
+        # all outside shrinks to a point on the nearest edge, which isn't drawn.
+        left, right = self.manager.left, self.manager.left + self.manager.width
+        for shape in shapes:
+            x1, y1, x2, y2 = shape.x1, shape.y1, shape.x2, shape.y2
+            if (left <= x1 <= right and left <= x2 <= right):
+                continue
+            if (max(x1, x2) < left or min(x1, x2) > right):
+                edge = left if max(x1, x2) < left else right
+                shape.x1, shape.y1, shape.x2, shape.y2 = edge, y2, edge, y2
+                continue
+            if (x1 < left or x1 > right):
+                edge = left if x1 < left else right
+                x1, y1 = edge, y1 + (y2 - y1) * (edge - x1) / (x2 - x1)
+            if (x2 < left or x2 > right):
+                edge = left if x2 < left else right
+                x2, y2 = edge, y2 + (y1 - y2) * (edge - x2) / (x1 - x2)
+            shape.x1, shape.y1, shape.x2, shape.y2 = x1, y1, x2, y2
+
+    def getHitIndex(self):
+        # The shown positions, in pixels, for finding the datapoint under the mouse. Sorted lines and bars
+        # are searched with bisect. Scatter plots, and lines or bars that go back and forth, also get a grid
+        # of HIT_CELL pixel cells. It is only made again when the shapes or the ranges change.
+        key = self.manager.getLayoutKey()
+        if (self.hitIndex == None or self.hitIndex[0] != key):
+            xPositions, yPositions = [ ], [ ]
+            if (len(self.xData) > 0):
+                xPositions, yPositions = self.getShownPositions(0)
+            grid = None
+            if (self.plotType == 'scatter' or (self.plotType != 'horiz bar' and self.isXSorted() == False)):
+                # The cells are made small enough that each holds a few points, even when the plot is crowded.
+                cellSize = min(HIT_CELL, math.sqrt(4 * self.manager.width * self.manager.height / max(len(xPositions), 1)))
+                grid = { 'cellSize': cellSize, 'bounds': (min(xPositions, default=0), max(xPositions, default=0),
+                                                          min(yPositions, default=0), max(yPositions, default=0)) }
+                for ind in range(len(xPositions)):
+                    cell = (xPositions[ind] // cellSize, yPositions[ind] // cellSize)
+                    if (cell in grid):
+                        grid[cell].append(ind)
+                    else:
+                        grid[cell] = [ ind ]
+            self.hitIndex = (key, xPositions, yPositions, grid)
+        return self.hitIndex
+
+    def getNearestPoint(self, xPos, yPos, maxDistance=10):
+        # Finds the shown datapoint nearest to (xPos, yPos) within maxDistance pixels. A bar is hit anywhere
+        # along it. Returns (distance, data index, x position, y position), or None.
+        key, xPositions, yPositions, grid = self.getHitIndex()
+        if (len(xPositions) == 0):
+            return None
+        if (grid != None):
+            return self.getNearestInGrid(xPos, yPos, maxDistance, xPositions, yPositions, grid)
+        # Bars are lines as thick as the space they have, so they are hit up to half their thickness from the middle.
+        halfWidth = 0
+        if (self.plotType == 'horiz bar'):
+            # These bars go down the plot, so they are searched by y.
+            halfWidth = self.manager.height / (len(self.xData) * 3)
+            first = bisect_left(yPositions, yPos - halfWidth - maxDistance)
+            last = bisect_right(yPositions, yPos + halfWidth + maxDistance)
+        else:
+            if (self.plotType == 'vert bar'):
+                halfWidth = self.manager.width / (len(self.yData) + 1) / 2
+            first = bisect_left(xPositions, xPos - halfWidth - maxDistance)
+            last = bisect_right(xPositions, xPos + halfWidth + maxDistance)
+        best = None
+        left, bottom = self.manager.left, self.manager.bottom
+        for ind in range(first, last):
+            pointX, pointY = xPositions[ind], yPositions[ind]
+            if (self.plotType == 'vert bar'):
+                # The distance to the bar, which goes from the x axis up to the point.
+                dx = max(abs(xPos - pointX) - halfWidth, 0)
+                dy = max(yPos - max(pointY, bottom), min(pointY, bottom) - yPos, 0)
+                distance = math.hypot(dx, dy)
+            elif (self.plotType == 'horiz bar'):
+                dx = max(xPos - max(pointX, left), min(pointX, left) - xPos, 0)
+                dy = max(abs(yPos - pointY) - halfWidth, 0)
+                distance = math.hypot(dx, dy)
+            else:
+                distance = math.hypot(xPos - pointX, yPos - pointY)
+            if (distance <= maxDistance and (best == None or distance < best[0])):
+                best = (distance, ind)
+        if (best == None):
+            return None
+        return best[0], self.getDataIndex(best[1]), xPositions[best[1]], yPositions[best[1]]
+
+    def getNearestInGrid(self, xPos, yPos, maxDistance, xPositions, yPositions, grid):
+        # Looks through the cells around the mouse in rings, and stops once no cell further out can be closer.
+        left, right, top, bottom = grid['bounds']
+        if (xPos < left - maxDistance or xPos > right + maxDistance or yPos < top - maxDistance or yPos > bottom + maxDistance):
+            return None
+        cellSize = grid['cellSize']
+        cellX, cellY = xPos // cellSize, yPos // cellSize
+        best = None
+        for ring in range(int(maxDistance // cellSize) + 2):
+            if (ring == 0):
+                cells = [ (cellX, cellY) ]
+            else:
+                cells = [ ]
+                for i in range(-ring, ring + 1):
+                    cells.append((cellX + i, cellY - ring))
+                    cells.append((cellX + i, cellY + ring))
+                for j in range(-ring + 1, ring):
+                    cells.append((cellX - ring, cellY + j))
+                    cells.append((cellX + ring, cellY + j))
+            for cell in cells:
+                for ind in grid.get(cell, ()):
+                    distance = math.hypot(xPos - xPositions[ind], yPos - yPositions[ind])
+                    if (distance <= maxDistance and (best == None or distance < best[0])):
+                        best = (distance, ind)
+            if (best != None and best[0] <= ring * cellSize):
+                break
+        if (best == None):
+            return None
+        return best[0], self.getDataIndex(best[1]), xPositions[best[1]], yPositions[best[1]]
+
+    def getDataIndex(self, ind):
+        # Finds which datapoint a shape was drawn for.
+        if (self.lodIndices == None):
+            return ind
+        return self.lodIndices[ind]
+
+    def getLevelOfDetail(self, xPositions, yPositions):
+        # Lines with more points than the plot has pixels keep only the first, last, lowest and
+        # highest point of each pixel column. This looks the same on screen but the number of
+        # shapes depends on the plot's width instead of the amount of data.
+        if (len(xPositions) <= 4 * self.manager.width or self.isXSorted() == False):
+            return None
+        return self.getColumnExtremes(xPositions, yPositions)
+
+    def getColumnExtremes(self, xPositions, yPositions):
+        # Finds the first, last, lowest and highest point of each pixel column of sorted positions.
+        np = getNumpy(len(xPositions))
+        if (np != None):
+            columns = np.floor(np.asarray(xPositions)).astype(np.int64)
+            order = np.lexsort((np.asarray(yPositions), columns))
+            starts = np.flatnonzero(np.r_[True, columns[1:] != columns[:-1]])
+            ends = np.r_[starts[1:], len(columns)] - 1
+            return np.unique(np.concatenate((starts, ends, order[starts], order[ends]))).tolist()
+
+        indices = [ ]
+        column = None
+        for ind in range(len(xPositions)):
+            yPos = yPositions[ind]
+            if (xPositions[ind] // 1 != column):
+                if (column != None):
+                    indices.extend(sorted({ first, low, high, ind - 1 }))
+                column = xPositions[ind] // 1
+                first, low, high = ind, ind, ind
+            elif (yPos < yPositions[low]):
+                low = ind
+            elif (yPos >= yPositions[high]):
+                # The last of equal highest points, like numpy's stable sort keeps.
+                high = ind
+        indices.extend(sorted({ first, low, high, len(xPositions) - 1 }))
+        return indices
+
+    def isXSorted(self):
+        # Level of detail only works when the x data goes from left to right.
+        if (self.xSorted == None):
+            xData = self.xData
+            self.xSorted = all(xData[i] <= xData[i + 1] for i in range(len(xData) - 1))
+        return self.xSorted
+
+    def drawDatapoint(self, ind, xPositions, yPositions, color):
+        graphX, graphY = xPositions[ind], yPositions[ind]
+        pool = self.manager.pool
+        if (self.plotType == 'scatter'):
+            shape = pool.getCircle(graphX, graphY, 5, fill=color, opacity=40)
+        elif (self.plotType == 'line'):
+            prev = max(ind - 1, 0)
+            shape = pool.getLine(xPositions[prev], yPositions[prev], graphX, graphY, fill=color)
+        elif (self.plotType == 'horiz bar'):
+            shape = pool.getLine(self.manager.left, graphY, graphX, graphY, fill=color, lineWidth=self.getBarWidth())
+        elif (self.plotType == 'vert bar'):
+            shape = pool.getLine(graphX, self.manager.bottom, graphX, graphY, fill=color, lineWidth=self.getBarWidth())
+        else:
+            print('Invalid plot type!')
+            return
+
+        self.drawing.add(shape)
+
+    def draw(self, color):
+        # The shapes are made on the manager's next commit(), once the ranges are settled.
+        self.color = color
+        self.layoutKey = None
+        self.manager.layoutDirty = True
+
+# The largest size in pixels of the grid cells used to find the datapoint under the mouse on scatter plots.
+HIT_CELL = 4
+
+class ShapePool(object):
+    '''
+    Keeps shapes that are no longer drawn so they can be reused instead of made again.
+    '''
+    def __init__(self, backend):
+        self.backend = backend
+        self.free = { 'Line': [ ], 'Circle': [ ], 'Label': [ ] }
+        self.hits = 0
+        self.misses = 0
+
+    def reuse(self, shapeType):
+        # Returns a free shape of the given type, or None when a new one has to be made.
+        free = self.free[shapeType]
+        if (len(free) == 0):
+            self.misses += 1
+            return None
+        self.hits += 1
+        shape = free.pop()
+        shape.visible = True
+        return shape
+
+    def getLine(self, x1, y1, x2, y2, fill='black', lineWidth=2, opacity=100):
+        shape = self.reuse('Line')
+        if (shape == None):
+            return self.backend.Line(x1, y1, x2, y2, fill=fill, lineWidth=lineWidth, opacity=opacity)
+        shape.x1, shape.y1, shape.x2, shape.y2 = x1, y1, x2, y2
+        shape.fill, shape.lineWidth, shape.opacity = fill, lineWidth, opacity
+        return shape
+
+    def getCircle(self, centerX, centerY, radius, fill='black', opacity=100):
+        shape = self.reuse('Circle')
+        if (shape == None):
+            return self.backend.Circle(centerX, centerY, radius, fill=fill, opacity=opacity)
+        shape.centerX, shape.centerY, shape.radius = centerX, centerY, radius
+        shape.fill, shape.opacity = fill, opacity
+        return shape
+
+    def getLabel(self, value, x, y, size=12, rotateAngle=0, align='center'):
+        shape = self.reuse('Label')
+        if (shape == None):
+            return self.backend.Label(value, x, y, size=size, rotateAngle=rotateAngle, align=align)
+        shape.value, shape.size, shape.rotateAngle = value, size, rotateAngle
+        # align only exists when a Label is made, so a reused one is moved to line up the same way.
+        if (align == 'top'):
+            shape.centerX, shape.top = x, y
+        elif (align == 'bottom'):
+            shape.centerX, shape.bottom = x, y
+        elif (align == 'left'):
+            shape.left, shape.centerY = x, y
+        elif (align == 'right'):
+            shape.right, shape.centerY = x, y
+        else:
+            shape.centerX, shape.centerY = x, y
+        return shape
+
+    def release(self, group, shape):
+        # Takes a shape out of its group and keeps it hidden until it is needed again.
+        group.remove(shape)
+        shape.visible = False
+        self.free[type(shape).__name__].append(shape)
+
+    def releaseFirst(self, group, count):
+        # Takes the first count shapes out of a group. One is removed like release(), but more are taken out
+        # with one clear() and the rest put back, instead of searching the group for each one.
+        shapes = group.children
+        if (count == 1):
+            self.release(group, shapes[0])
+            return
+        group.clear()
+        group.add(*shapes[count:])
+        for shape in shapes[:count]:
+            shape.visible = False
+            self.free[type(shape).__name__].append(shape)
+
+    def releaseAll(self, group):
+        # A group is emptied with one clear(), which is much quicker than taking its shapes out one by one.
+        shapes = group.children
+        group.clear()
+        for shape in shapes:
+            shape.visible = False
+            self.free[type(shape).__name__].append(shape)
+
+class RangeIndex(object):
+    '''
+    Keeps the smallest and largest value of a data list up to date as the list changes.
+    '''
+    def __init__(self, values):
+        self.values = values
+        self.min, self.max = None, None
+        if (len(values) > 0):
+            self.min, self.max = min(values), max(values)
+        # How many of the values the range has seen. Values appended to the list directly are picked up by extend().
+        self.count = len(values)
+        # The segment tree is only built once a value is replaced or removed.
+        self.mins = None
+        self.maxes = None
+        self.capacity = 0
+        self.start = 0
+        self.treeEnd = 0
+
+    def append(self, value):
+        # Appending can only widen the range, so this never needs the tree.
+        self.values.append(value)
+        self.count += 1
+        if (self.min == None or value < self.min):
+            self.min = value
+        if (self.max == None or value > self.max):
+            self.max = value
+
+    def extend(self, values=None):
+        # Adds values to the end of the list. Without values, the values that were appended to the list
+        # since the index last saw it are picked up. Either way only the new values are looked at.
+        if (values != None):
+            self.values.extend(values)
+        if (len(self.values) > self.count):
+            tail = self.values[self.count:]
+            low, high = min(tail), max(tail)
+            if (self.min == None or low < self.min):
+                self.min = low
+            if (self.max == None or high > self.max):
+                self.max = high
+        self.count = len(self.values)
+
+    def replace(self, ind, value):
+        self.updateTree()
+        self.values[ind] = value
+        self.setLeaf(self.start + ind, value, value)
+        self.readRoot()
+
+    def pop(self):
+        self.updateTree()
+        self.setLeaf(self.start + len(self.values) - 1, float('inf'), float('-inf'))
+        self.treeEnd -= 1
+        value = self.values.pop()
+        self.count -= 1
+        self.readRoot()
+        return value
+
+    def popFirst(self):
+        value = self.values[0]
+        self.removeFirst(1)
+        return value
+
+    def removeFirst(self, count):
+        # Removes the first count values. The list is the plot's own data, read by position everywhere, so it
+        # really has to lose them, but one del moves the rest of it once however many values go.
+        self.updateTree()
+        for pos in range(self.start, self.start + count):
+            self.setLeaf(pos, float('inf'), float('-inf'))
+        self.start += count
+        del self.values[:count]
+        self.count -= count
+        self.readRoot()
+
+    def updateTree(self):
+        # Adds the values appended since the tree was last used, or rebuilds it when it is full.
+        end = self.start + len(self.values)
+        if (self.mins == None or end > self.capacity):
+            self.buildTree()
+            return
+        for pos in range(self.treeEnd, end):
+            value = self.values[pos - self.start]
+            self.setLeaf(pos, value, value)
+        self.treeEnd = end
+
+    def buildTree(self):
+        size = len(self.values)
+        capacity = 1
+        while (capacity < 2 * size):
+            capacity *= 2
+        mins = [ float('inf') ] * (2 * capacity)
+        maxes = [ float('-inf') ] * (2 * capacity)
+        mins[capacity:capacity + size] = self.values
+        maxes[capacity:capacity + size] = self.values
+        for i in range(capacity - 1, 0, -1):
+            mins[i] = min(mins[2 * i], mins[2 * i + 1])
+            maxes[i] = max(maxes[2 * i], maxes[2 * i + 1])
+        self.mins, self.maxes = mins, maxes
+        self.capacity = capacity
+        self.start = 0
+        self.treeEnd = size
+
+    def setLeaf(self, pos, low, high):
+        mins, maxes = self.mins, self.maxes
+        i = pos + self.capacity
+        mins[i], maxes[i] = low, high
+        i //= 2
+        while (i > 0):
+            mins[i] = min(mins[2 * i], mins[2 * i + 1])
+            maxes[i] = max(maxes[2 * i], maxes[2 * i + 1])
+            i //= 2
+
+    def readRoot(self):
+        if (len(self.values) == 0):
+            self.min, self.max = None, None
+        else:
+            self.min, self.max = self.mins[1], self.maxes[1]
@@ -0,0 +1,229 @@
+'''
+Times the hot methods of the plotting classes and the data layer, and counts the
+shapes they make. Nothing is measured until the profiler is enabled: enabling
+it swaps the methods for timed copies and disabling it puts the originals back,
+so the graphs run at full speed while it is off.
+Calls can also be recorded frame by frame and saved as a Chrome trace (open it
+in chrome://tracing or https://ui.perfetto.dev).
+'''
+
+import functools
+import json
+import os
+import sys
+import threading
+import time
+
+import birthdata
+import derived
+import grid
+import playback
+import plotting
+import views
+
+# The methods that are timed, by the class or module that has them.
+HOT_METHODS = [
+    (plotting.PlotManager, [ 'commit', 'updateRanges', 'drawTicks', 'showTicks', 'layoutTicks', 'placeTicks', 'createPlot',
+                             'setViewport', 'updateTooltip' ]),
+    (plotting.Plot, [ 'getDataRanges', 'updateData', 'appendPoints', 'updateDrawing',
+                      'drawDatapoint', 'draw', 'getLevelOfDetail', 'getHitIndex', 'updateBarHeights' ]),
+    (views.Scene, [ 'showView', 'appendRows', 'setData', 'setTrend', 'drawLineGraph', 'drawBarGraph', 'drawHistogram' ]),
+    (birthdata, [ 'parseData', 'readData', 'loadCachedData', 'appendRows', 'readDataset' ]),
+    (birthdata.Rollup, [ 'update' ]),
+    (birthdata.Dataset, [ 'query' ]),
+    (derived.DerivedSeries, [ 'get' ]),
+    (playback.Playback, [ 'step' ]),
+    (grid.PlotGrid, [ 'commit', 'updateRanges', 'fitRanges' ]),
+    (grid.Facets, [ 'draw', 'appendRows' ]),
+]
+
+SHAPE_TYPES = [ 'Group', 'Line', 'Circle', 'Label', 'Polygon' ]
+
+# classes
+class Profiler(object):
+    '''
+    Keeps the calls, seconds and new shapes of every timed method, and the trace
+    events while a trace is being recorded.
+    '''
+    def __init__(self, maxEvents=200000):
+        self.enabled = False
+        self.tracing = False
+        # name -> [ calls, seconds, shapes ]. The seconds and shapes include the methods each one calls.
+        self.stats = { }
+        self.shapeCount = 0
+        self.events = [ ]
+        self.maxEvents = maxEvents
+        self.droppedEvents = 0
+        self.startTime = time.perf_counter()
+        self.patched = [ ]
+
+    def enable(self, backends=()):
+        # Swaps in the timed methods. The shape makers of the given backends (or backend classes) are counted too.
+        if (self.enabled == True):
+            return
+        self.enabled = True
+        modules = self.getModules()
+        for owner, names in HOT_METHODS:
+            for name in names:
+                original = getattr(owner, name)
+                timed = self.wrap(self.getName(owner, name), original)
+                self.patch(owner, name, timed)
+                # Modules that imported a function by name have their own reference to it.
+                for module in modules:
+                    for attrName, value in list(vars(module).items()):
+                        if (value is original and module is not owner):
+                            self.patch(module, attrName, timed)
+        for backend in backends:
+            for shapeType in SHAPE_TYPES:
+                self.patch(backend, shapeType, self.countShapes(getattr(backend, shapeType)))
+
+    def disable(self):
+        # Puts every original method back. The numbers are kept until reset() is called.
+        for owner, name, had, original in reversed(self.patched):
+            if (had == True):
+                setattr(owner, name, original)
+            else:
+                delattr(owner, name)
+        self.patched = [ ]
+        self.enabled = False
+
+    def reset(self):
+        # The timed methods hold on to their own lists, so they are cleared in place.
+        for stats in self.stats.values():
+            stats[:] = [ 0, 0.0, 0 ]
+        self.shapeCount = 0
+
+    def patch(self, owner, name, value):
+        # Remembers whether the attribute was the owner's own, so an inherited one is not copied back onto it.
+        had = name in vars(owner)
+        self.patched.append((owner, name, had, vars(owner).get(name)))
+        setattr(owner, name, value)
+
+    def getModules(self):
+        # The modules of this program, found by the folder they are in.
+        folder = os.path.dirname(os.path.abspath(__file__))
+        modules = [ ]
+        for module in list(sys.modules.values()):
+            path = getattr(module, '__file__', None)
+            if (path != None and os.path.dirname(os.path.abspath(path)) == folder):
+                modules.append(module)
+        return modules
+
+    def getName(self, owner, name):
+        if (isinstance(owner, type) == True):
+            return owner.__name__ + '.' + name
+        return owner.__name__.split('.')[-1] + '.' + name
+
+    def wrap(self, name, func):
+        profiler = self
+        stats = self.stats.setdefault(name, [ 0, 0.0, 0 ])
+        @functools.wraps(func)
+        def timed(*args, **kwargs):
+            shapes = profiler.shapeCount
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                end = time.perf_counter()
+                stats[0] += 1
+                stats[1] += end - start
+                stats[2] += profiler.shapeCount - shapes
+                if (profiler.tracing == True):
+                    profiler.addEvent(name, 'X', start, end - start)
+        return timed
+
+    def countShapes(self, makeShape):
+        profiler = self
+        def counted(*args, **kwargs):
+            profiler.shapeCount += 1
+            return makeShape(*args, **kwargs)
+        return counted
+
+    def startTrace(self):
+        self.events = [ ]
+        self.droppedEvents = 0
+        self.tracing = True
+
+    def stopTrace(self):
+        self.tracing = False
+
+    def markFrame(self):
+        # Marks the start of a frame in the trace. It does nothing unless a trace is being recorded.
+        if (self.tracing == True):
+            self.addEvent('frame', 'i', time.perf_counter(), 0)
+
+    def addEvent(self, name, phase, start, seconds):
+        # Big graphs can make millions of calls, so the trace stops growing at maxEvents.
+        if (len(self.events) >= self.maxEvents):
+            self.droppedEvents += 1
+            return
+        self.events.append((name, phase, start, seconds, threading.get_ident()))
+
+    def getTrace(self):
+        # The events in the Chrome trace format, with times in microseconds.
+        pid = os.getpid()
+        traceEvents = [ ]
+        for name, phase, start, seconds, thread in self.events:
+            event = { 'name': name, 'ph': phase, 'ts': (start - self.startTime) * 1e6, 'pid': pid, 'tid': thread }
+            if (phase == 'X'):
+                event['dur'] = seconds * 1e6
+            else:
+                event['s'] = 'g'
+            traceEvents.append(event)
+        return { 'traceEvents': traceEvents, 'displayTimeUnit': 'ms', 'otherData': { 'droppedEvents': self.droppedEvents } }
+
+    def writeTrace(self, path):
+        with open(path, 'w', encoding='utf-8') as file:
+            json.dump(self.getTrace(), file)
+        return path
+
+    def getTopMethods(self, count=None):
+        # (name, calls, seconds, shapes) of the methods that were called, the slowest first.
+        rows = [ (name,) + tuple(stats) for name, stats in self.stats.items() if stats[0] > 0 ]
+        rows.sort(key=lambda row: row[2], reverse=True)
+        return rows if count == None else rows[:count]
+
+    def getReport(self, count=None):
+        lines = [ '%-26s %9s %11s %9s' % ('method', 'calls', 'ms', 'shapes') ]
+        for name, calls, seconds, shapes in self.getTopMethods(count):
+            lines.append('%-26s %9d %11.2f %9d' % (name, calls, seconds * 1000, shapes))
+        return '\n'.join(lines)
+
+class ProfileOverlay(object):
+    '''
+    Shows the slowest methods in the corner of the window. Its labels are made
+    once, before profiling starts, so they are not counted as new shapes.
+    '''
+    def __init__(self, backend, left=5, top=5, rows=6, refreshFrames=15):
+        self.left = left
+        self.refreshFrames = refreshFrames
+        self.frames = 0
+        self.labels = [ backend.Label('', left, top + 10 * i, size=8, fill='gray', align='top') for i in range(rows + 1) ]
+        self.drawing = backend.Group(*self.labels)
+        self.drawing.visible = False
+
+    def show(self):
+        self.drawing.visible = True
+        self.drawing.toFront()
+        self.frames = 0
+
+    def hide(self):
+        self.drawing.visible = False
+
+    def update(self, profiler):
+        # Only changes the labels every refreshFrames frames, so the overlay itself costs little.
+        if (self.drawing.visible == False):
+            return
+        self.frames += 1
+        if (self.frames % self.refreshFrames != 1 and self.refreshFrames > 1):
+            return
+        values = [ '%d new shapes' % profiler.shapeCount ]
+        for name, calls, seconds, shapes in profiler.getTopMethods(len(self.labels) - 1):
+            values.append('%s: %d calls, %.1f ms, %d shapes' % (name, calls, seconds * 1000, shapes))
+        for i in range(len(self.labels)):
+            label = self.labels[i]
+            label.value = values[i] if i < len(values) else ''
+            label.left = self.left
+
+# The profiler used by main.py and benchmark.py.
+profiler = Profiler()
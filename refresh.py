@@ -0,0 +1,144 @@
+'''
+Reloads the data in a background thread when its csv file changes, so a slow disk
+or a big parse never holds up the window. The thread only ever makes new objects:
+each finished load is published as an immutable Snapshot with one assignment,
+and onStep picks up the newest one with takeSnapshot().
+'''
+
+from collections import namedtuple
+import os
+import threading
+
+import birthdata
+
+# A finished load. data is a copy of all of it, which the thread never touches again. added has a Series of
+# the rows each age group got since the snapshot before it, or is None when older rows changed too.
+Snapshot = namedtuple('Snapshot', [ 'version', 'data', 'added' ])
+
+# classes
+class DataRefresher(object):
+    '''
+    Watches a csv path (None for the dataset pasted into birthdata.CSV), or a folder
+    or glob of csv files, and loads it again in a background thread when it changes.
+    '''
+    def __init__(self, source, data, interval=1.0):
+        # data is what the graphs show now. It is copied, so the thread never reads what the graphs change.
+        self.source = source
+        # A single file stays a single file, so a deleted csv is never looked for as a folder or glob.
+        self.isFile = source == None or os.path.isfile(source) == True
+        self.interval = interval
+        self.previous = copyData(data)
+        self.stamps = self.getStamps()
+        self.changedStamps = self.stamps
+        # Only the thread writes snapshot, and only the main thread writes seenVersion.
+        self.snapshot = None
+        self.seenVersion = 0
+        self.version = 0
+        self.error = None
+        self.stopped = threading.Event()
+        self.thread = None
+
+    def start(self):
+        self.stopped.clear()
+        self.thread = threading.Thread(target=self.run, name='DataRefresher', daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        # The thread is waiting between checks most of the time, so it ends straight away.
+        self.stopped.set()
+        if (self.thread != None):
+            self.thread.join()
+            self.thread = None
+
+    def run(self):
+        while (self.stopped.wait(self.interval) == False):
+            self.checkSource()
+
+    def checkSource(self):
+        # Loads the source again when the size or mtime of any of its files changed, once they have stayed
+        # the same for one more check, so a file that is still being written isn't read half way through.
+        # A file that fails to parse anyway, goes away or has no rows is tried again when it changes next,
+        # and the graphs keep the data they have.
+        stamps = self.getStamps()
+        if (stamps == self.stamps or stamps != self.changedStamps):
+            self.changedStamps = stamps
+            return
+        self.stamps = stamps
+        try:
+            data = self.load()
+            if (len(data) == 0):
+                raise ValueError('no rows')
+        except (OSError, ValueError, IndexError) as error:
+            self.error = error
+            print('Kept the current data, could not load %s: %s' % ('CSV' if self.source == None else self.source, error))
+            return
+        self.error = None
+        added = getAddedSeries(self.previous, data)
+        if (added != None and len(added) == 0):
+            return
+        self.previous = data
+        self.version += 1
+        # Assigning the whole tuple at once is the swap: the main thread sees the old snapshot or the new one.
+        self.snapshot = Snapshot(self.version, copyData(data), added)
+
+    def getPaths(self):
+        if (self.isFile == True):
+            return [ self.source ]
+        from bulkload import getPaths
+        return getPaths(self.source)
+
+    def getStamps(self):
+        stamps = [ ]
+        for path in self.getPaths():
+            try:
+                stamps.append((path,) + birthdata.getSourceStamp(path))
+            except OSError:
+                stamps.append((path, None, None))
+        return stamps
+
+    def load(self):
+        # A single file goes through the binary cache. A folder or glob is merged like bulkload does, in this thread.
+        if (self.isFile == True):
+            return birthdata.parseData(self.source)
+        from bulkload import loadFiles
+        return loadFiles(self.source, processes=1)
+
+    def takeSnapshot(self):
+        # Returns the newest snapshot the main thread has not seen yet, or None. It never waits for the thread.
+        # When a snapshot was missed its added rows aren't enough to catch up, so they are left out and data is used instead.
+        snapshot = self.snapshot
+        if (snapshot == None or snapshot.version <= self.seenVersion):
+            return None
+        if (snapshot.version > self.seenVersion + 1 and snapshot.added != None):
+            snapshot = snapshot._replace(added=None)
+        self.seenVersion = snapshot.version
+        return snapshot
+
+def copyData(data):
+    # Copies every series. The typed arrays are copied in C, so this is quick even for big data.
+    copy = {}
+    for age in data:
+        series = copy[age] = birthdata.Series()
+        series.xData.extend(data[age].xData)
+        series.yData.extend(data[age].yData)
+    return copy
+
+def getAddedSeries(old, new):
+    # A Series of the rows new has after the end of each of old's series, for Scene.appendSeries.
+    # Age groups that got no rows are left out. Returns None when any of old's rows changed or went
+    # away, so the new data has to replace it.
+    if (any(age not in new for age in old) == True):
+        return None
+    added = {}
+    for age in new:
+        series = new[age]
+        count = len(old[age]) if age in old else 0
+        if (count > len(series)):
+            return None
+        if (count > 0 and (series.xData[:count] != old[age].xData or series.yData[:count] != old[age].yData)):
+            return None
+        if (count < len(series)):
+            tail = added[age] = birthdata.Series()
+            tail.xData = series.xData[count:]
+            tail.yData = series.yData[count:]
+    return added
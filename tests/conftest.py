@@ -0,0 +1,38 @@
+'''
+Puts the program's folder on the import path, and stands in for pytest-benchmark
+when it isn't installed, so the checks still run (once each, untimed).
+Scales of 10000x only run with --run-slow.
+'''
+
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+try:
+    import pytest_benchmark
+except ImportError:
+    pytest_benchmark = None
+
+def pytest_addoption(parser):
+    parser.addoption('--run-slow', action='store_true', help='also run the 10000x scale')
+
+def pytest_configure(config):
+    config.addinivalue_line('markers', 'slow: a 10000x scale, only run with --run-slow')
+
+def pytest_collection_modifyitems(config, items):
+    if (config.getoption('--run-slow') == True):
+        return
+    skip = pytest.mark.skip(reason='needs --run-slow')
+    for item in items:
+        if ('slow' in item.keywords):
+            item.add_marker(skip)
+
+if (pytest_benchmark == None):
+    @pytest.fixture
+    def benchmark():
+        def run(func, *args, **kwargs):
+            return func(*args, **kwargs)
+        return run
@@ -0,0 +1,14 @@
+from backends import HeadlessBackend
+
+def testChildrenIsACopy():
+    # Like cmu_graphics, changing the list read from children doesn't change the group.
+    backend = HeadlessBackend()
+    group = backend.Group()
+    line = backend.Line(0, 0, 1, 1)
+    group.add(line)
+    children = group.children
+    children.clear()
+    assert group.children == [ line ]
+    assert group.children is not group.children
+    group.remove(line)
+    assert len(group) == 0 and line.parent == None
@@ -0,0 +1,264 @@
+'''
+The rows of benchmark.py as checks. Each one times the same step when
+pytest-benchmark is installed, and checks that the step drew the right thing with
+the shapes and property writes it should, on the headless backend.
+'''
+
+import io
+import math
+
+import pytest
+
+from backends import HeadlessBackend
+from benchmark import COLORS, TRENDS, makeCsv, makeManager, makeRegionCsv, parseDataOld
+from birthdata import CSV, getXAndYData, parseData, readDataset
+from derived import DerivedSeries
+from grid import Facets
+from playback import Playback
+from views import Scene
+
+SCALES = [ 1, 100, pytest.param(10000, marks=pytest.mark.slow) ]
+
+def getShownLines(plot):
+    # (x1, y1, x2, y2) of every shape the plot shows, in order.
+    return [ (shape.x1, shape.y1, shape.x2, shape.y2) for shape in plot.drawing.children[:plot.numShapes] ]
+
+def getFreshLines(plot):
+    # The same data laid out by a new manager with the same ranges, to compare a plot against.
+    manager, backend = makeManager()
+    manager.updateRanges(*plot.manager.getLayoutKey())
+    fresh = manager.plotLines(plot.xData[:], plot.yData[:], color='blue', resizeToNewPlot=False)
+    manager.commit()
+    return getShownLines(fresh)
+
+@pytest.fixture(scope='module', params=SCALES)
+def scale(request):
+    return request.param
+
+@pytest.fixture(scope='module')
+def data(scale):
+    return parseData(io.StringIO(makeCsv(scale)), useCache=False)
+
+def testParseData(benchmark, scale):
+    csv = makeCsv(scale)
+    data = benchmark(parseData, io.StringIO(csv), useCache=False)
+    base = parseData(io.StringIO(CSV), useCache=False)
+    numPeriods = len(base['30-34'])
+    assert sum(len(series) for series in data.values()) == scale * (len(CSV.split('\n')) - 1)
+    for age in base:
+        # Each copy has the embedded rates, one block of periods after another.
+        assert list(data[age].yData) == list(base[age].yData) * scale
+        assert list(data[age].xData[-numPeriods:]) == [ period + (scale - 1) * numPeriods for period in base[age].xData ]
+
+def testQuery(benchmark, scale, data):
+    dataset = readDataset(io.StringIO(makeCsv(scale)))
+    lastPeriod = dataset.periods[-1]
+    result = benchmark(dataset.query, where={ 'Mothers_Age': [ '30-34', '35-39' ] }, periods=(lastPeriod - 10, lastPeriod))
+    assert sorted(result) == [ '30-34', '35-39' ]
+    for age in result:
+        expected = [ (x, y) for x, y in zip(data[age].xData, data[age].yData) if lastPeriod - 10 <= x <= lastPeriod ]
+        assert list(zip(result[age].xData, result[age].yData)) == expected
+
+def testCachedTrends(benchmark, data):
+    engine = DerivedSeries(data)
+    first = { (age, transform): engine.get(age, transform, **params) for age in data for transform, params in TRENDS }
+    def trends():
+        for age in data:
+            for transform, params in TRENDS:
+                assert engine.get(age, transform, **params) is first[(age, transform)]
+    benchmark(trends)
+    assert engine.misses == len(first)
+
+def testCreatePlot(benchmark, data):
+    xData, yData = getXAndYData(data, '30-34')
+    def createPlot():
+        manager, backend = makeManager()
+        plot = manager.plotLines(xData, yData, color='blue')
+        manager.commit()
+        return plot, backend
+    plot, backend = benchmark(createPlot)
+    # Level of detail keeps a long line to a few Lines per pixel column.
+    assert plot.numShapes <= max(len(xData), 4 * plot.manager.width)
+    assert backend.shapeCounts['Line'] >= plot.numShapes
+    assert getShownLines(plot) == getFreshLines(plot)
+
+def testUpdateRanges(benchmark, data):
+    manager, backend = makeManager()
+    plot = manager.plotLines(*getXAndYData(data, '30-34'), color='blue')
+    manager.commit()
+    yMaxes = [ 150, 200 ]
+    def updateRanges():
+        yMaxes.reverse()
+        manager.updateRanges(yMax=yMaxes[0])
+        manager.commit()
+    updateRanges()
+    updateRanges()
+    backend.resetCounts()
+    benchmark(updateRanges)
+    # The ticks for both ranges are cached, and the line's shapes are moved, so nothing new is made.
+    assert sum(backend.shapeCounts.values()) == 0
+    assert getShownLines(plot) == getFreshLines(plot)
+
+def testUpdateData(benchmark, data):
+    manager, backend = makeManager()
+    xData, yData = getXAndYData(data, '30-34')
+    plot = manager.plotLines(xData, yData, color='blue')
+    manager.commit()
+    newYData = [ yVal * 0.9 for yVal in yData ]
+    backend.resetCounts()
+    def updateData():
+        plot.updateData(xData, newYData)
+        manager.commit()
+    benchmark(updateData)
+    assert sum(backend.shapeCounts.values()) == 0
+    assert getShownLines(plot) == getFreshLines(plot)
+
+def testHover(benchmark, data):
+    manager, backend = makeManager()
+    plot = manager.plotLines(*getXAndYData(data, '30-34'), color='blue')
+    manager.commit()
+    mousePositions = [ (100 + (i * 7) % 200, 100 + (i * 13) % 200) for i in range(100) ]
+    hits = benchmark(lambda: [ manager.getHoveredPoint(xPos, yPos) for xPos, yPos in mousePositions ])
+    key, xPositions, yPositions, grid = plot.getHitIndex()
+    for (xPos, yPos), hit in zip(mousePositions, hits):
+        distances = [ math.hypot(xPos - x, yPos - y) for x, y in zip(xPositions, yPositions) ]
+        nearest = min(distances)
+        if (nearest > 10):
+            assert hit == None
+        else:
+            assert hit != None and math.hypot(xPos - hit[2], yPos - hit[3]) == pytest.approx(nearest)
+
+def testAppendPoints(benchmark, data):
+    xData, yData = getXAndYData(data, '30-34')
+    manager, backend = makeManager()
+    plot = manager.plotLines(xData[:], yData[:], color='blue')
+    manager.updateRanges(xMax=xData[-1] + 10)
+    manager.commit()
+    def appendPoints():
+        plot.appendPoints([ plot.xData[-1] + 1 ], [ plot.yData[-1] ])
+        manager.commit()
+    backend.resetCounts()
+    benchmark(appendPoints)
+    # Only the end of the line is drawn, with at most one new shape.
+    assert sum(backend.shapeCounts.values()) <= 1
+    assert getShownLines(plot) == getFreshLines(plot)
+
+def testZoom(benchmark, data):
+    manager, backend = makeManager()
+    xData, yData = getXAndYData(data, '30-34')
+    plot = manager.plotLines(xData, yData, color='blue')
+    manager.commit()
+    xMin, xMax = manager.xRange
+    def zoom():
+        manager.setViewport(xMin + (xMax - xMin) * 0.5, xMin + (xMax - xMin) * 0.55, *manager.yRange)
+        manager.commit()
+    benchmark(zoom)
+    first, last = plot.getVisibleRange()
+    assert plot.clipped == (first > 0 or last < len(xData))
+    assert plot.numShapes <= last - first
+    manager.resetZoom()
+    manager.commit()
+    assert getShownLines(plot) == getFreshLines(plot)
+
+def testDrawTicks(benchmark):
+    manager, backend = makeManager()
+    manager.updateRanges(0, 10, 0, 100)
+    xLabels = [ 0, 1, 2, 3, 4, 5 ]
+    def drawTicks():
+        # A new label list each time, so the tick cache never hits.
+        xLabels[0] -= 1
+        manager.drawTicks(xLabels=list(xLabels), precision=[0,0])
+        manager.commit()
+    benchmark(drawTicks)
+    labels = [ shape.value for shape in manager.tickDrawings.children if type(shape).__name__ == 'Label' ]
+    assert labels[:6] == xLabels
+    assert len(labels) == 6 + 11
+
+def testCycle(benchmark, data):
+    manager, backend = makeManager()
+    scene = Scene(manager, data, COLORS)
+    def cycle():
+        scene.drawLineGraph()
+        manager.commit()
+        scene.drawBarGraph()
+        manager.commit()
+        scene.drawHistogram()
+        manager.commit()
+    cycle()
+    backend.resetCounts()
+    benchmark(cycle)
+    # Every graph was built once, so cycling again only shows them.
+    assert sum(backend.shapeCounts.values()) == 0
+    assert scene.view == 'histogram'
+    assert len(manager.plots) == 1
+
+def testPlaybackFrame(benchmark, data):
+    manager, backend = makeManager()
+    scene = Scene(manager, data, COLORS)
+    scene.drawBarGraph()
+    manager.commit()
+    playback = Playback(scene)
+    playback.step(0)
+    frames = [ 0 ]
+    def playFrame():
+        frames[0] += 1
+        playback.step(frames[0] / playback.fps)
+        manager.commit()
+    playFrame()
+    backend.resetCounts()
+    benchmark(playFrame)
+    # One write for the top of each bar, and a few more when the title changes period.
+    assert sum(backend.shapeCounts.values()) == 0
+    assert backend.propertyWrites <= len(data) + 10
+
+def testBarsFrame(benchmark):
+    manager, backend = makeManager()
+    heights = [ [ (i * 37) % 150 for i in range(500) ], [ (i * 53) % 150 for i in range(500) ] ]
+    bars = manager.plotVerticalBars(heights[0], color='blue')
+    manager.commit()
+    backend.resetCounts()
+    def barFrame():
+        heights.reverse()
+        bars.updateData(newYData=heights[0])
+        manager.commit()
+    benchmark(barFrame)
+    assert sum(backend.shapeCounts.values()) == 0
+    assert backend.propertyWrites % 500 == 0
+    yPositions = manager.getPositionsFromData(None, heights[0])[1]
+    assert [ shape.y2 for shape in bars.drawing.children ] == yPositions
+
+@pytest.mark.parametrize('numPanels', [ 4, 16 ])
+def testGridFrame(benchmark, numPanels):
+    backend = HeadlessBackend()
+    dataset = readDataset(io.StringIO(makeRegionCsv(numPanels)))
+    facets = Facets(dataset, 'Region', COLORS, backend=backend)
+    facets.draw()
+    facets.commit()
+    lastPeriod = dataset.periods[-1]
+    others = [ getShownLines(plot) for value in facets.values[1:] for plot in facets.plots[value].values() ]
+    backend.resetCounts()
+    def frame():
+        facets.appendRows([ (lastPeriod, 50.0, [ 'Region 1', '30-34' ]) ])
+        facets.commit()
+    benchmark(frame)
+    # Only the panel that got the row is drawn again.
+    assert sum(backend.shapeCounts.values()) == 0
+    assert others == [ getShownLines(plot) for value in facets.values[1:] for plot in facets.plots[value].values() ]
+
+def testAppendBar():
+    manager, backend = makeManager()
+    bars = manager.plotVerticalBars([ 10, 20, 30 ], color='blue')
+    manager.commit()
+    bars.appendPoints(yValues=[ 40 ])
+    manager.commit()
+    # Every bar moves over to make room for the new one.
+    assert len(bars.xData) == len(bars.yData) == bars.numShapes == 4
+    assert [ shape.centerX for shape in bars.drawing.children ] == [ 125.0, 175.0, 225.0, 275.0 ]
+    assert [ shape.y2 for shape in bars.drawing.children ] == manager.getPositionsFromData(None, [ 10, 20, 30, 40 ])[1]
+
+def testParseDataOld(data, scale):
+    # The old parser that benchmark.py compares against reads the same rows as the new one.
+    old = parseDataOld(makeCsv(scale))
+    assert sorted(old) == sorted(data)
+    for age in old:
+        assert old[age] == [ [ x, y ] for x, y in zip(data[age].xData, data[age].yData) ]
@@ -0,0 +1,144 @@
+from array import array
+import io
+import os
+import random
+import subprocess
+import sys
+
+import pytest
+
+import birthdata
+from birthdata import Dataset, Rollup, appendRows, clearCache, getCachePath, getXAndYData, loadStats, parseData, readRows
+
+def getRates(data):
+    return { group: dict(zip(series.xData, series.yData)) for group, series in data.items() }
+
+def testReadRows():
+    # The columns can come in any order, and blank lines, repeated headers and Windows line endings are skipped.
+    csv = ('Mothers_Age,Age_specific_birth_rate,Period\r\n'
+           '15\u201319,20.5,2005\r\n'
+           '\r\n'
+           'Mothers_Age,Age_specific_birth_rate,Period\r\n'
+           '15\u201319,21,2006\r\n'
+           '30-34,100,2006\r\n')
+    assert list(readRows(io.StringIO(csv))) == [ (2005, '15-19', 20.5), (2006, '15-19', 21.0), (2006, '30-34', 100.0) ]
+
+def testSeriesArrays():
+    # Each age group's periods and rates are typed arrays, and the plots are given the arrays themselves.
+    data = parseData(useCache=False)
+    for series in data.values():
+        assert isinstance(series.xData, array) and series.xData.typecode == 'i'
+        assert isinstance(series.yData, array) and series.yData.typecode == 'd'
+        assert len(series) == len(series.xData) == len(series.yData)
+    xData, yData = getXAndYData(data, '30-34')
+    assert xData is data['30-34'].xData and yData is data['30-34'].yData
+
+def testQueryUnsortedRows():
+    # Rows appended out of period order are grouped by the codes of their own rows.
+    dataset = Dataset([ 'Region', 'Mothers_Age' ])
+    dataset.append(2005, 1.0, [ 'A', 'x' ])
+    dataset.append(2003, 2.0, [ 'A', 'x' ])
+    dataset.append(2005, 3.0, [ 'B', 'x' ])
+    dataset.append(2003, 4.0, [ 'A', 'y' ])
+    assert getRates(dataset.query(where={ 'Region': 'A' })) == { 'x': { 2003: 2.0, 2005: 1.0 }, 'y': { 2003: 4.0 } }
+
+def testQueryMatchesFilter():
+    # query() gives the same groups as filtering and averaging every row by hand.
+    rand = random.Random(17)
+    dataset = Dataset([ 'Region', 'Mothers_Age' ])
+    rows = [ ]
+    for i in range(300):
+        row = (rand.randrange(2000, 2020), float(rand.randrange(100)), [ rand.choice('ABC'), rand.choice('xyz') ])
+        rows.append(row)
+        dataset.append(*row)
+        if (i % 50 == 0):
+            dataset.query(where={ 'Region': 'A' })
+    for where, periods in [ ({ 'Region': 'A' }, None), ({ 'Region': [ 'B', 'C' ] }, (2005, 2012)), (None, None) ]:
+        expected = { }
+        for period, rate, (region, age) in rows:
+            if (where != None and region not in where['Region']):
+                continue
+            if (periods != None and (period < periods[0] or period > periods[1])):
+                continue
+            expected.setdefault(age, { }).setdefault(period, [ ]).append(rate)
+        expected = { age: { period: sum(rates) / len(rates) for period, rates in expected[age].items() } for age in expected }
+        result = dataset.query(where=where, periods=periods)
+        assert getRates(result) == expected
+        for series in result.values():
+            assert list(series.xData) == sorted(series.xData)
+
+def testBitmapsAfterAppend():
+    # Rows appended after a query, some with new values, are added to the bitmaps on the next query.
+    rand = random.Random(3)
+    dataset = Dataset([ 'Region', 'Mothers_Age' ])
+    for period in range(2000, 2030):
+        for i in range(rand.randrange(1, 6)):
+            dataset.append(period, 1.0, [ rand.choice('ABCDE'[:2 + (period - 2000) // 10]), 'x' ])
+        dataset.getRows(where={ 'Region': 'A' })
+    fresh = Dataset(dataset.dimensions)
+    for row in range(len(dataset)):
+        fresh.append(dataset.periods[row], dataset.rates[row], [ dataset.values[dimension][dataset.codes[dimension][row]]
+                                                                  for dimension in dataset.dimensions ])
+    assert dataset.getBitmaps('Region') == fresh.getBitmaps('Region')
+    assert dataset.getBitmaps('Mothers_Age') == fresh.getBitmaps('Mothers_Age')
+
+def testCachePath(tmp_path):
+    # Files with the same name in different folders get their own cache files.
+    first, second = str(tmp_path / 'a' / 'births.csv'), str(tmp_path / 'b' / 'births.csv')
+    assert getCachePath(first) != getCachePath(second)
+    assert getCachePath(first) == getCachePath(os.path.relpath(first))
+    assert os.path.basename(getCachePath(first)).startswith('births.csv-')
+
+def testCachedStartWithoutHashlib(tmp_path):
+    # Loading an unchanged csv path from its cache doesn't import hashlib, which is slow to import.
+    path = str(tmp_path / 'births.csv')
+    with open(path, 'w', encoding='utf-8') as file:
+        file.write('Period,Mothers_Age,Age_specific_birth_rate\n2005,30-34,100\n')
+    code = ('import sys, birthdata\nbirthdata.CACHE_DIR = %r\nbirthdata.parseData(%r)\n'
+            'print(birthdata.loadStats["cached"], "hashlib" in sys.modules)') % (str(tmp_path / 'cache'), path)
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    outputs = [ subprocess.run([ sys.executable, '-c', code ], capture_output=True, text=True, check=True, cwd=root).stdout
+                for i in range(2) ]
+    assert outputs[1].split() == [ 'True', 'False' ]
+
+def testBinaryCache(tmp_path, monkeypatch):
+    # A csv path is parsed once and then loaded from its cache, until its contents change. A touched file
+    # with the same contents, or a broken cache file, still gives the same data.
+    monkeypatch.setattr(birthdata, 'CACHE_DIR', str(tmp_path / 'cache'))
+    path = str(tmp_path / 'births.csv')
+    def write(rows):
+        with open(path, 'w', encoding='utf-8') as file:
+            file.write('Period,Mothers_Age,Age_specific_birth_rate\n' + ''.join('%d,30-34,%g\n' % row for row in rows))
+    write([ (2005, 100.0), (2006, 101.5) ])
+    expected = getRates(parseData(path, useCache=False))
+    assert getRates(parseData(path)) == expected and loadStats['cached'] == False
+    assert getRates(parseData(path)) == expected and loadStats['cached'] == True
+    os.utime(path, ns=(0, 0))
+    assert getRates(parseData(path)) == expected and loadStats['cached'] == True
+    with open(getCachePath(path), 'r+b') as file:
+        file.truncate(os.path.getsize(getCachePath(path)) - 4)
+    assert getRates(parseData(path)) == expected and loadStats['cached'] == False
+    write([ (2005, 100.0), (2006, 101.5), (2007, 99.0) ])
+    assert getRates(parseData(path)) == { '30-34': { 2005: 100.0, 2006: 101.5, 2007: 99.0 } } and loadStats['cached'] == False
+    assert clearCache(path) == 1 and os.path.exists(getCachePath(path)) == False
+
+def testRollup():
+    # The cross-sections and sums match the series, also after rows for a new period and a new age group are added.
+    data = parseData(useCache=False)
+    rollup = Rollup(data)
+    periods = list(data['30-34'].xData)
+    rollup.getCrossSection(periods[-1])
+    rollup.getCumulative('30-34')
+    added = appendRows(data, [ (periods[-1] + 1, age, 1.0 + ind) for ind, age in enumerate(data) ] + [ (periods[-1] + 1, '50+', 0.1) ])
+    rollup.update(added)
+    rates = getRates(data)
+    for period in periods + [ periods[-1] + 1 ]:
+        assert rollup.getCrossSection(period) == [ rates[age].get(period) for age in rollup.ages ]
+        assert rollup.getTotal(period) == pytest.approx(sum(rates[age].get(period, 0) for age in data))
+    assert rollup.getPeriods() == periods + [ periods[-1] + 1 ]
+    assert rollup.ages == list(data)
+    series = rates['30-34']
+    first, last = periods[2], periods[-1] + 1
+    inRange = [ rate for period, rate in series.items() if first <= period <= last ]
+    assert rollup.getRangeSum('30-34', first, last) == pytest.approx(sum(inRange))
+    assert rollup.getRangeMean('30-34', first, last) == pytest.approx(sum(inRange) / len(inRange))
@@ -0,0 +1,30 @@
+import pytest
+
+import birthdata
+from birthdata import loadStats
+from bulkload import loadFiles
+
+HEADER = 'Period,Mothers_Age,Age_specific_birth_rate\n'
+
+def writeCsv(path, rows):
+    with open(path, 'w', encoding='utf-8') as file:
+        file.write(HEADER + ''.join('%d,%s,%g\n' % row for row in rows))
+
+def getRates(data):
+    return { age: list(zip(series.xData, series.yData)) for age, series in data.items() }
+
+@pytest.mark.parametrize('processes', [ 1, 2 ])
+def testLoadFiles(tmp_path, monkeypatch, processes):
+    # Files are merged in name order. Later releases are joined on, and a period in two files is decided by conflict.
+    monkeypatch.setattr(birthdata, 'CACHE_DIR', str(tmp_path / 'cache'))
+    writeCsv(str(tmp_path / '2005.csv'), [ (2005, '30-34', 100), (2005, '35-39', 50) ])
+    writeCsv(str(tmp_path / '2006.csv'), [ (2006, '30-34', 101) ])
+    assert getRates(loadFiles(str(tmp_path), processes=processes)) == { '30-34': [ (2005, 100.0), (2006, 101.0) ], '35-39': [ (2005, 50.0) ] }
+    assert loadStats['files'] == 2 and loadStats['conflicts'] == 0
+
+    writeCsv(str(tmp_path / '2007.csv'), [ (2007, '30-34', 102), (2006, '30-34', 99) ])
+    assert getRates(loadFiles(str(tmp_path), processes=processes))['30-34'] == [ (2005, 100.0), (2006, 99.0), (2007, 102.0) ]
+    assert loadStats['conflicts'] == 1
+    assert getRates(loadFiles(str(tmp_path), processes=processes, conflict='first'))['30-34'][1] == (2006, 101.0)
+    with pytest.raises(ValueError):
+        loadFiles(str(tmp_path), processes=processes, conflict='error')
@@ -0,0 +1,52 @@
+from array import array
+import random
+
+import pytest
+
+import plotting
+from birthdata import Series
+from derived import TRANSFORMS, DerivedSeries
+
+def makeSeries(points):
+    series = Series()
+    for xVal, yVal in points:
+        series.append(xVal, yVal)
+    return series
+
+def testTransforms():
+    # Each transform on a short series, worked out by hand.
+    xData, yData = array('i', [ 2000, 2001, 2002, 2004 ]), array('d', [ 10, 20, 30, 60 ])
+    assert TRANSFORMS['movingAverage'](xData, yData, window=2) == (array('i', [ 2001, 2002, 2004 ]), array('d', [ 15, 25, 45 ]))
+    # 2004 has no rate the period before, so it is left out.
+    assert TRANSFORMS['yearOverYear'](xData, yData) == (array('i', [ 2001, 2002 ]), array('d', [ 100, 50 ]))
+    assert TRANSFORMS['yearOverYear'](xData, yData, lag=2, percent=False) == (array('i', [ 2002, 2004 ]), array('d', [ 20, 30 ]))
+    line = array('d', [ 3 * xVal - 5000 for xVal in xData ])
+    assert list(TRANSFORMS['linear'](xData, line)[1]) == pytest.approx(list(line))
+    assert list(TRANSFORMS['loess'](xData, line, fraction=0.8)[1]) == pytest.approx(list(line))
+    xOut, yOut = TRANSFORMS['forecast'](xData, line, steps=2)
+    assert list(xOut) == [ 2004, 2006, 2008 ] and list(yOut) == pytest.approx([ line[-1], 3 * 2006 - 5000, 3 * 2008 - 5000 ])
+
+@pytest.mark.parametrize('transform', sorted(TRANSFORMS))
+def testTransformsWithoutNumpy(transform, monkeypatch):
+    # Long series are worked out with numpy when it is installed, and give the same results without it.
+    rand = random.Random(23)
+    xData = array('i', sorted(rand.sample(range(1000, 5000), 2000)))
+    yData = array('d', [ rand.uniform(1, 100) for xVal in xData ])
+    xFast, yFast = TRANSFORMS[transform](xData, yData)
+    monkeypatch.setattr(plotting, 'NUMPY_MIN_LENGTH', len(xData) + 1)
+    xSlow, ySlow = TRANSFORMS[transform](xData, yData)
+    assert list(xFast) == list(xSlow) and list(yFast) == pytest.approx(list(ySlow))
+
+def testDerivedCache():
+    # A result is kept until its series gets more rows or is replaced, and only cacheSize results are kept.
+    data = { '30-34': makeSeries([ (2000, 10), (2001, 20), (2002, 30) ]) }
+    engine = DerivedSeries(data, cacheSize=2)
+    first = engine.get('30-34', 'movingAverage', window=2)
+    assert engine.get('30-34', 'movingAverage', window=2) is first and (engine.hits, engine.misses) == (1, 1)
+    data['30-34'].append(2003, 40)
+    assert list(engine.get('30-34', 'movingAverage', window=2)[1]) == [ 15, 25, 35 ]
+    data['30-34'] = makeSeries([ (2000, 10), (2001, 20), (2002, 30), (2003, 50) ])
+    assert list(engine.get('30-34', 'movingAverage', window=2)[1]) == [ 15, 25, 40 ]
+    engine.get('30-34', 'linear')
+    engine.get('30-34', 'forecast')
+    assert len(engine.cache) == 2 and engine.misses == 5
@@ -0,0 +1,20 @@
+from xml.etree import ElementTree
+
+from birthdata import parseData
+from export import exportCharts, getAllJobs, renderChart
+
+def testExportCharts(tmp_path):
+    # Every chart gets a file, and the worker processes write the same SVG as rendering in this process.
+    data = parseData(useCache=False)
+    jobs = getAllJobs(data, str(tmp_path))
+    assert len(jobs) == 1 + len(data['30-34']) + len(data)
+    jobs = [ jobs[0], jobs[1], jobs[-1] ]
+    paths = exportCharts(jobs, data, processes=2)
+    assert sorted(paths) == sorted(path for chart, option, path in jobs)
+    for chart, option, path in jobs:
+        with open(path, encoding='utf-8') as file:
+            svg = file.read()
+        assert svg == renderChart(data, chart, option)
+        root = ElementTree.fromstring(svg)
+        assert len(root.findall('{http://www.w3.org/2000/svg}line')) > 0
+    assert renderChart(data, 'pie') == None
@@ -0,0 +1,37 @@
+import io
+
+from backends import HeadlessBackend
+from benchmark import COLORS, makeRegionCsv
+from birthdata import readDataset
+from grid import Facets, PlotGrid
+
+def testFacets():
+    # Each panel draws its own region from the dataset, and every panel has the shared ranges and one shape pool.
+    dataset = readDataset(io.StringIO(makeRegionCsv(6)))
+    facets = Facets(dataset, 'Region', COLORS, columns=4, backend=HeadlessBackend())
+    facets.draw()
+    facets.commit()
+    panels = facets.grid.panels
+    assert len(panels) == 6 and facets.grid.rows == 2
+    assert len(set(panel.getLayoutKey() for panel in panels)) == 1
+    assert all(panel.pool is facets.grid.pool for panel in panels)
+    # Only the lowest panel of each column labels the x axis, and the first column labels the y axis.
+    assert [ panel.tickLabels for panel in panels ] == [ [ False, True ], [ False, False ], [ True, False ], [ True, False ],
+                                                        [ True, True ], [ True, False ] ]
+    for value in facets.values:
+        data = dataset.query(where={ 'Region': value })
+        for age, plot in facets.plots[value].items():
+            assert list(plot.xData) == list(data[age].xData) and list(plot.yData) == list(data[age].yData)
+
+def testUnsharedAxes():
+    # Panels that don't share an axis fit it to their own data, and only changed panels are laid out again.
+    grid = PlotGrid(2, shareY=False, backend=HeadlessBackend())
+    grid.panels[0].plotLines([ 0, 1, 2 ], [ 0, 10, 5 ], resizeToNewPlot=False)
+    grid.panels[1].plotLines([ 0, 4 ], [ 0, 100 ], resizeToNewPlot=False)
+    grid.fitRanges()
+    grid.commit()
+    assert [ panel.getLayoutKey() for panel in grid.panels ] == [ (0, 4, 0, 10), (0, 4, 0, 100) ]
+    grid.setPanelRanges(grid.panels[0], yMax=20)
+    assert [ panel.layoutDirty for panel in grid.panels ] == [ True, False ]
+    grid.commit()
+    assert grid.panels[0].layoutDirty == False
@@ -0,0 +1,39 @@
+import pytest
+
+import plotting
+from benchmark import COLORS, makeManager
+from birthdata import parseData
+from playback import FrameTable, Playback
+from views import Scene
+
+def testFrameTable(monkeypatch):
+    # The frames move in a straight line between the periods, with and without numpy.
+    keyFrames = [ [ 0, 10 ], [ 20, 10 ], [ 10, 30 ] ]
+    table = FrameTable([ 2005, 2006, 2007 ], keyFrames, 4)
+    assert table.numFrames == 9
+    assert list(table.getFrame(2)) == [ 10, 10 ] and list(table.getFrame(6)) == [ 15, 20 ] and list(table.getFrame(8)) == [ 10, 30 ]
+    assert [ table.getPeriod(frame) for frame in [ 0, 3, 4, 8 ] ] == [ 2005, 2005, 2006, 2007 ]
+    monkeypatch.setattr(plotting, 'NUMPY_MIN_LENGTH', 1)
+    assert FrameTable([ 2005, 2006, 2007 ], keyFrames, 4).values == table.values
+
+def testPlayback():
+    # Each step shows the frame for the clock, skips the frames of a late step, and stops on the last period.
+    manager, backend = makeManager()
+    scene = Scene(manager, parseData(useCache=False), COLORS)
+    scene.drawBarGraph()
+    manager.commit()
+    playback = Playback(scene, fps=10, secondsPerPeriod=1)
+    plot = playback.plot
+    assert playback.step(100) == True
+    manager.commit()
+    assert list(plot.yData) == list(playback.table.getFrame(0))
+    assert playback.step(100.5) == True and playback.frame == 5 and playback.droppedFrames == 4
+    last = playback.table.numFrames - 1
+    assert playback.step(100 + last / 10) == False
+    manager.commit()
+    assert playback.period == playback.table.periods[-1]
+    assert [ shape.y2 for shape in plot.drawing.children[:plot.numShapes] ] == pytest.approx(
+        manager.getPositionsFromData(None, playback.table.getFrame(last))[1])
+    playback.stop()
+    manager.commit()
+    assert list(plot.yData) == scene.getBarHeights()
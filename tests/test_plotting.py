@@ -0,0 +1,275 @@
+import math
+import random
+
+import pytest
+
+from benchmark import makeManager
+import plotting
+from plotting import RangeIndex
+
+def getShownLines(plot):
+    return [ (shape.x1, shape.y1, shape.x2, shape.y2) for shape in plot.drawing.children[:plot.numShapes] ]
+
+def testRangeIndexRemoveFirst():
+    # The range follows the values left after removing from the start, the end and replacing.
+    rand = random.Random(5)
+    values = [ rand.random() for i in range(200) ]
+    index = RangeIndex(values)
+    while (len(values) > 0):
+        step = rand.randrange(4)
+        if (step == 0):
+            index.removeFirst(min(rand.randrange(1, 9), len(values)))
+        elif (step == 1):
+            assert index.popFirst() != None
+        elif (step == 2):
+            index.replace(rand.randrange(len(values)), rand.random())
+        else:
+            index.append(rand.random())
+            index.pop()
+        if (len(values) > 0):
+            assert (index.min, index.max) == (min(values), max(values))
+    assert (index.min, index.max) == (None, None)
+
+def testRemovePointsFromStart():
+    # Dropping the oldest points, one or several at a time, draws the same as a new plot of what is left.
+    manager, backend = makeManager()
+    xData = list(range(2000, 2040))
+    yData = [ (i * 37) % 50 + 10 for i in range(40) ]
+    plot = manager.plotLines(xData[:], yData[:], color='blue')
+    manager.updateRanges(2000, 2040, 0, 100)
+    manager.commit()
+    for count in [ 1, 5, 3 ]:
+        plot.removePoint(fromStart=True, count=count)
+        manager.commit()
+        del xData[:count], yData[:count]
+        assert plot.xData == xData and plot.yData == yData
+        assert plot.xRange == [ min(xData), max(xData) ]
+        fresh, freshBackend = makeManager()
+        fresh.updateRanges(2000, 2040, 0, 100)
+        freshPlot = fresh.plotLines(xData[:], yData[:], color='blue', resizeToNewPlot=False)
+        fresh.commit()
+        assert getShownLines(plot) == getShownLines(freshPlot)
+        assert len(plot.drawing.children) == plot.numShapes == len(xData)
+
+def testLineAllocation():
+    # A long line is drawn with a few Lines per pixel column, and a new line reuses the Lines of a deleted one.
+    manager, backend = makeManager()
+    xData = list(range(100000))
+    yData = [ (i * 37) % 1000 for i in xData ]
+    plot = manager.plotLines(xData, yData, color='blue')
+    manager.commit()
+    assert backend.shapeCounts['Line'] - 2 <= 4 * (manager.width + 1)
+    manager.deletePlot(plot)
+    backend.resetCounts()
+    newPlot = manager.plotLines(xData, [ 1000 - yVal for yVal in yData ], color='red')
+    manager.commit()
+    assert backend.shapeCounts['Line'] <= max(0, newPlot.numShapes - plot.numShapes)
+    # Changing the ranges lays out the same Lines again, and a plot only gets more when it shows more at once.
+    numLines = len(newPlot.drawing.children)
+    manager.updateRanges(yMax=2000)
+    manager.commit()
+    assert len(newPlot.drawing.children) == numLines
+    manager.setViewport(40000, 60000, 0, 2000)
+    manager.commit()
+    numLines = max(numLines, newPlot.numShapes)
+    assert len(newPlot.drawing.children) == numLines
+    manager.resetZoom()
+    manager.commit()
+    assert len(newPlot.drawing.children) == numLines
+
+def testClipToXRange():
+    # Whatever the order of the data, zooming or appending points past either edge never draws outside the plot.
+    rand = random.Random(1)
+    for trial in range(200):
+        manager, backend = makeManager()
+        isSorted = rand.random() < 0.5
+        xData = [ rand.randrange(0, 40) for i in range(rand.randrange(2, 60)) ]
+        if (isSorted == True):
+            xData.sort()
+        yData = [ rand.random() * 100 for xVal in xData ]
+        plotType = rand.choice([ 'line', 'scatter' ])
+        if (plotType == 'line'):
+            plot = manager.plotLines(xData, yData)
+        else:
+            plot = manager.plotPoints(xData, yData)
+        manager.commit()
+        xMin = rand.uniform(-5, 40)
+        xMax = xMin + rand.uniform(0.1, 20)
+        if (rand.random() < 0.5):
+            manager.setViewport(xMin, xMax, 0, 100)
+        else:
+            manager.updateRanges(xMin, xMax, 0, 100)
+        manager.commit()
+        for i in range(rand.randrange(3)):
+            xVal = plot.xData[-1] + rand.randrange(3) if isSorted == True else rand.randrange(-10, 50)
+            plot.appendPoints([ xVal ], [ rand.random() * 100 ])
+            manager.commit()
+        left, right = manager.left, manager.left + manager.width
+        for shape in plot.drawing.children[:plot.numShapes]:
+            xPositions = [ shape.x1, shape.x2 ] if plotType == 'line' else [ shape.centerX ]
+            assert left - 1e-6 <= min(xPositions) and max(xPositions) <= right + 1e-6
+
+def testClipSegments():
+    # A line that goes back and forth is cut where it crosses the edges, and segments outside shrink to the edge.
+    manager, backend = makeManager()
+    plot = manager.plotLines([ 5, -5, 15, 5 ], [ 50, 50, 100, 0 ])
+    manager.updateRanges(0, 10, 0, 100)
+    manager.commit()
+    left, right = manager.left, manager.left + manager.width
+    middle = (left + right) / 2
+    xPositions, yPositions = manager.getPositionsFromData([ 5, 15 ], [ 50, 0 ])
+    yMiddle, yBottom = yPositions
+    lines = getShownLines(plot)
+    assert lines[0] == (middle, yMiddle, middle, yMiddle)
+    assert lines[1] == (middle, yMiddle, left, yMiddle)
+    assert lines[2][0] == left and lines[2][2] == right
+    assert lines[3][0] == right and lines[3][2] == middle and lines[3][3] == yBottom
+
+def testRemovePointSorted():
+    # Taking out the point that was out of order lets the line use binary search again.
+    manager, backend = makeManager()
+    plot = manager.plotLines([ 1, 2, 3, 0 ], [ 10, 20, 30, 40 ])
+    manager.commit()
+    assert plot.isXSorted() == False
+    plot.removePoint()
+    assert plot.isXSorted() == True
+
+@pytest.mark.parametrize('length', [ 10, 5000 ])
+def testPositionsFromData(length):
+    # The batch transforms give the same positions as one point at a time, with and without numpy, and turn back into the data.
+    manager, backend = makeManager()
+    manager.updateRanges(2000, 2020, 0.5, 150)
+    rand = random.Random(length)
+    xData = [ rand.uniform(1990, 2030) for i in range(length) ]
+    yData = [ rand.uniform(0, 200) for i in range(length) ]
+    xPositions, yPositions = manager.getPositionsFromData(xData, yData)
+    assert type(xPositions) == list and type(yPositions) == list
+    for xVal, yVal, xPos, yPos in zip(xData, yData, xPositions, yPositions):
+        assert (xPos, yPos) == pytest.approx(manager.getPositionFromData(xVal, yVal))
+    assert manager.getPositionsFromData(xData, None) == (xPositions, None)
+    dataXVals, dataYVals = manager.getDataFromPositions(xPositions, yPositions)
+    assert dataXVals == pytest.approx(xData) and dataYVals == pytest.approx(yData)
+
+def testLevelOfDetail(monkeypatch):
+    # A long line keeps the first, last, lowest and highest point of each pixel column, with or without numpy.
+    manager, backend = makeManager()
+    rand = random.Random(6)
+    xData = list(range(5000))
+    yData = [ rand.randrange(100) for xVal in xData ]
+    plot = manager.plotLines(xData, yData, color='blue')
+    manager.commit()
+    kept = plot.lodIndices
+    assert plot.numShapes == len(kept) <= 4 * manager.width
+    xPositions, yPositions = manager.getPositionsFromData(xData, yData)
+    columns = { }
+    for ind, xPos in enumerate(xPositions):
+        columns.setdefault(xPos // 1, [ ]).append(ind)
+    keptYs = { }
+    for ind in kept:
+        keptYs.setdefault(xPositions[ind] // 1, set()).add(yPositions[ind])
+    for column, indices in columns.items():
+        assert indices[0] in kept and indices[-1] in kept
+        assert min(yPositions[i] for i in indices) in keptYs[column] and max(yPositions[i] for i in indices) in keptYs[column]
+    monkeypatch.setattr(plotting, 'NUMPY_MIN_LENGTH', len(xData) + 1)
+    assert plot.getColumnExtremes(xPositions, yPositions) == kept
+
+def testCommitLaysOutOnce(monkeypatch):
+    # Changes to the ranges and data are only laid out on commit(), once, for the last ranges.
+    manager, backend = makeManager()
+    plot = manager.plotLines(list(range(20)), [ (i * 7) % 30 for i in range(20) ], color='blue')
+    manager.commit()
+    layouts = [ ]
+    updateDrawing = plot.updateDrawing
+    def countLayouts(first=None, last=None):
+        layouts.append(first)
+        updateDrawing(first, last)
+    monkeypatch.setattr(plot, 'updateDrawing', countLayouts)
+    backend.resetCounts()
+    for yMax in [ 40, 60, 80 ]:
+        manager.updateRanges(yMax=yMax)
+    plot.updateData(newYData=[ (i * 11) % 30 for i in range(20) ])
+    assert layouts == [ ] and backend.propertyWrites == 0
+    manager.commit()
+    assert layouts == [ None ]
+    manager.commit()
+    assert layouts == [ None ]
+    fresh, freshBackend = makeManager()
+    fresh.updateRanges(*manager.getLayoutKey())
+    freshPlot = fresh.plotLines(plot.xData, plot.yData, color='blue', resizeToNewPlot=False)
+    fresh.commit()
+    assert getShownLines(plot) == getShownLines(freshPlot)
+
+def testPoolReusesShapes():
+    # A deleted plot's shapes are used by the next plot instead of making new ones.
+    manager, backend = makeManager()
+    xData, yData = list(range(30)), [ (i * 7) % 30 for i in range(30) ]
+    old = manager.plotLines(xData, yData, color='blue')
+    manager.commit()
+    manager.deletePlot(old)
+    assert len(manager.pool.free['Line']) >= 30
+    backend.resetCounts()
+    plot = manager.plotLines(xData, [ yVal + 1 for yVal in yData ], color='red', resizeToNewPlot=False)
+    manager.commit()
+    assert backend.shapeCounts['Line'] == 0 and manager.pool.hits >= 30
+    shapes = plot.drawing.children[:plot.numShapes]
+    assert all(shape.visible == True and shape.fill == 'red' for shape in shapes)
+    fresh, freshBackend = makeManager()
+    fresh.updateRanges(*manager.getLayoutKey())
+    freshPlot = fresh.plotLines(plot.xData, plot.yData, color='red', resizeToNewPlot=False)
+    fresh.commit()
+    assert getShownLines(plot) == getShownLines(freshPlot)
+
+def getTickLabels(manager):
+    return [ shape.value for shape in manager.tickDrawings.children if type(shape).__name__ == 'Label' ]
+
+def testTickCache():
+    # Ranges that were drawn recently show their cached ticks again. Past tickCacheSize, the least
+    # recently used ticks are drawn over for the new ranges, so the number of groups stays the same.
+    manager, backend = makeManager()
+    manager.updateRanges(0, 10, 0, 100)
+    manager.commit()
+    first = manager.tickDrawings
+    manager.updateRanges(yMax=200)
+    manager.commit()
+    backend.resetCounts()
+    manager.updateRanges(yMax=100)
+    manager.commit()
+    assert manager.tickDrawings is first and sum(backend.shapeCounts.values()) == 0
+    for yMax in range(300, 300 + 10 * manager.tickCacheSize, 10):
+        manager.updateRanges(yMax=yMax)
+        manager.commit()
+    assert len(manager.tickCache) == manager.tickCacheSize
+    assert sum(1 for group in manager.tickCache.values() if group.visible == True) == 1
+    fresh, freshBackend = makeManager()
+    fresh.updateRanges(*manager.getLayoutKey())
+    fresh.commit()
+    assert getTickLabels(manager) == getTickLabels(fresh)
+
+@pytest.mark.parametrize('plotType', [ 'line', 'scatter' ])
+def testHoveredPoint(plotType):
+    # The hit index finds the same nearest point as checking every point, before and after the data changes.
+    manager, backend = makeManager()
+    rand = random.Random(18)
+    xData = [ rand.uniform(0, 100) for i in range(3000) ]
+    if (plotType == 'line'):
+        xData.sort()
+        plot = manager.plotLines(xData, [ rand.uniform(0, 100) for xVal in xData ], color='blue')
+    else:
+        plot = manager.plotPoints(xData, [ rand.uniform(0, 100) for xVal in xData ], color='blue')
+    manager.commit()
+    for step in range(2):
+        xPositions, yPositions = plot.getShownPositions(0)
+        for i in range(200):
+            xPos, yPos = rand.uniform(90, 310), rand.uniform(90, 310)
+            nearest = min(math.hypot(xPos - x, yPos - y) for x, y in zip(xPositions, yPositions))
+            hit = manager.getHoveredPoint(xPos, yPos)
+            if (nearest > 10):
+                assert hit == None
+            else:
+                assert hit[0] is plot and math.hypot(xPos - hit[2], yPos - hit[3]) == pytest.approx(nearest)
+        plot.updateData(newYData=[ rand.uniform(0, 100) for xVal in xData ])
+        manager.commit()
+    xPositions, yPositions = plot.getShownPositions(0)
+    hit = manager.getHoveredPoint(xPositions[0], yPositions[0])
+    manager.updateTooltip(xPositions[0], yPositions[0])
+    assert manager.tooltip.visible == True and manager.tooltipLabel.value == '%g, %g' % (plot.xData[hit[1]], plot.yData[hit[1]])
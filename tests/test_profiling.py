@@ -0,0 +1,34 @@
+import json
+
+import birthdata
+from backends import HeadlessBackend
+from benchmark import makeManager
+from plotting import Plot, PlotManager
+from profiling import Profiler
+
+def testProfiler(tmp_path):
+    # Enabling times the hot methods and counts new shapes, and disabling puts every original back.
+    originals = (PlotManager.commit, Plot.updateDrawing, birthdata.parseData)
+    profiler = Profiler()
+    profiler.enable([ HeadlessBackend ])
+    try:
+        manager, backend = makeManager()
+        profiler.startTrace()
+        profiler.markFrame()
+        plot = manager.plotLines(list(range(20)), list(range(20)), color='blue')
+        manager.commit()
+        profiler.stopTrace()
+        birthdata.parseData(useCache=False)
+    finally:
+        profiler.disable()
+    assert (PlotManager.commit, Plot.updateDrawing, birthdata.parseData) == originals
+    calls, seconds, shapes = profiler.stats['PlotManager.commit']
+    assert calls == 1 and seconds > 0 and shapes >= plot.numShapes
+    assert profiler.stats['birthdata.parseData'][0] == 1
+    assert profiler.shapeCount == sum(backend.shapeCounts.values())
+    assert profiler.getTopMethods()[0][2] >= profiler.getTopMethods()[-1][2]
+    with open(profiler.writeTrace(str(tmp_path / 'trace.json')), encoding='utf-8') as file:
+        events = json.load(file)['traceEvents']
+    assert events[0]['ph'] == 'i' and 'PlotManager.commit' in [ event['name'] for event in events ]
+    profiler.reset()
+    assert profiler.shapeCount == 0 and profiler.getTopMethods() == [ ]
@@ -0,0 +1,44 @@
+import os
+
+import birthdata
+from birthdata import parseData
+from refresh import DataRefresher
+
+HEADER = 'Period,Mothers_Age,Age_specific_birth_rate\n'
+
+def writeCsv(path, rows):
+    with open(path, 'w', encoding='utf-8') as file:
+        file.write(HEADER + ''.join('%d,30-34,%g\n' % row for row in rows))
+
+def settle(refresher):
+    # A change is only loaded once the file has stayed the same for one more check.
+    refresher.checkSource()
+    refresher.checkSource()
+
+def testMissingFileKeepsData(tmp_path, monkeypatch):
+    monkeypatch.setattr(birthdata, 'CACHE_DIR', str(tmp_path / 'cache'))
+    path = str(tmp_path / 'births.csv')
+    writeCsv(path, [ (2005, 100.0) ])
+    refresher = DataRefresher(path, parseData(path))
+    writeCsv(path, [ (2005, 100.0), (2006, 101.0) ])
+    settle(refresher)
+    snapshot = refresher.takeSnapshot()
+    assert list(snapshot.data['30-34'].xData) == [ 2005, 2006 ]
+
+    # A deleted file, or one with no rows, is never published.
+    os.remove(path)
+    settle(refresher)
+    assert refresher.takeSnapshot() == None
+    assert isinstance(refresher.error, OSError)
+    assert refresher.getPaths() == [ path ]
+    writeCsv(path, [ ])
+    settle(refresher)
+    assert refresher.takeSnapshot() == None
+    assert isinstance(refresher.error, ValueError)
+
+    # Once the file is back, its new rows are published as usual.
+    writeCsv(path, [ (2005, 100.0), (2006, 101.0), (2007, 102.0) ])
+    settle(refresher)
+    snapshot = refresher.takeSnapshot()
+    assert refresher.error == None
+    assert list(snapshot.data['30-34'].xData) == [ 2005, 2006, 2007 ]
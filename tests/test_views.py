@@ -0,0 +1,125 @@
+import io
+
+import pytest
+
+from backends import Group, HeadlessBackend
+from birthdata import CSV, appendRows, parseData, readRows
+from export import COLORS, renderSvg
+from plotting import PlotManager
+from views import Scene
+
+def makeScene(data):
+    backend = HeadlessBackend()
+    manager = PlotManager(left=100,bottom=300,width=200,height=200,backend=backend)
+    scene = Scene(manager, data, COLORS)
+    scene.drawLegend()
+    return backend, manager, scene
+
+def drawView(scene, name):
+    scene.drawView(name)
+    scene.manager.commit()
+
+def countGroups(group):
+    # Every group on the canvas, shown or hidden.
+    return sum(1 + countGroups(shape) for shape in group.children if isinstance(shape, Group) == True)
+
+def getNewRows(data, numPeriods):
+    # numPeriods new periods after the last one, with a rate for every age group.
+    lastPeriod = max(series.xData[-1] for series in data.values())
+    return [ [ (lastPeriod + i + 1, age, 0.8 + 0.01 * i) for age in data ] for i in range(numPeriods) ]
+
+@pytest.mark.parametrize('views', [ [ 'line' ], [ 'bar' ], [ 'histogram' ], [ 'line', 'bar', 'histogram' ], [ 'histogram', 'line', 'bar' ] ])
+def testAppendRowsMatchesRebuild(views):
+    # After new periods come in, every graph draws the same as a scene built from all of the data.
+    rows = list(readRows(io.StringIO(CSV)))
+    data = { }
+    appendRows(data, [ row for row in rows if row[0] < 2019 ])
+    backend, manager, scene = makeScene(data)
+    for name in views:
+        drawView(scene, name)
+    scene.appendRows([ row for row in rows if row[0] >= 2019 ])
+    manager.commit()
+    fullBackend, fullManager, fullScene = makeScene(parseData(useCache=False))
+    for name in [ views[-1], 'line', 'bar', 'histogram' ]:
+        drawView(scene, name)
+        drawView(fullScene, name)
+        assert sorted(renderSvg(backend).split('\n')) == sorted(renderSvg(fullBackend).split('\n'))
+
+def testAppendRowsKeepsGroups():
+    # The bar graph and histogram are updated in place, so new periods don't leave old groups on the canvas.
+    # The tick cache fills up over the first few periods and then stays the same size.
+    backend, manager, scene = makeScene(parseData(useCache=False))
+    for name in [ 'line', 'histogram', 'bar' ]:
+        drawView(scene, name)
+    groups = countGroups(backend.canvas)
+    newRows = getNewRows(scene.data, 100)
+    for rows in newRows[:50]:
+        scene.appendRows(rows)
+        manager.commit()
+    assert countGroups(backend.canvas) <= groups + manager.tickCacheSize
+    groups, nodes = countGroups(backend.canvas), backend.countNodes()
+    for rows in newRows[50:]:
+        scene.appendRows(rows)
+        manager.commit()
+    # The shown bar graph has the same bars, and the hidden graphs are laid out when they are shown next.
+    assert (countGroups(backend.canvas), backend.countNodes()) == (groups, nodes)
+
+def testSetTrendReusesPlots():
+    # Going through the trends, like pressing d, keeps the same trend plots and draws the same as setting the trend once.
+    trends = [ ('movingAverage', { 'window': 5 }), ('linear', { }), ('forecast', { }), None, ('loess', { }) ]
+    backend, manager, scene = makeScene(parseData(useCache=False))
+    drawView(scene, 'line')
+    counts = [ ]
+    for i in range(50):
+        trend = trends[i % len(trends)]
+        if (trend == None):
+            scene.setTrend(None)
+        else:
+            scene.setTrend(trend[0], **trend[1])
+        manager.commit()
+        counts.append((countGroups(backend.canvas), backend.countNodes()))
+        fullBackend, fullManager, fullScene = makeScene(parseData(useCache=False))
+        if (trend != None):
+            fullScene.setTrend(trend[0], **trend[1])
+        drawView(fullScene, 'line')
+        assert sorted(renderSvg(backend).split('\n')) == sorted(renderSvg(fullBackend).split('\n'))
+    assert len(scene.views['line'].drawing.children) <= 2 * len(scene.data)
+    # Once every trend has been drawn, going around again adds nothing.
+    assert counts[-len(trends):] == counts[-2 * len(trends):-len(trends)]
+
+@pytest.mark.parametrize('view', [ 'line', 'bar', 'histogram' ])
+def testSetDataKeepsNodes(view):
+    # Reloading the data, like the refresher does when older rows change, builds the graphs again in place of the old ones.
+    backend, manager, scene = makeScene(parseData(useCache=False))
+    scene.setTrend('movingAverage', window=5)
+    for name in [ 'line', 'bar', 'histogram', view ]:
+        drawView(scene, name)
+    counts = [ ]
+    for i in range(20):
+        data = parseData(useCache=False)
+        for series in data.values():
+            series.yData[0] += i
+        scene.setData(data)
+        manager.commit()
+        counts.append((len(backend.canvas.children), countGroups(backend.canvas), backend.countNodes()))
+    assert counts[-1] == counts[1]
+    fullBackend, fullManager, fullScene = makeScene(data)
+    fullScene.setTrend('movingAverage', window=5)
+    drawView(fullScene, view)
+    assert sorted(renderSvg(backend).split('\n')) == sorted(renderSvg(fullBackend).split('\n'))
+
+def testViewsAreKept():
+    # Each graph is built once. Switching back shows the same plots with their own ranges, and only the
+    # shown graph's plots are in the manager.
+    backend, manager, scene = makeScene(parseData(useCache=False))
+    drawView(scene, 'line')
+    linePlots, lineRanges = scene.views['line'].plots, manager.getLayoutKey()
+    drawView(scene, 'bar')
+    assert scene.views['line'].drawing.visible == False
+    assert manager.plots == scene.views['bar'].plots
+    groups = countGroups(backend.canvas)
+    backend.resetCounts()
+    drawView(scene, 'line')
+    assert scene.views['line'].plots is linePlots and manager.getLayoutKey() == lineRanges
+    assert manager.plots == linePlots
+    assert sum(backend.shapeCounts.values()) == 0 and countGroups(backend.canvas) == groups
@@ -0,0 +1,351 @@
+'''
+The line graph, bar graph and histogram of the birth rate data. Each graph is
+built once and then shown or hidden as the user switches between them.
+'''
+
+from birthdata import Rollup, addSeries, appendRows, getXAndYData
+from derived import DerivedSeries
+
+# classes
+class View(object):
+    '''
+    Keeps the plots of one graph in a group so the graph is only built once.
+    '''
+    def __init__(self, manager, buildPlots):
+        self.manager = manager
+        self.buildPlots = buildPlots
+        self.plots = None
+        self.ranges = None
+        self.drawing = manager.backend.Group()
+
+    def show(self):
+        # Builds the plots the first time, and after that only shows them again.
+        if (self.plots == None):
+            self.plots = self.buildPlots()
+            for plot in self.plots:
+                self.drawing.add(plot.drawing)
+            self.ranges = list(self.manager.getLayoutKey())
+            self.manager.drawing.toFront()
+        else:
+            self.manager.updateRanges(*self.ranges)
+            for plot in self.plots:
+                self.manager.addPlot(plot)
+        self.drawing.visible = True
+
+    def hide(self):
+        for plot in self.plots:
+            self.manager.removePlot(plot)
+        self.drawing.visible = False
+
+    def delete(self):
+        # Removes the graph for good and gives its shapes back to the pool. Its groups are taken off the
+        # canvas too, so a deleted graph doesn't leave anything behind.
+        if (self.plots != None):
+            for plot in self.plots:
+                self.manager.deletePlot(plot)
+                self.drawing.remove(plot.drawing)
+            self.plots = None
+        self.manager.backend.remove(self.drawing)
+
+class Scene(object):
+    '''
+    Holds the three graphs of the birth rate data for one manager.
+    '''
+    def __init__(self, manager, data, colors, period=None, age='45 and over', rollup=None):
+        # The bar graph shows one period (the latest by default) and the histogram shows one age group.
+        # A rollup of the data can be passed in when several scenes show the same data.
+        self.manager = manager
+        self.data = data
+        self.rollup = Rollup(data) if rollup == None else rollup
+        self.colors = colors
+        self.period = period
+        self.age = age
+        self.views = { }
+        self.view = None
+        self.legend = manager.backend.Group()
+        self.linePlots = { }
+        # A derived series drawn over each age group's line, as (transform, params), and its plots.
+        self.derived = DerivedSeries(data)
+        self.trend = None
+        self.trendPlots = { }
+
+    def drawLegend(self):
+        # Draws the legend for the plot.
+        Label = self.manager.backend.Label
+        Circle = self.manager.backend.Circle
+        self.legend.clear()
+        self.legend.add(Label("Mother's Age",200,30,size=10))
+        index=0
+        for age in self.data:
+            self.legend.add(Label(age,50+40*index,50,size=8),Circle(50+40*index,60,5,fill=self.colors[index]))
+            index+=1
+
+    def showView(self, name, buildPlots):
+        # Hides the current graph and shows the chosen one, building it the first time it is chosen.
+        if (self.view == name):
+            return
+        if (self.view != None):
+            self.views[self.view].hide()
+        # Each graph is shown with its own ranges, not the ones it was zoomed to.
+        self.manager.zoomHome = None
+        if (name not in self.views):
+            self.views[name] = View(self.manager, buildPlots)
+        self.views[name].show()
+        self.view = name
+
+    def appendRows(self, rows):
+        # Adds new (period, age, rate) rows to the data. The line plots use the series' own arrays, so they
+        # only draw the new points. The bar graph and histogram keep their plots and get the new data.
+        self.showAdded(appendRows(self.data, rows))
+
+    def appendSeries(self, loaded):
+        # Same as appendRows, for new rows that are already in Series by age group. Their arrays are copied
+        # onto the end of the data's arrays in one go, instead of row by row.
+        addSeries(loaded, self.data)
+        self.showAdded({ age: len(loaded[age]) for age in loaded if len(loaded[age]) > 0 })
+
+    def showAdded(self, added):
+        # Updates the graphs after added[age] rows were put on the end of each age group's series.
+        if (len(added) == 0):
+            return
+        self.rollup.update(added)
+        view = self.view
+        lineView = self.views.get('line')
+        if (lineView != None and lineView.plots != None and any(age not in self.linePlots for age in added)):
+            # A new age group needs its own line, so the line graph and legend are made again.
+            self.deleteView('line')
+            self.linePlots = { }
+            self.trendPlots = { }
+            self.drawLegend()
+        elif (lineView != None and lineView.plots != None):
+            # The ranges are changed before the points are added, so the shapes are only laid out once.
+            xMax = max(max(self.data[age].xData[-added[age]:]) for age in added)
+            if (xMax > lineView.ranges[1]):
+                lineView.ranges[1] = xMax
+                if (view == 'line' and self.manager.zoomHome != None):
+                    # A zoomed in line graph stays where it is, and shows the new periods once the zoom is reset.
+                    self.manager.zoomHome[0][1] = xMax
+                elif (view == 'line'):
+                    self.manager.updateRanges(xMax=xMax)
+            for age in added:
+                self.linePlots[age].appendPoints()
+            self.updateTrendPlots(lineView)
+        if ('bar' in self.views):
+            self.updateBarGraph()
+        if ('histogram' in self.views and self.age in added):
+            self.updateHistogram()
+        # The shown graph is drawn again, so its ticks and labels match the new data.
+        if (view == 'line' and 'line' not in self.views):
+            self.view = None
+        if (view != 'line' or self.manager.zoomHome == None):
+            self.drawView(view)
+
+    def setData(self, data):
+        # Shows new data in place of the old, like a reloaded file whose older rows changed. Every graph is built again.
+        view = self.view
+        for name in list(self.views):
+            self.deleteView(name)
+        self.data = data
+        self.rollup = Rollup(data)
+        self.derived = DerivedSeries(data)
+        self.linePlots = { }
+        self.trendPlots = { }
+        self.view = None
+        self.drawLegend()
+        self.drawView(view)
+
+    def deleteView(self, name):
+        view = self.views.pop(name)
+        if (name == 'line' and view.plots != None):
+            # Hidden trend plots are still in the line graph's group, so they go with it.
+            view.plots.extend(plot for plot in self.trendPlots.values() if plot not in view.plots)
+        view.delete()
+
+    def drawView(self, name):
+        if (name == 'line'):
+            self.drawLineGraph()
+        elif (name == 'bar'):
+            self.drawBarGraph()
+        elif (name == 'histogram'):
+            self.drawHistogram()
+
+    def drawLineGraph(self):
+        # Draws the line graph using the plotLines method from the manager.
+        self.legend.visible = True
+        self.showView('line', self.buildLineGraph)
+        # Six period labels from the first period to the last, each at its own period.
+        xMin, xMax = self.manager.xRange
+        xLabels = [ xMin + i * (xMax - xMin) // 5 for i in range(6) ]
+        xPositions, yPositions = self.manager.getPositionsFromData(xLabels, None)
+        self.manager.drawTicks(xPositions=xPositions,xLabels=xLabels,precision=[0,0])
+        self.manager.updateLabels("Birth Rate In New Zealand","Period","Births Per 1000 Women")
+
+    def buildLineGraph(self):
+        # Creates one line plot per age group.
+        plots = []
+        index = 0
+        for age in self.data:
+            xData, yData = getXAndYData(self.data, age)
+            plots.append(self.manager.plotLines(xData,yData,color=self.colors[index]))
+            self.linePlots[age] = plots[-1]
+            index += 1
+        self.manager.updateRanges(yMax=150)
+        if (self.trend != None):
+            # A forecast goes past the last period, so the x range is made to fit it.
+            plots.extend(self.buildTrendPlots())
+            self.manager.updateRanges(xMax=self.getLineXMax())
+        return plots
+
+    def setTrend(self, transform=None, **params):
+        # Draws a derived series of every age group over the line graph, like setTrend('movingAverage', window=5),
+        # or takes it away when transform is None. The series are kept by self.derived, so turning a trend
+        # back on only works it out again for age groups that got new rows. The trend plots are made once
+        # and get the new trend's data after that, and a trend that is taken away only hides them.
+        self.trend = None if transform == None else (transform, params)
+        lineView = self.views.get('line')
+        if (lineView == None or lineView.plots == None):
+            return
+        if (self.trend == None):
+            for plot in self.trendPlots.values():
+                if (plot in lineView.plots):
+                    lineView.plots.remove(plot)
+                if (plot in self.manager.plots):
+                    self.manager.removePlot(plot)
+        elif (len(self.trendPlots) == 0):
+            for plot in self.buildTrendPlots():
+                lineView.plots.append(plot)
+                lineView.drawing.add(plot.drawing)
+                if (self.view != 'line'):
+                    self.manager.removePlot(plot)
+        else:
+            for age, plot in self.trendPlots.items():
+                xData, yData = self.derived.get(age, transform, **params)
+                plot.updateData(xData, yData)
+                if (plot not in lineView.plots):
+                    lineView.plots.append(plot)
+                    if (self.view == 'line'):
+                        self.manager.addPlot(plot)
+        self.fitTrend(lineView)
+
+    def buildTrendPlots(self):
+        # Creates one plot of the trend per age group, in the age group's color, without changing the ranges.
+        plots = [ ]
+        if (self.trend == None):
+            return plots
+        transform, params = self.trend
+        index = 0
+        for age in self.data:
+            xData, yData = self.derived.get(age, transform, **params)
+            plots.append(self.manager.plotLines(xData,yData,color=self.colors[index],resizeToNewPlot=False))
+            self.trendPlots[age] = plots[-1]
+            index += 1
+        return plots
+
+    def updateTrendPlots(self, lineView):
+        # Age groups that got new rows get their trend worked out again. The others come back from the cache unchanged.
+        if (self.trend == None):
+            return
+        transform, params = self.trend
+        for age in self.trendPlots:
+            xData, yData = self.derived.get(age, transform, **params)
+            plot = self.trendPlots[age]
+            if (plot.xData is not xData):
+                plot.updateData(xData, yData)
+        self.fitTrend(lineView)
+
+    def getLineXMax(self):
+        # The last period of the data, or the end of a forecast that goes past it.
+        xMax = max(series.xData[-1] for series in self.data.values() if len(series) > 0)
+        if (self.trend == None):
+            # Hidden trend plots keep the last trend's data, but it isn't shown.
+            return xMax
+        for plot in self.trendPlots.values():
+            if (len(plot.xData) > 0):
+                xMax = max(xMax, plot.xRange[1])
+        return xMax
+
+    def fitTrend(self, lineView):
+        # Widens (or narrows) the line graph's x range to fit the trend.
+        xMax = self.getLineXMax()
+        if (xMax == lineView.ranges[1]):
+            return
+        lineView.ranges[1] = xMax
+        if (self.view == 'line' and self.manager.zoomHome != None):
+            self.manager.zoomHome[0][1] = xMax
+        elif (self.view == 'line'):
+            self.manager.updateRanges(xMax=xMax)
+            self.drawLineGraph()
+
+    def drawBarGraph(self):
+        # Draws the bar graph using the plotVerticalBars method from the manager.
+        self.legend.visible = True
+        self.showView('bar', self.buildBarGraph)
+        self.manager.drawTicks(xLabels=[],precision=[0,0])
+        self.showBarPeriod(self.getPeriod())
+
+    def showBarPeriod(self, period):
+        # Titles the bar graph with the period it shows, which changes as the periods are played.
+        self.manager.updateLabels("New Zealand Birth Rate In " + str(period),"","Births Per 1000 Women")
+
+    def getPeriod(self):
+        if (self.period == None):
+            return self.data[self.age].xData[-1]
+        return self.period
+
+    def buildBarGraph(self):
+        # Creates the bars for one period of every age group.
+        plot = self.manager.plotVerticalBars(self.getBarHeights(),color=self.colors)
+        self.manager.updateRanges(yMax=150)
+        return [plot]
+
+    def getBarHeights(self):
+        # The rollup already has every age group's rate for each period. Age groups without a rate get an empty bar.
+        return [ 0 if rate == None else rate for rate in self.rollup.getCrossSection(self.getPeriod()) ]
+
+    def updateBarGraph(self):
+        # Gives the bar graph's bars the heights of the period it shows now, like the latest one after new rows came in.
+        plot = self.views['bar'].plots[0]
+        plot.updateData(newYData=self.getBarHeights())
+        self.fitBars('bar', plot, yMax=150)
+
+    def fitBars(self, name, plot, yMin=None, yMax=None):
+        # Sets a bar view's ranges to its plot, like building it does, and changes the manager's too when it is shown.
+        view = self.views[name]
+        view.ranges = [ plot.xRange[0], plot.xRange[1], plot.yRange[0] if yMin == None else yMin, plot.yRange[1] if yMax == None else yMax ]
+        if (self.view == name):
+            self.manager.updateRanges(*view.ranges)
+
+    def drawHistogram(self):
+        # Draws the histogram using the plotVerticalBars method from the manager.
+        self.legend.visible = False
+        self.showView('histogram', self.buildHistogram)
+        xData = self.data[self.age].xData
+        xLabels = list(range(len(xData) + 1))
+        if (self.age == '45 and over'):
+            self.manager.drawTicks(xLabels=xLabels,yLabels=[1.0,0.9,0.8,0.7,0.6,0.5],precision=[0,1])
+            title = "New Zealand Birth Rate For Mothers Ages 45 And Older"
+        else:
+            self.manager.drawTicks(xLabels=xLabels,precision=[0,1])
+            title = "New Zealand Birth Rate For Mothers Aged " + self.age
+        self.manager.updateLabels(title,"Years Since " + str(xData[0]),"Births Per 1000 Women")
+
+    def buildHistogram(self):
+        # Creates the bars for every period of one age group ('45 and over' by default).
+        xData, yData = getXAndYData(self.data, self.age)
+        plot = self.manager.plotVerticalBars(yData,color=self.getHistogramColors(len(yData)))
+        if (self.age == '45 and over'):
+            self.manager.updateRanges(yMin=0.5,yMax=1)
+        return [plot]
+
+    def getHistogramColors(self, numBars):
+        return [ self.colors[i % len(self.colors)] for i in range(numBars) ]
+
+    def updateHistogram(self):
+        # The histogram's bars are the age group's own array, so the new periods are already in it and only need bars.
+        plot = self.views['histogram'].plots[0]
+        plot.color = self.getHistogramColors(len(plot.yData))
+        plot.appendPoints(yValues=[ ])
+        if (self.age == '45 and over'):
+            self.fitBars('histogram', plot, yMin=0.5, yMax=1)
+        else:
+            self.fitBars('histogram', plot)